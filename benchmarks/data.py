@@ -0,0 +1,506 @@
+"""
+Deterministic synthetic data for benchmarks and staging.
+
+Primary keys are assigned up front from the current maximum of every table,
+so child rows reference their parents by arithmetic instead of keeping
+millions of saved instances in memory or reading ids back from the database.
+Tables are filled in foreign key order and the same seed and scale on an
+empty database always produce the same rows.
+
+Rows are built as tuples of database-ready values and written with
+multi-row ``INSERT`` statements, the same statements ``bulk_create`` issues,
+without instantiating a model per row. ``bulk_create`` spends most of its
+time in ``Model.__init__`` and per-field value preparation, which caps it
+at roughly 30k rows/sec on SQLite. Signals are not sent, as with
+``bulk_create``. Explicit primary keys do not advance the sequences of
+databases like Postgres, so they are reset once everything is loaded.
+"""
+
+import json
+import random
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from courses.models import (
+    Chapter,
+    ChapterContent,
+    CodingAssignment,
+    CodingAssignmentProgress,
+    Course,
+    Enrollment,
+    Notes,
+    NotesProgress,
+    Payment,
+    Quiz,
+    QuizProgress,
+    Video,
+    VideoProgress,
+    Week,
+)
+from courses.search import rebuild_search_index
+from userprofiles.models import (
+    Country,
+    Degree,
+    Education,
+    Institution,
+    Interest,
+    UserProfile,
+    WorkExperience,
+)
+
+USERNAME_PREFIX = "bench-user-"
+PASSWORD = "bench-password"
+PRICES = ("0.00", "19.99", "49.99", "99.99")
+
+WORDS = [
+    "introduction", "advanced", "python", "data", "science", "machine", "learning",
+    "web", "development", "design", "statistics", "algorithms", "systems", "cloud",
+    "security", "networks", "databases", "mathematics", "physics", "biology",
+    "finance", "marketing", "management", "history", "music", "writing", "art",
+    "engineering", "robotics", "economics", "psychology", "chemistry",
+]
+
+InterestLink = UserProfile.interests.through
+
+
+def _sentence(rng, count):
+    return " ".join(rng.choices(WORDS, k=count))
+
+
+class Generator:
+    def __init__(
+        self,
+        users=100,
+        courses=200,
+        weeks_per_course=4,
+        chapters_per_week=2,
+        contents_per_chapter=2,
+        enrollments_per_user=5,
+        progress_per_enrollment=4,
+        work_per_profile=3,
+        education_per_profile=2,
+        interests_per_profile=3,
+        seed=0,
+        batch_size=5000,
+        using="default",
+    ):
+        self.users = users
+        self.courses = courses
+        self.weeks_per_course = weeks_per_course
+        self.chapters_per_week = chapters_per_week
+        self.contents_per_chapter = contents_per_chapter
+        self.enrollments_per_user = min(enrollments_per_user, courses)
+        self.contents_per_course = (
+            weeks_per_course * chapters_per_week * contents_per_chapter
+        )
+        self.progress_per_enrollment = min(
+            progress_per_enrollment, self.contents_per_course
+        )
+        self.work_per_profile = work_per_profile
+        self.education_per_profile = education_per_profile
+        self.interests_per_profile = interests_per_profile
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.using = using
+        self.connection = connections[using]
+        self.rows = {}
+        self.models = []
+
+    def generate(self):
+        """Create every table in FK order, return the row count per model."""
+        self.countries = self.pks(Country)
+        self.institutions = self.pks(Institution)
+        self.degrees = self.pks(Degree)
+        self.interests = self.pks(Interest)
+        # Hashing is deliberately slow, every synthetic user shares one hash.
+        self.password = make_password(PASSWORD)
+        self.now = self.prepare(Enrollment, "enrollment_date", timezone.now())
+        self.prices = {
+            price: self.prepare(Course, "price", Decimal(price)) for price in PRICES
+        }
+        self.ids = {
+            model: self.next_id(model)
+            for model in (
+                User, UserProfile, Course, Week, Chapter, Quiz, CodingAssignment,
+                ChapterContent, Video, Notes, Enrollment,
+            )
+        }
+        self.course_prices = [self.rng.choice(PRICES) for _ in range(self.courses)]
+
+        courses_per_chunk = self.batch_size // max(1, self.contents_per_course)
+        users_per_chunk = self.batch_size // max(1, self.enrollments_per_user)
+        for indexes in self.chunks(self.users, self.batch_size):
+            with transaction.atomic(using=self.using):
+                self.create_users(indexes)
+        for indexes in self.chunks(self.courses, courses_per_chunk):
+            with transaction.atomic(using=self.using):
+                self.create_courses(indexes)
+        for indexes in self.chunks(self.users, users_per_chunk):
+            with transaction.atomic(using=self.using):
+                self.create_enrollments(indexes)
+        self.reset_sequences()
+        return self.rows
+
+    @staticmethod
+    def chunks(total, size):
+        size = max(1, size)
+        return [range(start, min(start + size, total)) for start in range(0, total, size)]
+
+    def pks(self, model):
+        return list(
+            model.objects.using(self.using).order_by("pk").values_list("pk", flat=True)
+        )
+
+    def next_id(self, model):
+        last = model.objects.using(self.using).aggregate(last=Max("pk"))["last"]
+        return (last or 0) + 1
+
+    def prepare(self, model, field, value):
+        field = model._meta.get_field(field)
+        return field.get_db_prep_save(value, connection=self.connection)
+
+    def reset_sequences(self):
+        """Move the primary key sequences past the inserted ids."""
+        statements = self.connection.ops.sequence_reset_sql(no_style(), self.models)
+        with transaction.atomic(using=self.using):
+            with self.connection.cursor() as cursor:
+                for statement in statements:
+                    cursor.execute(statement)
+
+    def insert(self, model, fields, rows):
+        """Insert ``rows``, tuples of database values ordered like ``fields``."""
+        if not rows:
+            return
+        ops = self.connection.ops
+        meta = model._meta
+        columns = [meta.get_field(name).column for name in fields]
+        # The limit bulk_create uses, SQLite caps the number of parameters.
+        batch_size = min(self.batch_size, ops.bulk_batch_size(columns, rows))
+        insert = "INSERT INTO {} ({}) VALUES ".format(
+            ops.quote_name(meta.db_table), ", ".join(map(ops.quote_name, columns))
+        )
+        placeholder = "({})".format(", ".join(["%s"] * len(columns)))
+        with self.connection.cursor() as cursor:
+            # Use the database cursor directly, with DEBUG on Django would
+            # format every statement and its parameters for the query log.
+            cursor = cursor.cursor
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start : start + batch_size]
+                cursor.execute(
+                    insert + ", ".join([placeholder] * len(batch)),
+                    [value for row in batch for value in row],
+                )
+        self.rows[meta.label] = self.rows.get(meta.label, 0) + len(rows)
+        if model not in self.models:
+            self.models.append(model)
+
+    def user_id(self, index):
+        return self.ids[User] + index
+
+    def profile_id(self, index):
+        return self.ids[UserProfile] + index
+
+    def create_users(self, indexes):
+        rng = self.rng
+        self.insert(
+            User,
+            [
+                "id", "username", "email", "first_name", "last_name", "password",
+                "is_superuser", "is_staff", "is_active", "date_joined",
+            ],
+            [
+                (
+                    self.user_id(index),
+                    f"{USERNAME_PREFIX}{self.user_id(index)}",
+                    f"{USERNAME_PREFIX}{self.user_id(index)}@example.com",
+                    "Bench",
+                    f"User {index}",
+                    self.password,
+                    False,
+                    False,
+                    True,
+                    self.now,
+                )
+                for index in indexes
+            ],
+        )
+        self.insert(
+            UserProfile,
+            [
+                "id", "user", "country", "birth_date", "user_type", "description",
+                "updated_at",
+            ],
+            [
+                (
+                    self.profile_id(index),
+                    self.user_id(index),
+                    rng.choice(self.countries),
+                    "1995-01-01",
+                    "teacher" if index % 10 == 0 else "student",
+                    _sentence(rng, 12),
+                    self.now,
+                )
+                for index in indexes
+            ],
+        )
+        interests = min(self.interests_per_profile, len(self.interests))
+        self.insert(
+            InterestLink,
+            ["userprofile", "interest"],
+            [
+                (self.profile_id(index), interest)
+                for index in indexes
+                for interest in rng.sample(self.interests, interests)
+            ],
+        )
+        self.insert(
+            WorkExperience,
+            ["user_profile", "company", "position", "start_date", "end_date"],
+            [
+                (
+                    self.profile_id(index),
+                    f"Company {rng.randrange(1000)}",
+                    "Engineer",
+                    "2019-01-01",
+                    "2021-06-01",
+                )
+                for index in indexes
+                for _ in range(self.work_per_profile)
+            ],
+        )
+        self.insert(
+            Education,
+            [
+                "user_profile", "institution", "degree", "field_of_study",
+                "start_date", "end_date",
+            ],
+            [
+                (
+                    self.profile_id(index),
+                    rng.choice(self.institutions),
+                    rng.choice(self.degrees),
+                    rng.choice(WORDS),
+                    "2014-09-01",
+                    "2018-06-01",
+                )
+                for index in indexes
+                for _ in range(self.education_per_profile)
+            ],
+        )
+
+    def create_courses(self, indexes):
+        rng = self.rng
+        ids = self.ids
+        teachers = (self.users + 9) // 10
+        self.insert(
+            Course,
+            [
+                "id", "course_creator", "title", "offered_by", "approved",
+                "published", "duration", "description", "price", "tags",
+                "updated_at",
+            ],
+            [
+                (
+                    ids[Course] + index,
+                    self.user_id(rng.randrange(teachers) * 10),
+                    _sentence(rng, 4).title(),
+                    rng.choice(self.institutions),
+                    True,
+                    True,
+                    f"{self.weeks_per_course} weeks",
+                    _sentence(rng, 20),
+                    self.prices[self.course_prices[index]],
+                    json.dumps(rng.sample(WORDS, 3)),
+                    self.now,
+                )
+                for index in indexes
+            ],
+        )
+
+        # Week.save looks up the next week number, it is set explicitly here.
+        weeks = [
+            (course * self.weeks_per_course + number - 1, course, number)
+            for course in indexes
+            for number in range(1, self.weeks_per_course + 1)
+        ]
+        self.insert(
+            Week,
+            ["id", "course", "title", "introduction", "week_number"],
+            [
+                (
+                    ids[Week] + week,
+                    ids[Course] + course,
+                    f"Week {number}",
+                    _sentence(rng, 8),
+                    number,
+                )
+                for week, course, number in weeks
+            ],
+        )
+
+        chapters = [
+            week * self.chapters_per_week + offset
+            for week, _, _ in weeks
+            for offset in range(self.chapters_per_week)
+        ]
+        self.insert(
+            Quiz,
+            ["id", "title", "deadline"],
+            [(ids[Quiz] + chapter, f"Quiz {chapter}", self.now) for chapter in chapters],
+        )
+        self.insert(
+            CodingAssignment,
+            ["id", "link", "deadline", "points"],
+            [
+                (
+                    ids[CodingAssignment] + chapter,
+                    "https://example.com/assignment",
+                    self.now,
+                    1,
+                )
+                for chapter in chapters
+            ],
+        )
+        self.insert(
+            Chapter,
+            ["id", "week", "title", "introduction", "quiz", "coding_assignment"],
+            [
+                (
+                    ids[Chapter] + chapter,
+                    ids[Week] + chapter // self.chapters_per_week,
+                    _sentence(rng, 3).title(),
+                    _sentence(rng, 8),
+                    ids[Quiz] + chapter,
+                    ids[CodingAssignment] + chapter,
+                )
+                for chapter in chapters
+            ],
+        )
+
+        contents = [
+            chapter * self.contents_per_chapter + offset
+            for chapter in chapters
+            for offset in range(self.contents_per_chapter)
+        ]
+        self.insert(
+            Video,
+            ["id", "link", "duration"],
+            [
+                (ids[Video] + content, "https://example.com/video", "10:00")
+                for content in contents
+            ],
+        )
+        self.insert(
+            Notes,
+            ["id", "content"],
+            [(ids[Notes] + content, _sentence(rng, 30)) for content in contents],
+        )
+        self.insert(
+            ChapterContent,
+            ["id", "topic", "chapter", "note", "video", "quiz", "coding_assignment"],
+            [
+                (
+                    ids[ChapterContent] + content,
+                    _sentence(rng, 3),
+                    ids[Chapter] + content // self.contents_per_chapter,
+                    ids[Notes] + content,
+                    ids[Video] + content,
+                    ids[Quiz] + content // self.contents_per_chapter,
+                    ids[CodingAssignment] + content // self.contents_per_chapter,
+                )
+                for content in contents
+            ],
+        )
+
+    def create_enrollments(self, indexes):
+        rng = self.rng
+        ids = self.ids
+        enrollments = [
+            (
+                ids[Enrollment] + index * self.enrollments_per_user + offset,
+                self.user_id(index),
+                course,
+            )
+            for index in indexes
+            for offset, course in enumerate(
+                rng.sample(range(self.courses), self.enrollments_per_user)
+            )
+        ]
+        self.insert(
+            Enrollment,
+            ["id", "student", "course", "enrollment_date", "completed"],
+            [
+                (enrollment, student, ids[Course] + course, self.now, rng.random() < 0.1)
+                for enrollment, student, course in enrollments
+            ],
+        )
+        self.insert(
+            Payment,
+            ["enrollment", "amount", "payment_date"],
+            [
+                (enrollment, self.prices[self.course_prices[course]], self.now)
+                for enrollment, _, course in enrollments
+                if self.course_prices[course] != PRICES[0]
+            ],
+        )
+
+        # The first contents of every enrolled course count as completed.
+        progress = [
+            (enrollment, content // self.contents_per_chapter, content)
+            for enrollment, _, course in enrollments
+            for content in range(
+                course * self.contents_per_course,
+                course * self.contents_per_course + self.progress_per_enrollment,
+            )
+        ]
+        self.insert(
+            VideoProgress,
+            ["enrollment", "video", "completed"],
+            [
+                (enrollment, ids[Video] + content, True)
+                for enrollment, _, content in progress
+            ],
+        )
+        self.insert(
+            NotesProgress,
+            ["enrollment", "notes", "completed"],
+            [
+                (enrollment, ids[Notes] + content, True)
+                for enrollment, _, content in progress
+            ],
+        )
+        chapters = sorted({(enrollment, chapter) for enrollment, chapter, _ in progress})
+        self.insert(
+            QuizProgress,
+            ["enrollment", "quiz", "score"],
+            [
+                (enrollment, ids[Quiz] + chapter, rng.randint(0, 10))
+                for enrollment, chapter in chapters
+            ],
+        )
+        self.insert(
+            CodingAssignmentProgress,
+            ["enrollment", "assignment", "completed"],
+            [
+                (enrollment, ids[CodingAssignment] + chapter, True)
+                for enrollment, chapter in chapters
+            ],
+        )
+
+
+def generate(index=True, **options):
+    """
+    Create a synthetic data set and return the number of rows created per
+    model. ``options`` are the scale and seed arguments of ``Generator``.
+    """
+    generator = Generator(**options)
+    rows = generator.generate()
+    if index:
+        rebuild_search_index(using=generator.using)
+    return rows
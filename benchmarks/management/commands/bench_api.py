@@ -0,0 +1,193 @@
+import json
+import random
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks import data
+from benchmarks.utils import (
+    HTTPTransport,
+    isolated_database,
+    measure,
+    timer,
+    write_report,
+)
+from courses.models import Course
+from courses.recommendations import build_recommendations
+
+
+def _scenarios(context):
+    """
+    Return ``{name: factory}`` where each factory builds the next request as
+    ``(method, path, body, authenticated)`` for one endpoint.
+    """
+    rng = context["rng"]
+    courses = context["course_ids"]
+    usernames = context["usernames"]
+    words = data.WORDS
+    return {
+        "course-list": lambda: ("GET", "/api/course/", None, False),
+        "course-detail": lambda: (
+            "GET", f"/api/course/{rng.choice(courses)}/", None, False
+        ),
+        "course-search": lambda: (
+            "GET", f"/api/course/search/?q={rng.choice(words)}", None, False
+        ),
+        "course-recommendations": lambda: (
+            "GET", "/api/course/recommendations/", None, True
+        ),
+        "user-info": lambda: ("GET", "/api/user/info/", None, True),
+        "user-info-by-username": lambda: (
+            "GET", f"/api/user/info/?username={rng.choice(usernames)}", None, True
+        ),
+        "work-experience": lambda: ("GET", "/api/user/work/", None, True),
+        "education": lambda: ("GET", "/api/user/education/", None, True),
+        "autocomplete": lambda: (
+            "GET", f"/api/user/autocomplete/institutions/?q={rng.choice('abcmsu')}",
+            None, False,
+        ),
+        "user-login": lambda: (
+            "POST",
+            "/api/user/login/",
+            {"email": f"{rng.choice(usernames)}@example.com", "password": data.PASSWORD},
+            False,
+        ),
+    }
+
+
+class InProcessTransport:
+    """Send requests through Django's test client, no network involved."""
+
+    concurrency = 1
+
+    def __init__(self, token):
+        # The test client identifies itself as "testserver", which is only an
+        # allowed host inside the test runner.
+        self.client = Client(SERVER_NAME="localhost")
+        self.headers = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def send(self, method, path, body, authenticated):
+        extra = self.headers if authenticated else {}
+        response = self.client.generic(
+            method,
+            path,
+            json.dumps(body) if body is not None else "",
+            content_type="application/json",
+            **extra,
+        )
+        return response.status_code
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test the REST API with synthetic data and report requests/sec "
+        "and latency percentiles per endpoint as JSON. Without --url requests "
+        "go through the test client against a throwaway database, with "
+        "throttling off. Against --url the server's throttle rates apply, set "
+        "THROTTLE_LOGIN_IP_RATE= and THROTTLE_LOGIN_EMAIL_RATE= to benchmark login."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running server, e.g. http://127.0.0.1:8000.",
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=10)
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument(
+            "--endpoints",
+            nargs="+",
+            help="Only run these endpoints, all of them by default.",
+        )
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--courses", type=int, default=500)
+        parser.add_argument("--enrollments-per-user", type=int, default=5)
+        parser.add_argument(
+            "--load",
+            action="store_true",
+            help="With --url, generate synthetic data in the configured database first.",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["url"]:
+            report = self.run(options)
+        else:
+            # Every request comes from the same client, login would be
+            # throttled after a few requests.
+            rest_framework = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+            with isolated_database(keepdb=options["keepdb"]), override_settings(
+                REST_FRAMEWORK=rest_framework
+            ):
+                report = self.run(options)
+        write_report(self.stdout, report)
+
+    def run(self, options):
+        if options["load"] or not options["url"]:
+            with timer() as load:
+                rows = data.generate(
+                    users=options["users"],
+                    courses=options["courses"],
+                    enrollments_per_user=options["enrollments_per_user"],
+                    seed=options["seed"],
+                )
+                build_recommendations(full=True)
+        else:
+            load, rows = {"seconds": 0.0}, {}
+
+        usernames = list(
+            User.objects.filter(
+                username__startswith=data.USERNAME_PREFIX
+            ).values_list("username", flat=True)
+        )
+        course_ids = list(Course.objects.values_list("id", flat=True))
+        if not usernames or not course_ids:
+            raise CommandError(
+                "No synthetic data found, run again with --load or run manage.py seed."
+            )
+        user = User.objects.get(username=usernames[0])
+        token = str(AccessToken.for_user(user))
+
+        if options["url"]:
+            transport = HTTPTransport(
+                options["url"], token, options["concurrency"], options["timeout"]
+            )
+        else:
+            transport = InProcessTransport(token)
+
+        scenarios = _scenarios(
+            {
+                "rng": random.Random(options["seed"]),
+                "usernames": usernames,
+                "course_ids": course_ids,
+            }
+        )
+        selected = options["endpoints"] or list(scenarios)
+        unknown = sorted(set(selected) - set(scenarios))
+        if unknown:
+            raise CommandError(
+                f"Unknown endpoints: {', '.join(unknown)}. "
+                f"Choose from: {', '.join(scenarios)}."
+            )
+
+        endpoints = {}
+        for name in selected:
+            for _ in range(options["warmup"]):
+                transport.send(*scenarios[name]())
+            endpoints[name] = measure(transport, scenarios[name], options["requests"])
+
+        return {
+            "mode": "http" if options["url"] else "in-process",
+            "url": options["url"],
+            "concurrency": transport.concurrency,
+            "seed": options["seed"],
+            "rows": rows,
+            "load_seconds": round(load["seconds"], 2),
+            "endpoints": endpoints,
+        }
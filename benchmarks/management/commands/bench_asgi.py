@@ -0,0 +1,164 @@
+import asyncio
+import random
+import threading
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import AsyncClient, Client, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from benchmarks import data
+from benchmarks.utils import (
+    HTTPTransport,
+    isolated_database,
+    measure,
+    summarize,
+    timer,
+    write_report,
+)
+from courses.models import Course
+
+
+def _endpoints(rng, course_ids, usernames):
+    """``{name: (sync path factory or None, async path factory)}``"""
+    return {
+        "course-list": (lambda: "/api/course/", lambda: "/api/async/course/"),
+        "course-detail": (
+            lambda: f"/api/course/{rng.choice(course_ids)}/",
+            lambda: f"/api/async/course/{rng.choice(course_ids)}/",
+        ),
+        "course-curriculum": (
+            None,
+            lambda: f"/api/async/course/{rng.choice(course_ids)}/curriculum/",
+        ),
+        "user-info": (
+            lambda: f"/api/user/info/?username={rng.choice(usernames)}",
+            lambda: f"/api/async/user/info/?username={rng.choice(usernames)}",
+        ),
+    }
+
+
+class ThreadedWSGITransport:
+    """Test client requests through the WSGI handler, one client per thread."""
+
+    def __init__(self, token, concurrency):
+        self.concurrency = concurrency
+        self.headers = {"Authorization": f"Bearer {token}"}
+        self.local = threading.local()
+
+    def send(self, method, path, body, authenticated):
+        if not hasattr(self.local, "client"):
+            self.local.client = Client()
+        return self.local.client.get(path, headers=self.headers).status_code
+
+
+async def _ameasure(paths, concurrency, token):
+    """Run ``paths`` through the ASGI handler, ``concurrency`` at a time."""
+    client = AsyncClient()
+    headers = {"Authorization": f"Bearer {token}"}
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(path):
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            return time.perf_counter() - start, response.status_code
+
+    with timer() as elapsed:
+        results = await asyncio.gather(*(call(path) for path in paths))
+
+    durations = [duration for duration, _ in results]
+    return {
+        "requests": len(paths),
+        "errors": sum(1 for _, status in results if status >= 400),
+        "rps": round(len(paths) / elapsed["seconds"], 1),
+        "latency": summarize(durations),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare throughput of the DRF views under WSGI, the same views under "
+        "ASGI and the native async views, at high concurrency. In-process by "
+        "default, or against running servers with --wsgi-url/--asgi-url."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=64)
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--courses", type=int, default=200)
+        parser.add_argument(
+            "--wsgi-url", help="Base URL of a WSGI server, e.g. gunicorn."
+        )
+        parser.add_argument(
+            "--asgi-url", help="Base URL of an ASGI server, e.g. uvicorn."
+        )
+        parser.add_argument("--timeout", type=float, default=30.0)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        if options["wsgi_url"] or options["asgi_url"]:
+            report = self.run(options)
+        else:
+            with isolated_database(keepdb=options["keepdb"]):
+                data.generate(
+                    users=options["users"],
+                    courses=options["courses"],
+                    seed=options["seed"],
+                )
+                report = self.run(options)
+        write_report(self.stdout, report)
+
+    # The test clients identify themselves as "testserver".
+    @override_settings(ALLOWED_HOSTS=["testserver"])
+    def run(self, options):
+        usernames = list(
+            User.objects.filter(username__startswith=data.USERNAME_PREFIX)
+            .values_list("username", flat=True)[:1000]
+        )
+        course_ids = list(Course.objects.values_list("id", flat=True)[:1000])
+        token = str(AccessToken.for_user(User.objects.get(username=usernames[0])))
+        rng = random.Random(options["seed"])
+        concurrency, requests = options["concurrency"], options["requests"]
+
+        results = {}
+        for name, (sync_path, async_path) in _endpoints(
+            rng, course_ids, usernames
+        ).items():
+            result = results[name] = {}
+            if options["wsgi_url"] or options["asgi_url"]:
+                for label, url, path in [
+                    ("wsgi", options["wsgi_url"], sync_path),
+                    ("asgi-sync", options["asgi_url"], sync_path),
+                    ("asgi-async", options["asgi_url"], async_path),
+                ]:
+                    if url and path:
+                        transport = HTTPTransport(
+                            url, token, concurrency, options["timeout"]
+                        )
+                        result[label] = measure(
+                            transport, lambda: ("GET", path(), None, True), requests
+                        )
+                continue
+
+            if sync_path:
+                result["wsgi"] = measure(
+                    ThreadedWSGITransport(token, concurrency),
+                    lambda: ("GET", sync_path(), None, True),
+                    requests,
+                )
+                result["asgi-sync"] = asyncio.run(
+                    _ameasure([sync_path() for _ in range(requests)], concurrency, token)
+                )
+            result["asgi-async"] = asyncio.run(
+                _ameasure([async_path() for _ in range(requests)], concurrency, token)
+            )
+
+        return {
+            "mode": "http" if options["wsgi_url"] or options["asgi_url"] else "in-process",
+            "concurrency": concurrency,
+            "endpoints": results,
+        }
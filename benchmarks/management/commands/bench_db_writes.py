@@ -0,0 +1,110 @@
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+
+from benchmarks.utils import summarize, timer, write_report
+from courses.models import CertificateSequence, Notes
+
+ALIAS = "bench_db_writes"
+
+
+def _profiles():
+    """The stock SQLite settings next to the tuned ones from settings.py."""
+    configured = settings.DATABASES["default"]
+    if configured["ENGINE"] != "mooc.backends.sqlite3":
+        raise CommandError(
+            "bench_db_writes compares SQLite profiles, set DB_ENGINE=sqlite3."
+        )
+    return {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "OPTIONS": {}},
+        "tuned": {"ENGINE": configured["ENGINE"], "OPTIONS": configured["OPTIONS"]},
+    }
+
+
+def _use_database(profile, name):
+    databases = {"default": {}, ALIAS: {**profile, "NAME": name}}
+    connections.settings[ALIAS] = connections.configure_settings(databases)[ALIAS]
+
+
+def _write(index):
+    # Read before writing, like get_or_create and most views do, so the
+    # transaction has to upgrade its lock.
+    with transaction.atomic(using=ALIAS):
+        Notes.objects.using(ALIAS).filter(pk=index).exists()
+        Notes.objects.using(ALIAS).create(content=f"Note {index}")
+        CertificateSequence.objects.using(ALIAS).filter(name="bench").update(
+            last_value=CertificateSequence.objects.using(ALIAS).count()
+        )
+
+
+def _run(threads, writes):
+    durations = []
+    errors = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        local_durations, local_errors = [], 0
+        try:
+            for index in range(offset * writes, (offset + 1) * writes):
+                start = time.perf_counter()
+                try:
+                    _write(index)
+                except OperationalError:
+                    local_errors += 1
+                else:
+                    local_durations.append(time.perf_counter() - start)
+        finally:
+            connections[ALIAS].close()
+        with lock:
+            durations.extend(local_durations)
+            errors.append(local_errors)
+
+    workers = [
+        threading.Thread(target=worker, args=(offset,)) for offset in range(threads)
+    ]
+    with timer() as elapsed:
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    committed = len(durations)
+    return {
+        "committed": committed,
+        "errors": sum(errors),
+        "writes_per_second": round(committed / elapsed["seconds"], 1),
+        "latency": summarize(durations),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare concurrent write throughput on a throwaway SQLite file with "
+        "Django's default SQLite settings and with the tuned settings "
+        "(WAL, synchronous=NORMAL, busy timeout, BEGIN IMMEDIATE)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=8)
+        parser.add_argument("--writes", type=int, default=200, help="Writes per thread.")
+
+    def handle(self, *args, **options):
+        report = {"threads": options["threads"], "writes_per_thread": options["writes"]}
+        for name, profile in _profiles().items():
+            with tempfile.TemporaryDirectory() as directory:
+                _use_database(profile, str(Path(directory) / "bench.sqlite3"))
+                with connections[ALIAS].schema_editor() as editor:
+                    editor.create_model(Notes)
+                    editor.create_model(CertificateSequence)
+                CertificateSequence.objects.using(ALIAS).create(name="bench")
+                # Workers open their own connections, drop this thread's one
+                # so the next profile starts from its own settings.
+                connections[ALIAS].close()
+                del connections[ALIAS]
+                report[name] = _run(options["threads"], options["writes"])
+        write_report(self.stdout, report)
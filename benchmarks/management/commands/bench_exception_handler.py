@@ -0,0 +1,138 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework import exceptions
+from rest_framework.views import exception_handler
+
+from benchmarks.utils import summarize, write_report
+from mooc.utils import custom_exception_handler, extract_all_error_messages
+from userprofiles.serializers import UserLoginSerializer, UserSerializer
+
+
+def recursive_extract_all_error_messages(error_messages):
+    """The previous recursive helper, kept as the baseline."""
+    error_list = []
+
+    def helper(error_messages):
+        for key, value in error_messages.items():
+            if isinstance(value, dict):
+                helper(value)
+
+            elif isinstance(value, list):
+                for message in value:
+                    if isinstance(message, str):
+                        if message.startswith("This field"):
+                            message = message.replace("This", key)
+
+                        error_list.append(message)
+
+            elif isinstance(value, str):
+                error_list.append(value)
+
+    helper(error_messages)
+    return error_list
+
+
+def recursive_exception_handler(exc, context):
+    response = exception_handler(exc, context)
+
+    if response is not None:
+        response.data = {
+            "status": "fail",
+            "message": recursive_extract_all_error_messages(response.data),
+        }
+
+    return response
+
+
+def _validation_error(serializer):
+    serializer.is_valid()
+    return exceptions.ValidationError(serializer.errors)
+
+
+def _exceptions():
+    return {
+        "login-validation": _validation_error(UserLoginSerializer(data={})),
+        "register-validation": _validation_error(
+            UserSerializer(data={"userprofile": {}})
+        ),
+        "not-authenticated": exceptions.NotAuthenticated(),
+        "authentication-failed": exceptions.AuthenticationFailed(),
+        "throttled": exceptions.Throttled(wait=30),
+        "not-found": exceptions.NotFound(),
+    }
+
+
+def _time(handler, exc, iterations):
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        handler(exc, {})
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the exception handler with the previous recursive message "
+        "extraction on the errors returned by login, registration, "
+        "authentication, throttling and 404 responses."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20000)
+        parser.add_argument(
+            "--depth",
+            type=int,
+            default=50,
+            help="Nesting depth of the synthetic nested error payload.",
+        )
+
+    def handle(self, *args, **options):
+        write_report(self.stdout, self.run(options))
+
+    def run(self, options):
+        iterations = options["iterations"]
+        results = {}
+        for name, exc in _exceptions().items():
+            expected = recursive_exception_handler(exc, {}).data
+            timings = {
+                "recursive": _time(recursive_exception_handler, exc, iterations),
+                "current": _time(custom_exception_handler, exc, iterations),
+            }
+            results[name] = {
+                "identical": custom_exception_handler(exc, {}).data == expected,
+                "latency": timings,
+                "speedup": round(
+                    timings["recursive"]["mean_ms"]
+                    / max(timings["current"]["mean_ms"], 1e-6),
+                    2,
+                ),
+            }
+
+        nested = {"email": ["This field is required."]}
+        for _ in range(options["depth"]):
+            nested = {"nested": nested, "password": ["This field is required."]}
+        timings = {
+            "recursive": _time(
+                lambda errors, context: recursive_extract_all_error_messages(errors),
+                nested,
+                iterations,
+            ),
+            "current": _time(
+                lambda errors, context: extract_all_error_messages(errors),
+                nested,
+                iterations,
+            ),
+        }
+        results[f"nested-depth-{options['depth']}"] = {
+            "identical": extract_all_error_messages(nested)
+            == recursive_extract_all_error_messages(nested),
+            "latency": timings,
+            "speedup": round(
+                timings["recursive"]["mean_ms"]
+                / max(timings["current"]["mean_ms"], 1e-6),
+                2,
+            ),
+        }
+        return {"iterations": iterations, "errors": results}
@@ -0,0 +1,114 @@
+import io
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework import parsers, renderers
+
+from benchmarks import data
+from benchmarks.utils import isolated_database, summarize, write_report
+from courses.models import Course
+from courses.serializers import CourseSerializer
+from mooc import renderers as mooc_renderers
+from userprofiles.models import UserProfile
+from userprofiles.serializers import UserProfileSerializer
+
+
+def _payloads():
+    courses = Course.objects.select_related("offered_by")
+    profile = UserProfile.objects.select_related("user", "country").get(
+        user__username__startswith=data.USERNAME_PREFIX
+    )
+    return {
+        "course-list": CourseSerializer(courses, many=True).data,
+        "user-info": {
+            "status": "success",
+            "data": UserProfileSerializer(profile).data,
+        },
+    }
+
+
+def _time(function, argument, iterations):
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare DRF's stdlib JSON renderer and parser with the orjson backed "
+        "ones on payloads produced by the real serializers, and check the "
+        "rendered bytes are identical."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=2000)
+        parser.add_argument(
+            "--profile-rows",
+            type=int,
+            default=500,
+            help="Work experience and education rows on the profile.",
+        )
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        with isolated_database(keepdb=options["keepdb"]):
+            data.generate(
+                users=1,
+                courses=options["courses"],
+                work_per_profile=options["profile_rows"],
+                education_per_profile=options["profile_rows"],
+                enrollments_per_user=0,
+                seed=options["seed"],
+                index=False,
+            )
+            report = self.run(options)
+        write_report(self.stdout, report)
+
+    def run(self, options):
+        iterations = options["iterations"]
+        stdlib_renderer = renderers.JSONRenderer()
+        stdlib_parser = parsers.JSONParser()
+        renderer = mooc_renderers.JSONRenderer()
+        parser = mooc_renderers.JSONParser()
+
+        results = {}
+        for name, payload in _payloads().items():
+            expected = stdlib_renderer.render(payload)
+            render = {
+                "stdlib": _time(stdlib_renderer.render, payload, iterations),
+                "orjson": _time(renderer.render, payload, iterations),
+            }
+            parse = {
+                "stdlib": _time(
+                    lambda body: stdlib_parser.parse(io.BytesIO(body)),
+                    expected,
+                    iterations,
+                ),
+                "orjson": _time(
+                    lambda body: parser.parse(io.BytesIO(body)), expected, iterations
+                ),
+            }
+            results[name] = {
+                "bytes": len(expected),
+                "identical": renderer.render(payload) == expected,
+                "render": render,
+                "render_speedup": round(
+                    render["stdlib"]["p50_ms"] / max(render["orjson"]["p50_ms"], 1e-6),
+                    1,
+                ),
+                "parse": parse,
+                "parse_speedup": round(
+                    parse["stdlib"]["p50_ms"] / max(parse["orjson"]["p50_ms"], 1e-6), 1
+                ),
+            }
+
+        return {
+            "orjson": mooc_renderers.orjson is not None,
+            "iterations": iterations,
+            "payloads": results,
+        }
@@ -0,0 +1,105 @@
+import itertools
+import json
+import random
+import string
+import time
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from benchmarks.utils import isolated_database, summarize, timer, write_report
+from courses.models import Course
+from courses.search import get_search_backend, rebuild_search_index, search_courses
+
+TARGET_P95_MS = 50
+
+
+def _vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add("".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))))
+    return sorted(words)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark full-text course search over a synthetic catalog in a "
+        "throwaway database and report query latency percentiles as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--courses", type=int, default=1_000_000)
+        parser.add_argument("--queries", type=int, default=500)
+        parser.add_argument("--vocabulary", type=int, default=20_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        with isolated_database(keepdb=options["keepdb"]):
+            report = self.run(options)
+        write_report(self.stdout, report)
+
+    def run(self, options):
+        rng = random.Random(options["seed"])
+        words = _vocabulary(rng, options["vocabulary"])
+        # Zipf-like weights so a few words are very common, like real titles.
+        cum_weights = list(
+            itertools.accumulate(1 / (rank + 1) for rank in range(len(words)))
+        )
+        creator = User.objects.create_user(username="bench-search@example.com")
+
+        def phrase(count):
+            return " ".join(rng.choices(words, cum_weights=cum_weights, k=count))
+
+        with timer() as load:
+            batch_size = options["batch_size"]
+            for start in range(0, options["courses"], batch_size):
+                size = min(batch_size, options["courses"] - start)
+                Course.objects.bulk_create(
+                    Course(
+                        course_creator=creator,
+                        title=phrase(rng.randint(2, 6)).title(),
+                        description=phrase(rng.randint(8, 25)),
+                        duration="4 weeks",
+                        price=0,
+                        tags=json.dumps(phrase(3).split()),
+                    )
+                    for _ in range(size)
+                )
+
+        with timer() as indexing:
+            rebuild_search_index(batch_size=batch_size)
+
+        backend = get_search_backend()
+        queries = [phrase(rng.randint(1, 2)) for _ in range(options["queries"])]
+
+        def measure(search):
+            durations = []
+            # Queries matching more courses than the backend ranks.
+            truncated = 0
+            for query in queries:
+                start = time.perf_counter()
+                _, exhaustive = search(backend, query, 20)
+                durations.append(time.perf_counter() - start)
+                truncated += not exhaustive
+            return {**summarize(durations), "truncated": truncated}
+
+        # Every query ranked by the backend, then the same stream through the
+        # result cache the API uses, both starting with an empty cache.
+        cache.clear()
+        uncached = measure(type(backend).search)
+        cache.clear()
+        latency = measure(search_courses)
+        return {
+            "backend": type(backend).__name__,
+            "courses": options["courses"],
+            "load_seconds": round(load["seconds"], 2),
+            "index_seconds": round(indexing["seconds"], 2),
+            "uncached_query_latency": uncached,
+            "query_latency": latency,
+            "target_p95_ms": TARGET_P95_MS,
+            "within_target": latency["p95_ms"] < TARGET_P95_MS
+            and latency["p99_ms"] < TARGET_P95_MS,
+        }
@@ -0,0 +1,113 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from benchmarks import data
+from benchmarks.utils import isolated_database, summarize, write_report
+from courses.models import Course
+from courses.serializers import CourseSerializer, FastCourseSerializer
+from userprofiles.models import Education, WorkExperience
+from userprofiles.serializers import (
+    EducationSerializer,
+    FastEducationSerializer,
+    FastWorkExperienceSerializer,
+    WorkExperienceSerializer,
+)
+
+PAIRS = {
+    "course": (
+        Course.objects.select_related("offered_by"),
+        CourseSerializer,
+        FastCourseSerializer,
+    ),
+    "work-experience": (
+        WorkExperience.objects.all(),
+        WorkExperienceSerializer,
+        FastWorkExperienceSerializer,
+    ),
+    "education": (Education.objects.all(), EducationSerializer, FastEducationSerializer),
+}
+
+
+def _time(function, iterations):
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def _per_row_us(latency, rows):
+    return round(latency["p50_ms"] * 1000 / max(rows, 1), 3)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the model serializers with the values() based fast "
+        "serializers on the same rows and report the per-row cost, with and "
+        "without the query."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000)
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keepdb", action="store_true")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        with isolated_database(keepdb=options["keepdb"]):
+            data.generate(
+                users=1,
+                courses=rows,
+                work_per_profile=rows,
+                education_per_profile=rows,
+                enrollments_per_user=0,
+                seed=options["seed"],
+                index=False,
+            )
+            report = self.run(options)
+        write_report(self.stdout, report)
+
+    def run(self, options):
+        iterations = options["iterations"]
+        results = {}
+        for name, (queryset, serializer_class, fast_class) in PAIRS.items():
+            instances = list(queryset)
+            values = list(fast_class(queryset).rows())
+            rows = len(instances)
+            if fast_class(queryset).data != serializer_class(instances, many=True).data:
+                raise AssertionError(f"{name}: fast serializer output differs")
+
+            timings = {
+                "model": _time(
+                    lambda: serializer_class(instances, many=True).data, iterations
+                ),
+                "fast": _time(
+                    lambda: [fast_class.to_representation(row) for row in values],
+                    iterations,
+                ),
+                "model_with_query": _time(
+                    lambda: serializer_class(queryset.all(), many=True).data,
+                    iterations,
+                ),
+                "fast_with_query": _time(
+                    lambda: fast_class(queryset.all()).data, iterations
+                ),
+            }
+            per_row_us = {
+                label: _per_row_us(latency, rows) for label, latency in timings.items()
+            }
+            results[name] = {
+                "rows": rows,
+                "per_row_us": per_row_us,
+                "speedup": round(per_row_us["model"] / max(per_row_us["fast"], 1e-6), 1),
+                "speedup_with_query": round(
+                    per_row_us["model_with_query"]
+                    / max(per_row_us["fast_with_query"], 1e-6),
+                    1,
+                ),
+                "latency": timings,
+            }
+        return {"iterations": iterations, "serializers": results}
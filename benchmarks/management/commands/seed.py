@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks import data
+from benchmarks.utils import timer, write_report
+from courses.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with deterministic synthetic users, profiles, "
+        "courses, curricula, enrollments and progress using bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10_000)
+        parser.add_argument("--courses", type=int, default=1_000)
+        parser.add_argument("--weeks-per-course", type=int, default=4)
+        parser.add_argument("--chapters-per-week", type=int, default=2)
+        parser.add_argument("--contents-per-chapter", type=int, default=2)
+        parser.add_argument("--enrollments-per-user", type=int, default=5)
+        parser.add_argument("--progress-per-enrollment", type=int, default=4)
+        parser.add_argument("--work-per-profile", type=int, default=3)
+        parser.add_argument("--education-per-profile", type=int, default=2)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--database", default="default")
+        parser.add_argument(
+            "--skip-index",
+            action="store_true",
+            help="Do not rebuild the course search index afterwards.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["courses"] < 1:
+            raise CommandError("--users and --courses must be at least 1.")
+
+        generator = data.Generator(
+            users=options["users"],
+            courses=options["courses"],
+            weeks_per_course=options["weeks_per_course"],
+            chapters_per_week=options["chapters_per_week"],
+            contents_per_chapter=options["contents_per_chapter"],
+            enrollments_per_user=options["enrollments_per_user"],
+            progress_per_enrollment=options["progress_per_enrollment"],
+            work_per_profile=options["work_per_profile"],
+            education_per_profile=options["education_per_profile"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            using=options["database"],
+        )
+        with timer() as load:
+            rows = generator.generate()
+        with timer() as indexing:
+            if not options["skip_index"]:
+                rebuild_search_index(using=options["database"])
+
+        total = sum(rows.values())
+        write_report(
+            self.stdout,
+            {
+                "seed": options["seed"],
+                "rows": rows,
+                "total_rows": total,
+                "load_seconds": round(load["seconds"], 2),
+                "rows_per_second": round(total / load["seconds"]) if load["seconds"] else 0,
+                "index_seconds": round(indexing["seconds"], 2),
+            },
+        )
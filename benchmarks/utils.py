@@ -0,0 +1,110 @@
+import json
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.db import connection
+
+
+@contextmanager
+def isolated_database(keepdb=False):
+    """
+    Run the enclosed block against a freshly migrated throwaway database,
+    created the same way the test runner does, so benchmarks never touch
+    the configured database.
+    """
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False, keepdb=keepdb
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(durations):
+    """Summarize a list of durations in seconds as milliseconds."""
+    values = sorted(durations)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+        "max_ms": round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+@contextmanager
+def timer():
+    result = {}
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+
+
+def write_report(stdout, report):
+    stdout.write(json.dumps(report, indent=2))
+
+
+class HTTPTransport:
+    """Send requests to a running server from a pool of worker threads."""
+
+    def __init__(self, base_url, token, concurrency, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.token = token
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def send(self, method, path, body, authenticated):
+        headers = {"Content-Type": "application/json"}
+        if authenticated:
+            headers["Authorization"] = f"Bearer {self.token}"
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=json.dumps(body).encode() if body is not None else None,
+            headers=headers,
+            method=method,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            return error.code
+
+
+def measure(transport, factory, requests):
+    def call(spec):
+        start = time.perf_counter()
+        status = transport.send(*spec)
+        return time.perf_counter() - start, status
+
+    specs = [factory() for _ in range(requests)]
+    with timer() as elapsed:
+        if transport.concurrency > 1:
+            with ThreadPoolExecutor(transport.concurrency) as pool:
+                results = list(pool.map(call, specs))
+        else:
+            results = [call(spec) for spec in specs]
+
+    durations = [duration for duration, _ in results]
+    errors = sum(1 for _, status in results if status >= 400)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed["seconds"], 1) if elapsed["seconds"] else 0.0,
+        "latency": summarize(durations),
+    }
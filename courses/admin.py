@@ -1,11 +1,128 @@
 from django.contrib import admin
+from mooc.admin import LargeTableAdmin
 from .models import (
-   Course
+    Answer,
+    Chapter,
+    ChapterContent,
+    CodingAssignment,
+    Course,
+    CoursePermissions,
+    CourseTeachers,
+    Enrollment,
+    Notes,
+    Payment,
+    Permission,
+    Question,
+    Quiz,
+    Role,
+    Video,
+    Week,
 )
 
 
-class CourseAdmin(admin.ModelAdmin):
+class CourseAdmin(LargeTableAdmin):
     list_display = ("title", "offered_by", "duration", "price", "approved", "published")
+    list_select_related = ("offered_by",)
+    list_filter = ("approved", "published")
+    search_fields = ("title",)
+    raw_id_fields = ("course_creator",)
+    autocomplete_fields = ("offered_by",)
 
 
-admin.site.register(Course, CourseAdmin)
\ No newline at end of file
+class RoleAdmin(admin.ModelAdmin):
+    list_display = ("label",)
+
+
+class CourseTeachersAdmin(LargeTableAdmin):
+    list_display = ("course", "teacher", "role")
+    list_select_related = ("course", "teacher", "role")
+    raw_id_fields = ("course", "teacher")
+
+
+class PermissionAdmin(admin.ModelAdmin):
+    list_display = ("label",)
+    search_fields = ("label",)
+
+
+class CoursePermissionsAdmin(LargeTableAdmin):
+    list_display = ("course", "permission", "access_level")
+    list_select_related = ("course", "permission")
+    raw_id_fields = ("course",)
+    autocomplete_fields = ("permission",)
+
+
+class WeekAdmin(LargeTableAdmin):
+    list_display = ("course", "week_number", "title")
+    list_select_related = ("course",)
+    raw_id_fields = ("course",)
+
+
+class VideoAdmin(LargeTableAdmin):
+    list_display = ("link", "duration")
+
+
+class NotesAdmin(LargeTableAdmin):
+    list_display = ("id", "link")
+
+
+class QuizAdmin(LargeTableAdmin):
+    list_display = ("title", "deadline")
+    search_fields = ("title",)
+
+
+class QuestionAdmin(LargeTableAdmin):
+    list_display = ("text", "quiz", "points")
+    list_select_related = ("quiz",)
+    raw_id_fields = ("quiz",)
+
+
+class AnswerAdmin(LargeTableAdmin):
+    list_display = ("text", "question", "is_correct")
+    list_select_related = ("question",)
+    raw_id_fields = ("question",)
+
+
+class CodingAssignmentAdmin(LargeTableAdmin):
+    list_display = ("link", "deadline", "points")
+
+
+class ChapterAdmin(LargeTableAdmin):
+    list_display = ("title", "week", "quiz")
+    list_select_related = ("week__course", "quiz")
+    raw_id_fields = ("week", "quiz", "coding_assignment")
+
+
+class ChapterContentAdmin(LargeTableAdmin):
+    list_display = ("topic", "chapter")
+    list_select_related = ("chapter",)
+    raw_id_fields = ("chapter", "note", "video", "quiz", "coding_assignment")
+
+
+class EnrollmentAdmin(LargeTableAdmin):
+    list_display = ("student", "course", "enrollment_date", "completed")
+    list_select_related = ("student", "course")
+    list_filter = ("completed",)
+    raw_id_fields = ("student", "course")
+
+
+class PaymentAdmin(LargeTableAdmin):
+    list_display = ("enrollment", "amount", "payment_date")
+    raw_id_fields = ("enrollment",)
+
+
+admin.site.register(Course, CourseAdmin)
+admin.site.register(Role, RoleAdmin)
+admin.site.register(CourseTeachers, CourseTeachersAdmin)
+admin.site.register(Permission, PermissionAdmin)
+admin.site.register(CoursePermissions, CoursePermissionsAdmin)
+admin.site.register(Week, WeekAdmin)
+admin.site.register(Video, VideoAdmin)
+admin.site.register(Notes, NotesAdmin)
+admin.site.register(Quiz, QuizAdmin)
+admin.site.register(Question, QuestionAdmin)
+admin.site.register(Answer, AnswerAdmin)
+admin.site.register(CodingAssignment, CodingAssignmentAdmin)
+admin.site.register(Chapter, ChapterAdmin)
+admin.site.register(ChapterContent, ChapterContentAdmin)
+admin.site.register(Enrollment, EnrollmentAdmin)
+admin.site.register(Payment, PaymentAdmin)
@@ -0,0 +1,8 @@
+from django.urls import path
+from .async_views import course_curriculum, course_detail, course_list
+
+urlpatterns = [
+    path("", course_list, name="async-course-list"),
+    path("<int:pk>/", course_detail, name="async-course-detail"),
+    path("<int:pk>/curriculum/", course_curriculum, name="async-course-curriculum"),
+]
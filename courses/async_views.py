@@ -0,0 +1,72 @@
+from rest_framework.exceptions import NotFound
+
+from mooc.asyncapi import async_api_view
+from .models import Chapter, ChapterContent, Course, Week
+from .serializers import CourseSerializer, FastCourseSerializer
+
+
+@async_api_view
+async def course_list(request):
+    """Async ``CourseViewSet.list``."""
+    return await FastCourseSerializer(Course.objects.all()).adata()
+
+
+@async_api_view
+async def course_detail(request, pk):
+    """Async ``CourseViewSet.retrieve``."""
+    try:
+        course = await Course.objects.select_related("offered_by").aget(pk=pk)
+    except Course.DoesNotExist:
+        raise NotFound()
+    return CourseSerializer(course).data
+
+
+@async_api_view
+async def course_curriculum(request, pk):
+    """A course's weeks, their chapters and each chapter's contents."""
+    try:
+        course = await Course.objects.only("id", "title").aget(pk=pk)
+    except Course.DoesNotExist:
+        raise NotFound()
+
+    weeks = {
+        week["id"]: {**week, "chapters": []}
+        async for week in Week.objects.filter(course=course)
+        .order_by("week_number", "id")
+        .values("id", "week_number", "title", "introduction")
+    }
+    chapters = {}
+    async for chapter in (
+        Chapter.objects.filter(week__course=course)
+        .order_by("id")
+        .values(
+            "id", "week_id", "title", "introduction", "quiz_id", "coding_assignment_id"
+        )
+    ):
+        chapters[chapter["id"]] = chapter
+        chapter["contents"] = []
+        weeks[chapter.pop("week_id")]["chapters"].append(chapter)
+    async for content in (
+        ChapterContent.objects.filter(chapter__week__course=course)
+        .order_by("id")
+        .values(
+            "id",
+            "chapter_id",
+            "topic",
+            "note_id",
+            "quiz_id",
+            "coding_assignment_id",
+            "video__link",
+            "video__duration",
+        )
+    ):
+        content["video"] = {
+            "link": content.pop("video__link"),
+            "duration": content.pop("video__duration"),
+        }
+        chapters[content.pop("chapter_id")]["contents"].append(content)
+
+    return {
+        "status": "success",
+        "data": {"id": course.id, "title": course.title, "weeks": list(weeks.values())},
+    }
@@ -0,0 +1,188 @@
+import os
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from mooc.routers import read_from_primary
+from .models import (
+    Certificate,
+    CertificateIssuanceCheckpoint,
+    CertificateSequence,
+    Enrollment,
+)
+from .serializers import CertificateVerificationSerializer
+
+CERTIFICATE_SEQUENCE = "certificate"
+# The random code keeps valid numbers from being enumerated from the
+# sequential part.
+CERTIFICATE_NUMBER_FORMAT = "MOOC-{value:010d}-{code}"
+CERTIFICATE_CODE_BYTES = 5
+VERIFICATION_CACHE_TIMEOUT = 60 * 60
+VERIFICATION_MISS_CACHE_TIMEOUT = 5 * 60
+_MISSING = "missing"
+
+_template_link = None
+
+
+def _init_worker(template_link):
+    global _template_link
+    _template_link = template_link
+
+
+def render_certificate(context):
+    """
+    Render a single certificate document and return its link.
+
+    The template link may reference ``{certificate_number}``, ``{enrollment_id}``,
+    ``{student_id}`` and ``{course_id}``. This runs inside the worker processes,
+    so it must only depend on its arguments and the template cached by
+    ``_init_worker``.
+    """
+    return _template_link.format(**context)
+
+
+def certificate_number(value):
+    code = secrets.token_hex(CERTIFICATE_CODE_BYTES).upper()
+    return CERTIFICATE_NUMBER_FORMAT.format(value=value, code=code)
+
+
+def get_student_name(first_name, last_name, username):
+    return f"{first_name} {last_name}".strip() or username
+
+
+def _render_batch(template_link, contexts, workers):
+    if workers <= 1:
+        _init_worker(template_link)
+        return [render_certificate(context) for context in contexts]
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(template_link,)
+    ) as executor:
+        chunksize = max(1, len(contexts) // (workers * 4))
+        return list(executor.map(render_certificate, contexts, chunksize=chunksize))
+
+
+def issue_certificates(
+    template,
+    batch_size=1000,
+    workers=None,
+    valid_for=timedelta(days=730),
+    checkpoint="default",
+):
+    """
+    Issue certificates for every completed enrollment that does not have one yet.
+
+    Enrollments are processed in primary key order in batches of ``batch_size``.
+    Each batch is inserted together with the checkpoint update in one
+    transaction, so an interrupted run resumes after its last batch. The
+    checkpoint is cleared once a run finishes, enrollments completed later
+    may have lower primary keys and the next run starts from the beginning.
+    Concurrent runs may read the same enrollments, a unique constraint keeps
+    one certificate per enrollment. Returns the number of certificates issued.
+    """
+    workers = workers or os.cpu_count() or 1
+    checkpoint, _ = CertificateIssuanceCheckpoint.objects.get_or_create(name=checkpoint)
+    issued = 0
+
+    while True:
+        batch = list(
+            Enrollment.objects.filter(
+                completed=True,
+                certificate__isnull=True,
+                pk__gt=checkpoint.last_enrollment_id,
+            )
+            .order_by("pk")
+            .values_list(
+                "pk",
+                "student_id",
+                "course_id",
+                "student__first_name",
+                "student__last_name",
+                "student__username",
+                "course__title",
+            )[:batch_size]
+        )
+        if not batch:
+            checkpoint.last_enrollment_id = 0
+            checkpoint.save(update_fields=["last_enrollment_id", "updated_at"])
+            return issued
+
+        values = CertificateSequence.reserve(CERTIFICATE_SEQUENCE, len(batch))
+        contexts = [
+            {
+                "certificate_number": certificate_number(value),
+                "enrollment_id": enrollment_id,
+                "student_id": student_id,
+                "course_id": course_id,
+            }
+            for (enrollment_id, student_id, course_id, *_), value in zip(batch, values)
+        ]
+        links = _render_batch(template.template_link, contexts, workers)
+
+        expiration_date = timezone.now() + valid_for
+        certificates = []
+        for context, link, row in zip(contexts, links, batch):
+            first_name, last_name, username, course_title = row[3:]
+            certificates.append(
+                Certificate(
+                    enrollment_id=context["enrollment_id"],
+                    certificate_number=context["certificate_number"],
+                    certificate_link=link,
+                    expiration_date=expiration_date,
+                    student_name=get_student_name(first_name, last_name, username),
+                    course_title=course_title,
+                )
+            )
+        numbers = [certificate.certificate_number for certificate in certificates]
+        with transaction.atomic():
+            # A concurrent run may have issued some of these enrollments since
+            # they were read, the unique enrollment constraint skips them.
+            Certificate.objects.bulk_create(
+                certificates, batch_size=batch_size, ignore_conflicts=True
+            )
+            checkpoint.last_enrollment_id = batch[-1][0]
+            checkpoint.save(update_fields=["last_enrollment_id", "updated_at"])
+            issued += Certificate.objects.filter(certificate_number__in=numbers).count()
+        # bulk_create sends no post_save, drop misses cached for these numbers.
+        cache.delete_many([_verification_cache_key(number) for number in numbers])
+
+
+def _verification_cache_key(certificate_number):
+    return f"certificate-verification:{certificate_number}"
+
+
+def get_verification_payload(certificate_number):
+    """
+    Return the public verification payload for a certificate number, or None.
+
+    Both hits and misses are cached, so repeated guesses for numbers that do
+    not exist are answered from the cache instead of the database.
+    """
+    key = _verification_cache_key(certificate_number)
+    payload = cache.get(key)
+    if payload == _MISSING:
+        return None
+    if payload is not None:
+        return payload
+
+    # A certificate issued since the replica last caught up would be cached
+    # as missing.
+    with read_from_primary():
+        try:
+            certificate = Certificate.objects.only(
+                *CertificateVerificationSerializer.Meta.fields
+            ).get(certificate_number=certificate_number)
+        except Certificate.DoesNotExist:
+            cache.set(key, _MISSING, VERIFICATION_MISS_CACHE_TIMEOUT)
+            return None
+        payload = dict(CertificateVerificationSerializer(certificate).data)
+    cache.set(key, payload, VERIFICATION_CACHE_TIMEOUT)
+    return payload
+
+
+def invalidate_verification_payload(certificate_number):
+    cache.delete(_verification_cache_key(certificate_number))
@@ -0,0 +1,75 @@
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Course, CourseTeachers, Enrollment, Week
+from .serializers import CourseDetailSerializer
+
+# Changes to the course, its institution, weeks and instructors bump
+# ``Course.updated_at`` and so the cache key. Enrollments don't, the
+# enrollment count may lag behind by up to this many seconds.
+COURSE_DETAILS_CACHE_TIMEOUT = 5 * 60
+
+
+def _cache_key(pk, updated_at):
+    return f"course-details:{pk}:{updated_at.timestamp()}"
+
+
+def _count(model):
+    # A subquery per count, joining both tables would multiply the rows.
+    return Coalesce(
+        Subquery(
+            model.objects.filter(course=OuterRef("pk"))
+            .order_by()
+            .values("course")
+            .annotate(count=Count("pk"))
+            .values("count")
+        ),
+        0,
+    )
+
+
+def load_course_details(pk):
+    """
+    Serialize the course page of ``pk``, or return None when there is no
+    such course: the course with its institution and the counts in one
+    query, the instructors with their users and roles in a second one.
+    """
+    course = (
+        Course.objects.select_related("offered_by__country")
+        .annotate(week_count=_count(Week), enrollment_count=_count(Enrollment))
+        .prefetch_related(
+            Prefetch(
+                "courseteachers_set",
+                queryset=CourseTeachers.objects.select_related(
+                    "teacher", "role"
+                ).order_by("pk"),
+                to_attr="instructors",
+            )
+        )
+        .filter(pk=pk)
+        .first()
+    )
+    if course is None:
+        return None
+    return dict(CourseDetailSerializer(course).data)
+
+
+def get_course_details(pk):
+    """
+    Return the course page of ``pk`` from the cache, keyed by the course's
+    ``updated_at``, or None when there is no such course. A hit costs one
+    query for the version.
+    """
+    updated_at = (
+        Course.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    )
+    if updated_at is None:
+        return None
+    key = _cache_key(pk, updated_at)
+    details = cache.get(key)
+    if details is None:
+        details = load_course_details(pk)
+        if details is not None:
+            cache.set(key, details, COURSE_DETAILS_CACHE_TIMEOUT)
+    return details
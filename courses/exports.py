@@ -0,0 +1,122 @@
+import csv
+import io
+
+from django.db import models
+
+from mooc.renderers import JSONRenderer
+from .models import (
+    CodingAssignmentProgress,
+    Course,
+    Enrollment,
+    NotesProgress,
+    Payment,
+    QuizProgress,
+    VideoProgress,
+)
+
+DATASETS = {
+    "courses": Course,
+    "enrollments": Enrollment,
+    "payments": Payment,
+    "video-progress": VideoProgress,
+    "notes-progress": NotesProgress,
+    "quiz-progress": QuizProgress,
+    "coding-assignment-progress": CodingAssignmentProgress,
+}
+FORMATS = {
+    "jsonl": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+DEFAULT_CHUNK_SIZE = 2000
+
+_renderer = JSONRenderer()
+
+
+def _converter(field):
+    # Exact values rather than the JSON encoder's floats and milliseconds.
+    if isinstance(field, models.DecimalField):
+        return str
+    if isinstance(field, (models.DateTimeField, models.DateField)):
+        return lambda value: value.isoformat()
+    return None
+
+
+def get_columns(dataset):
+    """Column names of an export, the model's concrete fields with FK ids."""
+    return [field.attname for field in DATASETS[dataset]._meta.concrete_fields]
+
+
+def export_rows(dataset, after=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield lists of up to ``chunk_size`` rows of ``dataset`` in primary key
+    order, starting after the primary key ``after``.
+
+    Each chunk is its own keyset query, so memory stays constant however
+    large the table is, no cursor or transaction is held open between
+    chunks and an interrupted export resumes from the last exported id.
+    """
+    model = DATASETS[dataset]
+    fields = model._meta.concrete_fields
+    columns = [field.attname for field in fields]
+    converters = [
+        (index, convert)
+        for index, field in enumerate(fields)
+        if (convert := _converter(field)) is not None
+    ]
+    pk_index = columns.index(model._meta.pk.attname)
+    queryset = model.objects.order_by("pk").values_list(*columns)
+
+    while True:
+        chunk = queryset if after is None else queryset.filter(pk__gt=after)
+        rows = []
+        for row in chunk[:chunk_size].iterator(chunk_size=chunk_size):
+            if converters:
+                row = list(row)
+                for index, convert in converters:
+                    if row[index] is not None:
+                        row[index] = convert(row[index])
+            rows.append(row)
+        if not rows:
+            return
+        yield rows
+        after = rows[-1][pk_index]
+        if len(rows) < chunk_size:
+            return
+
+
+def _jsonl(columns, chunks):
+    for rows in chunks:
+        yield b"".join(
+            _renderer.render(dict(zip(columns, row))) + b"\n" for row in rows
+        )
+
+
+def _csv(columns, chunks, header):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    for rows in chunks:
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def encode(columns, chunks, file_format, header=True):
+    """
+    Encode chunks of rows in ``file_format``, yielding one byte string per
+    chunk. CSV output starts with a header row unless ``header`` is false,
+    e.g. when appending to a resumed file.
+    """
+    if file_format == "jsonl":
+        return _jsonl(columns, chunks)
+    return _csv(columns, chunks, header)
+
+
+def stream_export(dataset, file_format, after=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    return encode(
+        get_columns(dataset), export_rows(dataset, after, chunk_size), file_format
+    )
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import time
+from collections import Counter
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from mooc.routers import read_from_primary
+from userprofiles.models import Institution
+from .models import Course
+
+FACETS_CACHE_KEY = "course-facets"
+FACETS_VERSION_CACHE_KEY = "course-facets-version"
+# The catalog counts are updated on every course change, but bulk queries
+# send no signals, so they expire and are recomputed from scratch once they
+# are this old.
+FACETS_RECOMPUTE_INTERVAL = 15 * 60
+QUERY_FACETS_CACHE_TIMEOUT = 5 * 60
+FACET_FIELDS = ("offered_by", "approved", "published", "price", "tags")
+FILTERS = ("institution", "price_band", "tag", "approved", "published")
+# Exclusive upper bounds, in display order.
+PRICE_BANDS = (
+    ("free", Decimal("0.01")),
+    ("under-50", Decimal(50)),
+    ("50-100", Decimal(100)),
+    ("100-200", Decimal(200)),
+    ("200-plus", None),
+)
+# Values of the facets every course counts in one of, the others are only
+# known from the counted courses.
+FIXED_VALUES = {
+    "price_band": [band for band, _ in PRICE_BANDS],
+    "approved": [False, True],
+    "published": [False, True],
+}
+
+
+def price_band(price):
+    for band, upper in PRICE_BANDS:
+        if upper is None or price < upper:
+            return band
+
+
+def parse_tags(tags):
+    try:
+        tags = json.loads(tags) if tags else []
+    except ValueError:
+        return []
+    return [tag for tag in tags if isinstance(tag, str)] if isinstance(tags, list) else []
+
+
+def course_facets(course):
+    """The ``FACET_FIELDS`` values of a ``Course`` instance."""
+    return (
+        course.offered_by_id,
+        course.approved,
+        course.published,
+        # Unsaved values may be given as ints or strings.
+        Course._meta.get_field("price").to_python(course.price),
+        course.tags,
+    )
+
+
+def _contributions(row):
+    """The (facet, value) pairs a course with ``FACET_FIELDS`` values counts in."""
+    offered_by, approved, published, price, tags = row
+    return [
+        ("institution", offered_by),
+        ("price_band", price_band(price)),
+        ("approved", approved),
+        ("published", published),
+        *(("tag", tag) for tag in set(parse_tags(tags))),
+    ]
+
+
+def compute_facets(queryset=None, tag=None):
+    """
+    Count the courses of ``queryset``, all of them by default, per facet,
+    only those tagged ``tag`` if given.
+
+    One query groups the courses by their facet fields, the distinct
+    combinations are far fewer than courses. Returns the total and a
+    ``Counter`` per facet keyed by value.
+    """
+    queryset = Course.objects.all() if queryset is None else queryset
+    rows = (
+        queryset.order_by()
+        .values_list(*FACET_FIELDS)
+        .annotate(count=Count("pk"))
+    )
+    facets = {"total": 0, **{facet: Counter() for facet in FILTERS}}
+    for *row, count in rows:
+        if tag is not None and tag not in parse_tags(row[-1]):
+            continue
+        facets["total"] += count
+        for facet, value in _contributions(row):
+            facets[facet][value] += count
+    return facets
+
+
+def _buckets(facets):
+    """The (facet, value) pairs the catalog counts ``facets`` can change in."""
+    yield "total", None
+    for facet in FILTERS:
+        for value in FIXED_VALUES.get(facet, facets[facet]):
+            yield facet, value
+
+
+def _delta_key(generation, facet, value):
+    digest = hashlib.md5(json.dumps([facet, value]).encode()).hexdigest()
+    return f"course-facets-delta:{generation}:{digest}"
+
+
+def rebuild_catalog_facets():
+    # Counts read from a lagging replica would be cached until they expire.
+    with read_from_primary():
+        facets = compute_facets()
+    # Changes are counted per generation of the counts.
+    facets["generation"] = time.time_ns()
+    cache.set(FACETS_CACHE_KEY, facets, FACETS_RECOMPUTE_INTERVAL)
+    return facets
+
+
+def get_catalog_facets():
+    """The cached catalog counts plus the changes counted since."""
+    facets = cache.get(FACETS_CACHE_KEY)
+    if facets is None:
+        return rebuild_catalog_facets()
+    buckets = {
+        _delta_key(facets["generation"], facet, value): (facet, value)
+        for facet, value in _buckets(facets)
+    }
+    for key, delta in cache.get_many(buckets).items():
+        facet, value = buckets[key]
+        if facet == "total":
+            facets["total"] += delta
+        else:
+            facets[facet][value] += delta
+    for facet in FILTERS:
+        facets[facet] = +facets[facet]
+    return facets
+
+
+def update_catalog_facets(old, new):
+    """
+    Move a course from the facet values ``old`` to ``new``, tuples of
+    ``FACET_FIELDS`` values or None when the course did not or no longer
+    exists, once the transaction commits.
+
+    The cached counts are never rewritten, each changed value has a counter
+    next to them that concurrent updates increment atomically.
+    """
+
+    def update():
+        cache.delete(FACETS_VERSION_CACHE_KEY)
+        facets = cache.get(FACETS_CACHE_KEY)
+        if facets is None:
+            return
+        changes = Counter()
+        for row, sign in ((old, -1), (new, 1)):
+            if row is not None:
+                changes["total", None] += sign
+                for bucket in _contributions(row):
+                    changes[bucket] += sign
+        if not set(changes) <= set(_buckets(facets)):
+            # A value without a count yet, recounted on the next read.
+            cache.delete(FACETS_CACHE_KEY)
+            return
+        for (facet, value), delta in changes.items():
+            if not delta:
+                continue
+            key = _delta_key(facets["generation"], facet, value)
+            cache.add(key, 0, FACETS_RECOMPUTE_INTERVAL)
+            try:
+                cache.incr(key, delta)
+            except ValueError:
+                # Evicted in between, the change would be lost.
+                cache.delete(FACETS_CACHE_KEY)
+                return
+
+    transaction.on_commit(update)
+
+
+def _version():
+    # Any course change deletes the version, so cached query facets are
+    # not found anymore.
+    version = cache.get(FACETS_VERSION_CACHE_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(FACETS_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def filter_courses(filters):
+    """Courses matching ``filters``, a dict with keys of ``FILTERS``."""
+    queryset = Course.objects.all()
+    if "institution" in filters:
+        queryset = queryset.filter(offered_by=filters["institution"])
+    if "approved" in filters:
+        queryset = queryset.filter(approved=filters["approved"])
+    if "published" in filters:
+        queryset = queryset.filter(published=filters["published"])
+    if "price_band" in filters:
+        lower = None
+        for band, upper in PRICE_BANDS:
+            if band == filters["price_band"]:
+                if lower is not None:
+                    queryset = queryset.filter(price__gte=lower)
+                if upper is not None:
+                    queryset = queryset.filter(price__lt=upper)
+                break
+            lower = upper
+    if "tag" in filters:
+        # Tags are stored as a JSON list, this also matches the tag inside
+        # longer strings, ``compute_facets`` checks the exact match.
+        queryset = queryset.filter(tags__contains=json.dumps(filters["tag"]))
+    return queryset
+
+
+def get_facets(filters=None):
+    """
+    Facet counts of the courses matching ``filters``, ready to render.
+
+    The catalog counts are kept up to date by the course signals. Counts
+    for filtered queries are computed with one query and cached until the
+    next course change.
+    """
+    if not filters:
+        facets = get_catalog_facets()
+    else:
+        digest = hashlib.md5(json.dumps(sorted(filters.items())).encode()).hexdigest()
+        key = f"course-facets:{_version()}:{digest}"
+        facets = cache.get(key)
+        if facets is None:
+            with read_from_primary():
+                facets = compute_facets(filter_courses(filters), filters.get("tag"))
+            cache.set(key, facets, QUERY_FACETS_CACHE_TIMEOUT)
+    return _render(facets)
+
+
+def _by_count(counter):
+    return sorted(counter.items(), key=lambda item: (-item[1], str(item[0])))
+
+
+def _render(facets):
+    labels = dict(
+        Institution.objects.filter(
+            pk__in=[pk for pk in facets["institution"] if pk is not None]
+        ).values_list("pk", "label")
+    )
+    return {
+        "total": facets["total"],
+        "institution": [
+            {"id": pk, "label": labels.get(pk), "count": count}
+            for pk, count in _by_count(facets["institution"])
+        ],
+        "price_band": [
+            {"value": band, "count": facets["price_band"][band]}
+            for band, _ in PRICE_BANDS
+            if facets["price_band"][band]
+        ],
+        "tag": [
+            {"value": tag, "count": count} for tag, count in _by_count(facets["tag"])
+        ],
+        "approved": [
+            {"value": value, "count": count}
+            for value, count in _by_count(facets["approved"])
+        ],
+        "published": [
+            {"value": value, "count": count}
+            for value, count in _by_count(facets["published"])
+        ],
+    }
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from courses.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = (
+        "Precompute course recommendations. By default only users whose "
+        "enrollments or interests changed since the last run are refreshed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Recompute recommendations for all users.",
+        )
+        parser.add_argument("--top-n", type=int, default=20)
+        parser.add_argument("--interest-weight", type=float, default=0.5)
+        parser.add_argument("--chunk-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        users = build_recommendations(
+            full=options["full"],
+            top_n=options["top_n"],
+            interest_weight=options["interest_weight"],
+            chunk_size=options["chunk_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed recommendations for {users} users")
+        )
@@ -0,0 +1,75 @@
+import gzip
+
+from django.core.management.base import BaseCommand
+
+from courses import exports
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream a dataset to a JSON Lines or CSV file in primary key order, "
+        "in constant memory. Interrupted exports resume with --after and "
+        "--append."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(exports.DATASETS))
+        parser.add_argument("output")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=list(exports.FORMATS),
+            default="jsonl",
+        )
+        parser.add_argument(
+            "--after",
+            type=int,
+            help="Only export rows with a primary key greater than this one.",
+        )
+        parser.add_argument(
+            "--append",
+            action="store_true",
+            help="Append to the output file, without a CSV header.",
+        )
+        parser.add_argument("--gzip", action="store_true")
+        parser.add_argument(
+            "--chunk-size", type=int, default=exports.DEFAULT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **options):
+        dataset = options["dataset"]
+        columns = exports.get_columns(dataset)
+        pk_index = columns.index(exports.DATASETS[dataset]._meta.pk.attname)
+        progress = {"rows": 0, "last": options["after"]}
+
+        def tracked(chunks):
+            for rows in chunks:
+                yield rows
+                # Only counted once the caller has written the chunk.
+                progress["rows"] += len(rows)
+                progress["last"] = rows[-1][pk_index]
+
+        mode = "ab" if options["append"] else "wb"
+        # Appended gzip members decompress as one stream.
+        opener = gzip.open if options["gzip"] else open
+        chunks = exports.export_rows(dataset, options["after"], options["chunk_size"])
+        try:
+            with opener(options["output"], mode) as output:
+                for data in exports.encode(
+                    columns,
+                    tracked(chunks),
+                    options["file_format"],
+                    header=not options["append"],
+                ):
+                    output.write(data)
+        except BaseException:
+            if progress["last"] is not None:
+                self.stderr.write(
+                    f"Export interrupted, resume with --append --after {progress['last']}"
+                )
+            raise
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {progress['rows']} rows, last id {progress['last']}"
+            )
+        )
@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+
+from courses.certificates import issue_certificates
+from courses.models import CertificateIssuanceCheckpoint, CertificateTemplate
+
+
+class Command(BaseCommand):
+    help = "Issue certificates for completed enrollments that do not have one yet."
+
+    def add_arguments(self, parser):
+        parser.add_argument("template_id", type=int)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Number of render processes (defaults to the CPU count).",
+        )
+        parser.add_argument("--valid-days", type=int, default=730)
+        parser.add_argument("--checkpoint", default="default")
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Start scanning enrollments from the beginning, not from an interrupted run.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            template = CertificateTemplate.objects.get(pk=options["template_id"])
+        except CertificateTemplate.DoesNotExist:
+            raise CommandError("Certificate template does not exist")
+
+        if options["reset"]:
+            CertificateIssuanceCheckpoint.objects.filter(
+                name=options["checkpoint"]
+            ).delete()
+
+        issued = issue_certificates(
+            template,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            valid_for=timedelta(days=options["valid_days"]),
+            checkpoint=options["checkpoint"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Issued {issued} certificates"))
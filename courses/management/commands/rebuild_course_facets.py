@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from courses.facets import rebuild_catalog_facets
+
+
+class Command(BaseCommand):
+    help = "Recompute the cached course facet counts, e.g. periodically from cron."
+
+    def handle(self, *args, **options):
+        facets = rebuild_catalog_facets()
+        self.stdout.write(self.style.SUCCESS(f"Counted {facets['total']} courses"))
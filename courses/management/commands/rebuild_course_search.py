@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from courses.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index for all courses."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_index(
+            batch_size=options["batch_size"], using=options["database"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} courses"))
@@ -0,0 +1,75 @@
+# Generated by Django 4.2.10 on 2026-10-19 18:15
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def backfill_verification_fields(apps, schema_editor):
+    Certificate = apps.get_model("courses", "Certificate")
+    certificates = Certificate.objects.select_related(
+        "enrollment__student", "enrollment__course"
+    )
+    batch = []
+    for certificate in certificates.iterator(chunk_size=1000):
+        student = certificate.enrollment.student
+        certificate.student_name = (
+            f"{student.first_name} {student.last_name}".strip() or student.username
+        )
+        certificate.course_title = certificate.enrollment.course.title
+        batch.append(certificate)
+        if len(batch) == 1000:
+            Certificate.objects.bulk_update(batch, ["student_name", "course_title"])
+            batch = []
+    Certificate.objects.bulk_update(batch, ["student_name", "course_title"])
+
+
+def renumber_duplicate_certificates(apps, schema_editor):
+    """
+    Keep the oldest certificate of each duplicated number and give the others
+    a unique number derived from it, so the unique constraint can be added.
+    Certificates are never deleted, renumbered ones end in ``-DUP-<pk>``.
+    """
+    Certificate = apps.get_model("courses", "Certificate")
+    duplicates = (
+        Certificate.objects.values("certificate_number")
+        .annotate(count=Count("pk"), first=Min("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in list(duplicates):
+        number = duplicate["certificate_number"]
+        certificates = Certificate.objects.filter(certificate_number=number).exclude(
+            pk=duplicate["first"]
+        )
+        for certificate in certificates.only("pk", "certificate_number"):
+            suffix = f"-DUP-{certificate.pk}"
+            certificate.certificate_number = number[: 255 - len(suffix)] + suffix
+            certificate.save(update_fields=["certificate_number"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0005_certificate_issuance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="certificate",
+            name="course_title",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.AddField(
+            model_name="certificate",
+            name="student_name",
+            field=models.CharField(blank=True, default="", max_length=255),
+        ),
+        migrations.RunPython(backfill_verification_fields, migrations.RunPython.noop),
+        migrations.RunPython(
+            renumber_duplicate_certificates, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name="certificate",
+            name="certificate_number",
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
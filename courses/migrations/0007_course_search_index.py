@@ -0,0 +1,82 @@
+# Generated by Django 4.2.10 on 2026-10-19 18:25
+
+import json
+
+from django.db import migrations
+
+
+def _tags_text(tags):
+    if not tags:
+        return ""
+    try:
+        return " ".join(str(tag) for tag in json.loads(tags))
+    except (TypeError, ValueError):
+        return tags
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE courses_course_fts USING fts5("
+            "title, description, tags, institution, "
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        insert = (
+            "INSERT INTO courses_course_fts "
+            "(rowid, title, description, tags, institution) "
+            "VALUES (%s, %s, %s, %s, %s)"
+        )
+    elif vendor == "postgresql":
+        schema_editor.execute(
+            "CREATE TABLE courses_course_search ("
+            "course_id bigint PRIMARY KEY "
+            "REFERENCES courses_course (id) ON DELETE CASCADE "
+            "DEFERRABLE INITIALLY DEFERRED, "
+            "document tsvector NOT NULL)"
+        )
+        schema_editor.execute(
+            "CREATE INDEX courses_course_search_document "
+            "ON courses_course_search USING GIN (document)"
+        )
+        insert = (
+            "INSERT INTO courses_course_search (course_id, document) VALUES (%s, "
+            "setweight(to_tsvector('english', %s), 'A') || "
+            "setweight(to_tsvector('english', %s), 'C') || "
+            "setweight(to_tsvector('english', %s), 'B') || "
+            "setweight(to_tsvector('english', %s), 'B'))"
+        )
+    else:
+        return
+
+    Course = apps.get_model("courses", "Course")
+    rows = Course.objects.values_list(
+        "id", "title", "description", "tags", "offered_by__label"
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            insert,
+            [
+                (course_id, title, description, _tags_text(tags), institution or "")
+                for course_id, title, description, tags, institution in rows
+            ],
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS courses_course_fts")
+    elif vendor == "postgresql":
+        schema_editor.execute("DROP TABLE IF EXISTS courses_course_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0006_certificate_verification"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_certificates(apps, schema_editor):
+    """
+    Keep the oldest certificate of each enrollment, the others were issued
+    by overlapping runs, so the unique constraint can be added.
+    """
+    Certificate = apps.get_model("courses", "Certificate")
+    manager = Certificate.objects.using(schema_editor.connection.alias)
+    duplicates = list(
+        manager.values("enrollment")
+        .annotate(count=Count("pk"), first=Min("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        manager.filter(enrollment=duplicate["enrollment"]).exclude(
+            pk=duplicate["first"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0009_course_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_certificates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="certificate",
+            constraint=models.UniqueConstraint(
+                fields=["enrollment"], name="unique_certificate_enrollment"
+            ),
+        ),
+    ]
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth.models import User
 from userprofiles.models import Institution
 import json
@@ -14,12 +15,16 @@ class Course(models.Model):
     description = models.CharField(max_length=255)
     price = models.DecimalField(max_digits=6, decimal_places=2)
     tags = models.TextField(blank=True, null=True)  
+    updated_at = models.DateTimeField(auto_now=True)
 
     def set_tags(self, tags_list):
         self.tags = json.dumps(tags_list)
 
     def get_tags(self):
         return json.loads(self.tags)
+
+    def __str__(self):
+        return self.title
     
 
 class Role(models.Model):
@@ -77,6 +82,9 @@ class Week(models.Model):
             self.week_number = (last_week.week_number if last_week else 0) + 1
         super().save(*args, **kwargs)
 
+    def __str__(self):
+        return f"{self.course.title} - Week {self.week_number}"
+
 class Video(models.Model):
     link = models.URLField()
     duration = models.CharField(max_length=255)
@@ -124,6 +132,9 @@ class Chapter(models.Model):
     quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE)
     coding_assignment = models.ForeignKey(CodingAssignment, on_delete=models.CASCADE)
 
+    def __str__(self):
+        return self.title
+
 
 class ChapterContent(models.Model):
     topic = models.CharField(max_length=255)
@@ -177,4 +188,61 @@ class Certificate(models.Model):
     certificate_link = models.URLField()
     issue_date = models.DateTimeField(auto_now_add=True)
     expiration_date = models.DateTimeField()
-    certificate_number = models.CharField(max_length=255)
\ No newline at end of file
+    certificate_number = models.CharField(max_length=255, unique=True)
+    student_name = models.CharField(max_length=255, blank=True, default="")
+    course_title = models.CharField(max_length=255, blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["enrollment"], name="unique_certificate_enrollment"
+            ),
+        ]
+
+class CertificateSequence(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def reserve(cls, name, count):
+        """
+        Reserve ``count`` consecutive values from the named sequence and
+        return them as a range. The increment is a single UPDATE, so concurrent
+        callers never receive overlapping values.
+        """
+        with transaction.atomic():
+            cls.objects.get_or_create(name=name)
+            cls.objects.filter(name=name).update(last_value=F("last_value") + count)
+            last_value = cls.objects.values_list("last_value", flat=True).get(name=name)
+        return range(last_value - count + 1, last_value + 1)
+
+    def __str__(self):
+        return f"{self.name} ({self.last_value})"
+
+
+class CertificateIssuanceCheckpoint(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    last_enrollment_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.last_enrollment_id})"
+
+
+class CourseRecommendation(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    course = models.ForeignKey(Course, on_delete=models.CASCADE)
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "rank"], name="unique_course_recommendation_rank"
+            )
+        ]
+
+
+class RecommendationRefresh(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True)
+    requested_at = models.DateTimeField(auto_now=True)
@@ -0,0 +1,175 @@
+import json
+
+import numpy as np
+from scipy import sparse
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from userprofiles.models import UserProfile
+from .models import Course, CourseRecommendation, Enrollment, RecommendationRefresh
+
+
+def _parse_tags(tags):
+    if not tags:
+        return []
+    try:
+        return [str(tag).casefold() for tag in json.loads(tags)]
+    except (TypeError, ValueError):
+        return []
+
+
+class RecommendationModel:
+    """
+    Sparse matrices needed to score courses for any user.
+
+    ``enrollments`` is the binary user x course matrix, ``similarity`` the
+    cosine-normalized course x course co-enrollment matrix, ``interests`` the
+    user x interest matrix and ``affinity`` the interest x course matrix
+    linking an interest to every course tagged with its label.
+    """
+
+    def __init__(self):
+        courses = list(Course.objects.values_list("id", "published", "tags"))
+        self.course_ids = np.array([course[0] for course in courses], dtype=np.int64)
+        self.published = np.array([course[1] for course in courses], dtype=bool)
+        course_index = {
+            course_id: index for index, course_id in enumerate(self.course_ids)
+        }
+
+        enrollments = [
+            (student_id, course_index[course_id])
+            for student_id, course_id in Enrollment.objects.values_list(
+                "student_id", "course_id"
+            )
+        ]
+        user_interests = list(
+            UserProfile.interests.through.objects.values_list(
+                "userprofile__user_id", "interest__label"
+            )
+        )
+
+        self.user_ids = np.unique(
+            np.array(
+                [user_id for user_id, _ in enrollments]
+                + [user_id for user_id, _ in user_interests],
+                dtype=np.int64,
+            )
+        )
+        self.user_index = {
+            user_id: index for index, user_id in enumerate(self.user_ids)
+        }
+        n_users, n_courses = len(self.user_ids), len(self.course_ids)
+
+        self.enrollments = self._binary(
+            [self.user_index[user_id] for user_id, _ in enrollments],
+            [course for _, course in enrollments],
+            (n_users, n_courses),
+        )
+
+        co_enrollments = (self.enrollments.T @ self.enrollments).tocsr()
+        popularity = co_enrollments.diagonal().astype(np.float64)
+        co_enrollments.setdiag(0)
+        co_enrollments.eliminate_zeros()
+        norm = sparse.diags(
+            np.divide(
+                1.0, np.sqrt(popularity), where=popularity > 0, out=np.zeros(n_courses)
+            )
+        )
+        self.similarity = (norm @ co_enrollments @ norm).tocsr()
+
+        labels = sorted({label.casefold() for _, label in user_interests})
+        label_index = {label: index for index, label in enumerate(labels)}
+        self.interests = self._binary(
+            [self.user_index[user_id] for user_id, _ in user_interests],
+            [label_index[label.casefold()] for _, label in user_interests],
+            (n_users, len(labels)),
+        )
+        tagged = [
+            (label_index[tag], index)
+            for index, (_, _, tags) in enumerate(courses)
+            for tag in set(_parse_tags(tags))
+            if tag in label_index
+        ]
+        self.affinity = self._binary(
+            [label for label, _ in tagged],
+            [course for _, course in tagged],
+            (len(labels), n_courses),
+        )
+
+    @staticmethod
+    def _binary(rows, cols, shape):
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.float64), (rows, cols)), shape=shape
+        )
+        matrix.data[:] = 1.0
+        return matrix
+
+    def scores(self, user_ids, interest_weight):
+        """Return a sparse users x courses score matrix for ``user_ids``."""
+        rows = [self.user_index[user_id] for user_id in user_ids]
+        enrolled = self.enrollments[rows]
+        scores = enrolled @ self.similarity
+        scores = scores + interest_weight * (self.interests[rows] @ self.affinity)
+        return scores.tocsr(), enrolled
+
+    def top_courses(self, user_ids, top_n, interest_weight):
+        """Yield ``(user_id, [(course_id, score), ...])`` best first."""
+        scores, enrolled = self.scores(user_ids, interest_weight)
+        for row, user_id in enumerate(user_ids):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            columns = scores.indices[start:end]
+            values = scores.data[start:end]
+
+            taken = enrolled.indices[enrolled.indptr[row] : enrolled.indptr[row + 1]]
+            keep = self.published[columns] & ~np.isin(columns, taken) & (values > 0)
+            columns, values = columns[keep], values[keep]
+
+            if len(columns) > top_n:
+                best = np.argpartition(-values, top_n - 1)[:top_n]
+                columns, values = columns[best], values[best]
+            order = np.lexsort((self.course_ids[columns], -values))
+            yield user_id, [
+                (int(self.course_ids[column]), float(value))
+                for column, value in zip(columns[order], values[order])
+            ]
+
+
+def build_recommendations(full=False, top_n=20, interest_weight=0.5, chunk_size=1000):
+    """
+    Precompute the top ``top_n`` courses for users and store them as
+    ``CourseRecommendation`` rows.
+
+    Without ``full`` only users with a pending ``RecommendationRefresh`` are
+    recomputed. Returns the number of users whose recommendations were written.
+    """
+    started = timezone.now()
+    if full:
+        user_ids = list(User.objects.values_list("id", flat=True))
+    else:
+        user_ids = list(RecommendationRefresh.objects.values_list("user_id", flat=True))
+    if not user_ids:
+        return 0
+
+    model = RecommendationModel()
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start : start + chunk_size]
+        known = [user_id for user_id in chunk if user_id in model.user_index]
+        recommendations = [
+            CourseRecommendation(
+                user_id=user_id, course_id=course_id, rank=rank, score=score
+            )
+            for user_id, courses in model.top_courses(known, top_n, interest_weight)
+            for rank, (course_id, score) in enumerate(courses, start=1)
+        ]
+        with transaction.atomic():
+            CourseRecommendation.objects.filter(user_id__in=chunk).delete()
+            CourseRecommendation.objects.bulk_create(
+                recommendations, batch_size=chunk_size
+            )
+            # Refreshes requested while we were computing stay queued.
+            RecommendationRefresh.objects.filter(
+                user_id__in=chunk, requested_at__lte=started
+            ).delete()
+    return len(user_ids)
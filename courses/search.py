@@ -0,0 +1,400 @@
+import hashlib
+import html
+import json
+import math
+import re
+import time
+import unicodedata
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from .models import Course
+
+HIGHLIGHT_START = "<mark>"
+HIGHLIGHT_END = "</mark>"
+# Private use characters the databases insert around matches. The text is
+# HTML-escaped before they are replaced with the highlight tags, so course
+# content can never add markup of its own.
+MATCH_START = "\ue000"
+MATCH_END = "\ue001"
+
+DOCUMENT_FIELDS = ["id", "title", "description", "tags", "offered_by__label"]
+SEARCH_CACHE_TIMEOUT = 10 * 60
+SEARCH_VERSION_CACHE_KEY = "course-search-version"
+# Document counts only shift the ranking slightly, they are not cleared on
+# index changes.
+TERM_STATISTICS_CACHE_TIMEOUT = 60 * 60
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def _tokenize(query):
+    return re.findall(r"\w+", query.lower())
+
+
+_TERM_RE = re.compile(r"[^\W_]+")
+
+
+def _terms(text):
+    # The tokens FTS5's unicode61 tokenizer indexes, without diacritics.
+    text = text.lower()
+    if not text.isascii():
+        text = "".join(
+            char
+            for char in unicodedata.normalize("NFKD", text)
+            if not unicodedata.combining(char)
+        )
+    return _TERM_RE.findall(text)
+
+
+def _bm25(rows, terms, weights, documents, document_counts):
+    """
+    Score ``(id, *columns)`` rows like FTS5's ``bm25()`` and return
+    ``(id, score)`` pairs, best first. The average document length is
+    taken over ``rows``.
+    """
+    idf = {
+        term: max(
+            math.log(
+                (documents - document_counts[term] + 0.5)
+                / (document_counts[term] + 0.5)
+            ),
+            1e-6,
+        )
+        for term in terms
+    }
+    counted = []
+    for course_id, *columns in rows:
+        length = 0
+        frequencies = dict.fromkeys(terms, 0)
+        for weight, text in zip(weights, columns):
+            tokens = _terms(text or "")
+            length += len(tokens)
+            for term in frequencies:
+                frequencies[term] += weight * tokens.count(term)
+        counted.append((course_id, length, frequencies))
+    average = sum(length for _, length, _ in counted) / len(counted) or 1
+    scores = []
+    for course_id, length, frequencies in counted:
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average)
+        score = 0
+        for term in terms:
+            frequency = frequencies[term]
+            score += idf[term] * frequency * (BM25_K1 + 1) / (frequency + norm)
+        scores.append((course_id, score))
+    return sorted(scores, key=lambda item: -item[1])
+
+
+def _tags_text(tags):
+    if not tags:
+        return ""
+    try:
+        return " ".join(str(tag) for tag in json.loads(tags))
+    except (TypeError, ValueError):
+        return tags
+
+
+def render_highlight(text):
+    if text is None:
+        return None
+    return (
+        html.escape(text)
+        .replace(MATCH_START, HIGHLIGHT_START)
+        .replace(MATCH_END, HIGHLIGHT_END)
+    )
+
+
+def _documents(rows):
+    for course_id, title, description, tags, institution in rows:
+        yield (course_id, title, description, _tags_text(tags), institution or "")
+
+
+class CourseSearchBackend:
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.connection = connections[using]
+
+
+class SQLiteCourseSearch(CourseSearchBackend):
+    """
+    Course search backed by the ``courses_course_fts`` FTS5 table.
+    The table's rowid is the course id.
+    """
+
+    table = "courses_course_fts"
+    # Column weights for title, description, tags and institution.
+    weights = (10.0, 2.0, 4.0, 3.0)
+    # The most courses ranked per query, broader queries are answered from
+    # the title matches and the newest courses.
+    candidate_limit = 500
+
+    def index(self, rows):
+        documents = list(_documents(rows))
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(document[0],) for document in documents],
+            )
+            cursor.executemany(
+                f"INSERT INTO {self.table} (rowid, title, description, tags, institution) "
+                "VALUES (%s, %s, %s, %s, %s)",
+                documents,
+            )
+
+    def remove(self, course_ids):
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {self.table} WHERE rowid = %s",
+                [(course_id,) for course_id in course_ids],
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {self.table}")
+
+    def search(self, query, limit):
+        """
+        Rank the candidates of ``query`` and return the best ``limit`` with
+        whether every match was a candidate.
+
+        FTS5's ``bm25()`` counts the documents of every term on each query,
+        which is proportional to the term's matches, so the same formula is
+        applied here to at most ``candidate_limit`` courses with the counts
+        cached. Courses matching in the title are candidates first, then
+        the newest other matches.
+        """
+        terms = _terms(query)
+        if not terms:
+            return [], True
+        match = " ".join(f'"{term}"' for term in terms)
+        with self.connection.cursor() as cursor:
+            candidates, exhaustive = self._candidates(cursor, match)
+            if not candidates:
+                return [], exhaustive
+            frequencies = self._document_frequencies(cursor, terms)
+            ranked = _bm25(candidates, terms, self.weights, *frequencies)[:limit]
+            # Highlights are only built for the rows returned.
+            cursor.execute(
+                f"SELECT rowid, highlight({self.table}, 0, %s, %s), "
+                f"snippet({self.table}, 1, %s, %s, '...', 24) "
+                f"FROM {self.table} WHERE {self.table} MATCH %s "
+                f"AND rowid IN ({', '.join(['%s'] * len(ranked))})",
+                [
+                    MATCH_START,
+                    MATCH_END,
+                    MATCH_START,
+                    MATCH_END,
+                    match,
+                    *(course_id for course_id, _ in ranked),
+                ],
+            )
+            highlights = {
+                course_id: {
+                    "title": render_highlight(title),
+                    "description": render_highlight(description),
+                }
+                for course_id, title, description in cursor.fetchall()
+            }
+        return [
+            {"id": course_id, "rank": score, "highlights": highlights[course_id]}
+            for course_id, score in ranked
+        ], exhaustive
+
+    def _matches(self, cursor, match, limit):
+        # FTS5 walks its rowid ordered index backwards without sorting.
+        cursor.execute(
+            f"SELECT rowid, title, description, tags, institution "
+            f"FROM {self.table} WHERE {self.table} MATCH %s "
+            "ORDER BY rowid DESC LIMIT %s",
+            [match, limit],
+        )
+        return cursor.fetchall()
+
+    def _candidates(self, cursor, match):
+        rows = self._matches(cursor, match, self.candidate_limit + 1)
+        if len(rows) <= self.candidate_limit:
+            return rows, True
+        candidates = self._matches(
+            cursor, f"{{title}} : ({match})", self.candidate_limit
+        )
+        seen = {row[0] for row in candidates}
+        for row in rows:
+            if len(candidates) == self.candidate_limit:
+                break
+            if row[0] not in seen:
+                candidates.append(row)
+        return candidates, False
+
+    def _document_frequencies(self, cursor, terms):
+        """The course count and the number of courses matching each term."""
+        # Counting the table reads every row. The highest course id is read
+        # from the index and only overestimates by the deleted courses.
+        cursor.execute(f"SELECT max(rowid) FROM {self.table}")
+        documents = cursor.fetchone()[0] or 0
+        keys = {
+            term: f"course-search-documents:{hashlib.md5(term.encode()).hexdigest()}"
+            for term in terms
+        }
+        counts = cache.get_many(keys.values())
+        missing = {}
+        for term, key in keys.items():
+            if key not in counts:
+                cursor.execute(
+                    f"SELECT count(*) FROM {self.table} WHERE {self.table} MATCH %s",
+                    [f'"{term}"'],
+                )
+                counts[key] = missing[key] = cursor.fetchone()[0]
+        cache.set_many(missing, TERM_STATISTICS_CACHE_TIMEOUT)
+        return documents, {term: counts[key] for term, key in keys.items()}
+
+
+class PostgresCourseSearch(CourseSearchBackend):
+    """
+    Course search backed by the ``courses_course_search`` table, which keeps
+    a weighted ``tsvector`` per course under a GIN index.
+    """
+
+    table = "courses_course_search"
+    config = "english"
+    headline_options = f"StartSel={MATCH_START}, StopSel={MATCH_END}"
+
+    def index(self, rows):
+        documents = list(_documents(rows))
+        with self.connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {self.table} (course_id, document) VALUES (%s, "
+                f"setweight(to_tsvector('{self.config}', %s), 'A') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'C') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B') || "
+                f"setweight(to_tsvector('{self.config}', %s), 'B')) "
+                "ON CONFLICT (course_id) DO UPDATE SET document = EXCLUDED.document",
+                documents,
+            )
+
+    def remove(self, course_ids):
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"DELETE FROM {self.table} WHERE course_id = ANY(%s)",
+                [list(course_ids)],
+            )
+
+    def clear(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"TRUNCATE {self.table}")
+
+    def search(self, query, limit):
+        tokens = _tokenize(query)
+        if not tokens:
+            return [], True
+        tsquery = " & ".join(tokens)
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT course.id, ts_rank(search.document, query) AS rank, "
+                f"ts_headline('{self.config}', course.title, query, %s), "
+                f"ts_headline('{self.config}', course.description, query, %s) "
+                f"FROM {self.table} search "
+                f"JOIN {Course._meta.db_table} course ON course.id = search.course_id, "
+                f"to_tsquery('{self.config}', %s) query "
+                "WHERE search.document @@ query ORDER BY rank DESC LIMIT %s",
+                [
+                    f"{self.headline_options}, HighlightAll=true",
+                    self.headline_options,
+                    tsquery,
+                    limit,
+                ],
+            )
+            # The GIN index finds every match, ts_rank() scores all of them.
+            return [
+                {
+                    "id": course_id,
+                    "rank": rank,
+                    "highlights": {
+                        "title": render_highlight(title),
+                        "description": render_highlight(description),
+                    },
+                }
+                for course_id, rank, title, description in cursor.fetchall()
+            ], True
+
+
+BACKENDS = {
+    "sqlite": SQLiteCourseSearch,
+    "postgresql": PostgresCourseSearch,
+}
+
+
+def get_search_backend(using=DEFAULT_DB_ALIAS):
+    backend_class = BACKENDS.get(connections[using].vendor)
+    return backend_class(using) if backend_class else None
+
+
+def _version():
+    version = cache.get(SEARCH_VERSION_CACHE_KEY)
+    if version is None:
+        version = time.time_ns()
+        cache.set(SEARCH_VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def _index_changed(using):
+    # Cached results are not found anymore once the change is visible.
+    transaction.on_commit(lambda: cache.delete(SEARCH_VERSION_CACHE_KEY), using)
+
+
+def search_courses(backend, query, limit):
+    """
+    ``backend.search`` with the results cached until the index changes.
+
+    Returns the matches and whether every matching course was ranked.
+    """
+    normalized = " ".join(_tokenize(query))
+    if not normalized:
+        return [], True
+    digest = hashlib.md5(normalized.encode()).hexdigest()
+    key = f"course-search:{_version()}:{limit}:{digest}"
+    result = cache.get(key)
+    if result is None:
+        result = backend.search(normalized, limit)
+        cache.set(key, result, SEARCH_CACHE_TIMEOUT)
+    return result
+
+
+def index_courses(queryset, using=DEFAULT_DB_ALIAS):
+    backend = get_search_backend(using)
+    if backend is not None:
+        backend.index(queryset.using(using).values_list(*DOCUMENT_FIELDS))
+        _index_changed(using)
+
+
+def remove_courses(course_ids, using=DEFAULT_DB_ALIAS):
+    backend = get_search_backend(using)
+    if backend is not None:
+        backend.remove(course_ids)
+        _index_changed(using)
+
+
+def rebuild_search_index(batch_size=10000, using=DEFAULT_DB_ALIAS):
+    """
+    Re-index every course of the ``using`` database in primary key batches
+    and return the count.
+    """
+    backend = get_search_backend(using)
+    if backend is None:
+        return 0
+
+    backend.clear()
+    indexed = 0
+    last_id = 0
+    while True:
+        rows = list(
+            Course.objects.using(using)
+            .filter(pk__gt=last_id)
+            .order_by("pk")
+            .values_list(*DOCUMENT_FIELDS)[:batch_size]
+        )
+        if not rows:
+            _index_changed(using)
+            return indexed
+        backend.index(rows)
+        indexed += len(rows)
+        last_id = rows[-1][0]
@@ -1,5 +1,6 @@
 from rest_framework import serializers
-from .models import Course
+from .models import Course, CourseTeachers, Certificate
+from mooc.fast_serializers import ValuesSerializer
 from userprofiles.models import Institution
 
 
@@ -32,6 +33,99 @@ class CourseSerializer(serializers.ModelSerializer):
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         institution = instance.offered_by
-        representation["offered_by"] = institution.label
+        representation["offered_by"] = institution.label if institution else None
 
         return representation
+
+
+_price = Course._meta.get_field("price")
+
+
+class FastCourseSerializer(ValuesSerializer):
+    """Read-only ``CourseSerializer`` for course lists."""
+
+    fields = {
+        "title": "title",
+        "offered_by": "offered_by__label",
+        "duration": "duration",
+        "header_img": "header_img",
+        "description": "description",
+        "price": "price",
+    }
+    converters = {
+        "price": serializers.DecimalField(
+            max_digits=_price.max_digits, decimal_places=_price.decimal_places
+        ).to_representation,
+    }
+
+
+class InstructorSerializer(serializers.ModelSerializer):
+    user_id = serializers.IntegerField(source="teacher_id")
+    username = serializers.CharField(source="teacher.username")
+    full_name = serializers.SerializerMethodField()
+    role = serializers.CharField(source="role.label")
+
+    class Meta:
+        model = CourseTeachers
+        fields = ["user_id", "username", "full_name", "role"]
+
+    def get_full_name(self, instance):
+        return f"{instance.teacher.first_name} {instance.teacher.last_name}".strip()
+
+
+class CourseDetailSerializer(serializers.ModelSerializer):
+    """
+    Read-only course page payload. Expects the course from
+    ``courses.details``, with ``instructors`` prefetched and the
+    ``week_count`` and ``enrollment_count`` annotations.
+    """
+
+    tags = serializers.SerializerMethodField()
+    offered_by = serializers.SerializerMethodField()
+    instructors = InstructorSerializer(many=True)
+    week_count = serializers.IntegerField()
+    enrollment_count = serializers.IntegerField()
+
+    class Meta:
+        model = Course
+        fields = [
+            "id",
+            "title",
+            "duration",
+            "header_img",
+            "description",
+            "price",
+            "tags",
+            "approved",
+            "published",
+            "offered_by",
+            "instructors",
+            "week_count",
+            "enrollment_count",
+        ]
+
+    def get_tags(self, instance):
+        return instance.get_tags() if instance.tags else []
+
+    def get_offered_by(self, instance):
+        institution = instance.offered_by
+        if institution is None:
+            return None
+        return {
+            "id": institution.id,
+            "label": institution.label,
+            "profile_picture": institution.profile_picture,
+            "country": institution.country.label if institution.country else None,
+        }
+
+
+class CertificateVerificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Certificate
+        fields = [
+            "certificate_number",
+            "student_name",
+            "course_title",
+            "issue_date",
+            "expiration_date",
+        ]
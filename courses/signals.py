@@ -0,0 +1,106 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from userprofiles.models import Institution, UserProfile
+from .certificates import invalidate_verification_payload
+from .facets import FACET_FIELDS, course_facets, update_catalog_facets
+from .models import (
+    Certificate,
+    Course,
+    CourseTeachers,
+    Enrollment,
+    RecommendationRefresh,
+    Role,
+    Week,
+)
+from .search import index_courses, remove_courses
+
+
+@receiver([post_save, post_delete], sender=Certificate)
+def invalidate_certificate_verification(sender, instance, **kwargs):
+    invalidate_verification_payload(instance.certificate_number)
+
+
+@receiver(post_save, sender=Course)
+def index_course(sender, instance, raw=False, using=None, **kwargs):
+    if not raw:
+        index_courses(Course.objects.filter(pk=instance.pk), using)
+
+
+@receiver(post_delete, sender=Course)
+def remove_course(sender, instance, using=None, **kwargs):
+    remove_courses([instance.pk], using)
+
+
+@receiver(pre_save, sender=Course)
+def read_course_facets(sender, instance, raw=False, update_fields=None, **kwargs):
+    # The stored values, the course is counted under them until now.
+    if raw or (update_fields is not None and update_fields.isdisjoint(FACET_FIELDS)):
+        return
+    instance._stored_facets = (
+        Course.objects.filter(pk=instance.pk).values_list(*FACET_FIELDS).first()
+        if instance.pk is not None
+        else None
+    )
+
+
+@receiver(post_save, sender=Course)
+def update_course_facets(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and update_fields.isdisjoint(FACET_FIELDS)):
+        return
+    old = getattr(instance, "_stored_facets", None)
+    new = course_facets(instance)
+    if old != new:
+        update_catalog_facets(old, new)
+
+
+@receiver(post_delete, sender=Course)
+def remove_course_facets(sender, instance, **kwargs):
+    update_catalog_facets(course_facets(instance), None)
+
+
+@receiver(post_save, sender=Institution)
+def reindex_institution_courses(
+    sender, instance, created=False, raw=False, using=None, **kwargs
+):
+    if not created and not raw:
+        courses = Course.objects.using(using).filter(offered_by=instance)
+        # Course representations show the institution label.
+        courses.update(updated_at=timezone.now())
+        index_courses(courses, using)
+
+
+@receiver(post_save, sender=Enrollment)
+@receiver(post_delete, sender=Enrollment)
+def refresh_student_recommendations(sender, instance, raw=False, **kwargs):
+    if not raw and kwargs.get("created", True):
+        RecommendationRefresh.objects.update_or_create(user_id=instance.student_id)
+
+
+@receiver(m2m_changed, sender=UserProfile.interests.through)
+def refresh_interest_recommendations(sender, instance, action, reverse, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and not reverse:
+        RecommendationRefresh.objects.update_or_create(user_id=instance.user_id)
+
+
+# The course page shows weeks and instructors, a change to them is a new
+# version of the course.
+@receiver([post_save, post_delete], sender=CourseTeachers)
+@receiver([post_save, post_delete], sender=Week)
+def touch_course(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Course.objects.filter(pk=instance.course_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Role)
+def touch_instructor_courses(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw or kwargs.get("update_fields") == {"last_login"}:
+        return
+    if sender is User:
+        courses = Course.objects.filter(courseteachers__teacher=instance)
+    else:
+        courses = Course.objects.filter(courseteachers__role=instance)
+    courses.update(updated_at=timezone.now())
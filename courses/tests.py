@@ -1,12 +1,53 @@
+import gzip
+import json
+import os
+import tempfile
+import time
 from contextlib import AbstractContextManager
+from decimal import Decimal
 from typing import Any
+from io import StringIO
+from unittest import mock
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
 from rest_framework_simplejwt.tokens import AccessToken
-from .models import Course
-from userprofiles.models import UserProfile, Country, Institution
+from .models import (
+    Chapter,
+    ChapterContent,
+    CodingAssignment,
+    Course,
+    Certificate,
+    CertificateIssuanceCheckpoint,
+    CertificateTemplate,
+    CourseTeachers,
+    Enrollment,
+    Notes,
+    Payment,
+    Quiz,
+    RecommendationRefresh,
+    Role,
+    Video,
+    Week,
+)
+from . import certificates, facets
+from .recommendations import build_recommendations
+from .search import SQLiteCourseSearch, get_search_backend
+from .serializers import CourseSerializer, FastCourseSerializer
+from userprofiles.models import UserProfile, Country, Institution, Interest
 from django.urls import reverse
+from mooc import throttling
+from mooc.renderers import JSONRenderer
+from mooc.routers import PrimaryReplicaRouter, read_database
+from mooc.testing import QueryBudgetMixin, seed_courses, seed_institutions
 
 
 class CreateCourseTest(APITestCase):
@@ -89,3 +130,991 @@ class CreateCourseTest(APITestCase):
             },
         }
         self.assertEqual(response.data, expected_data)
+
+
+class IssueCertificatesTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user(username="teacher@abc.com")
+        cls.course = Course.objects.create(
+            course_creator=cls.teacher,
+            title="Test Course",
+            duration="3 months",
+            description="This is a test course",
+            price=1000,
+        )
+        cls.template = CertificateTemplate.objects.create(
+            template_name="default",
+            template_link="https://test.com/certificates/{certificate_number}",
+        )
+        for index in range(5):
+            student = User.objects.create_user(username=f"student{index}@abc.com")
+            Enrollment.objects.create(
+                student=student, course=cls.course, completed=index != 0
+            )
+
+    def issue(self, **options):
+        call_command(
+            "issue_certificates",
+            self.template.id,
+            workers=1,
+            stdout=StringIO(),
+            **options,
+        )
+
+    def test_issue_certificates_for_completed_enrollments(self):
+        self.issue(batch_size=2)
+
+        certificates = Certificate.objects.order_by("certificate_number")
+        self.assertEqual(certificates.count(), 4)
+        self.assertFalse(
+            Certificate.objects.filter(enrollment__completed=False).exists()
+        )
+        numbers = [certificate.certificate_number for certificate in certificates]
+        self.assertEqual(len(set(numbers)), 4)
+        for number in numbers:
+            self.assertRegex(number, r"^MOOC-\d{10}-[0-9A-F]{10}$")
+        self.assertEqual(
+            certificates[0].certificate_link,
+            f"https://test.com/certificates/{numbers[0]}",
+        )
+
+    def test_issue_certificates_completed_after_a_run(self):
+        self.issue()
+        # The enrollment with the lowest primary key completes last.
+        enrollment = Enrollment.objects.get(completed=False)
+        enrollment.completed = True
+        enrollment.save()
+
+        self.issue()
+
+        self.assertEqual(Certificate.objects.count(), 5)
+        self.assertEqual(
+            Certificate.objects.values("certificate_number").distinct().count(), 5
+        )
+
+    def test_issue_certificates_resumes_from_checkpoint(self):
+        enrollments = list(
+            Enrollment.objects.filter(completed=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        # An interrupted run stopped after the first two enrollments.
+        CertificateIssuanceCheckpoint.objects.create(
+            name="default", last_enrollment_id=enrollments[1]
+        )
+
+        self.issue()
+        self.assertEqual(
+            set(Certificate.objects.values_list("enrollment_id", flat=True)),
+            set(enrollments[2:]),
+        )
+        self.assertEqual(
+            CertificateIssuanceCheckpoint.objects.get(name="default").last_enrollment_id,
+            0,
+        )
+
+        self.issue()
+        self.assertEqual(Certificate.objects.count(), 4)
+
+    def test_issue_certificates_clears_cached_misses(self):
+        cache.clear()
+        url = reverse("certificate-verify", args=["MOOC-0000000001-ABCDEF0123"])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        with mock.patch(
+            "courses.certificates.secrets.token_hex", return_value="abcdef0123"
+        ):
+            self.issue(batch_size=1)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    def test_concurrent_runs_issue_one_certificate_per_enrollment(self):
+        render_batch = certificates._render_batch
+
+        def render_during_other_run(template_link, contexts, workers):
+            # Another run issues the first enrollment after this one read it.
+            Certificate.objects.create(
+                enrollment_id=contexts[0]["enrollment_id"],
+                certificate_number="MOOC-OTHER",
+                certificate_link="https://test.com/certificates/MOOC-OTHER",
+                expiration_date=timezone.now(),
+            )
+            return render_batch(template_link, contexts, workers)
+
+        with mock.patch.object(certificates, "_render_batch", render_during_other_run):
+            issued = certificates.issue_certificates(self.template, workers=1)
+
+        self.assertEqual(issued, 3)
+        self.assertEqual(Certificate.objects.count(), 4)
+        self.assertEqual(
+            Certificate.objects.values("enrollment").distinct().count(), 4
+        )
+
+    def test_issue_certificates_reset(self):
+        CertificateIssuanceCheckpoint.objects.create(
+            name="default", last_enrollment_id=Enrollment.objects.latest("pk").pk
+        )
+        self.issue(reset=True)
+        self.assertEqual(Certificate.objects.count(), 4)
+
+
+class CertificateVerificationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        student = User.objects.create_user(
+            username="student@abc.com", first_name="test", last_name="student"
+        )
+        course = Course.objects.create(
+            course_creator=student,
+            title="Test Course",
+            duration="3 months",
+            description="This is a test course",
+            price=1000,
+        )
+        enrollment = Enrollment.objects.create(
+            student=student, course=course, completed=True
+        )
+        cls.certificate = Certificate.objects.create(
+            enrollment=enrollment,
+            certificate_link="https://test.com/certificates/MOOC-1",
+            expiration_date="2030-01-01T00:00:00Z",
+            certificate_number="MOOC-1",
+            student_name="test student",
+            course_title="Test Course",
+        )
+
+    def setUp(self):
+        cache.clear()
+        throttling.clear()
+
+    def test_verify_certificate_success(self):
+        url = reverse("certificate-verify", args=["MOOC-1"])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "success")
+        self.assertEqual(response.data["data"]["student_name"], "test student")
+        self.assertEqual(response.data["data"]["course_title"], "Test Course")
+
+        with self.assertNumQueries(0):
+            self.client.get(url)
+
+    def test_payload_is_read_from_primary(self):
+        routed = []
+
+        class RoutedSerializer(certificates.CertificateVerificationSerializer):
+            def __init__(self, *args, **kwargs):
+                routed.append(PrimaryReplicaRouter().db_for_read(Certificate))
+                super().__init__(*args, **kwargs)
+
+        token = read_database.set("replica")
+        try:
+            with mock.patch.object(
+                certificates, "CertificateVerificationSerializer", RoutedSerializer
+            ):
+                certificates.get_verification_payload("MOOC-1")
+        finally:
+            read_database.reset(token)
+        self.assertEqual(routed, ["default"])
+
+    def test_verify_unknown_certificate_is_cached(self):
+        url = reverse("certificate-verify", args=["MOOC-2"])
+        response = self.client.get(url)
+        expected_data = {"status": "fail", "message": ["Certificate not found"]}
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data, expected_data)
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"certificate_verification_ip": "2/min"},
+        }
+    )
+    def test_verification_is_throttled(self):
+        for number in ("MOOC-2", "MOOC-3"):
+            url = reverse("certificate-verify", args=[number])
+            response = self.client.get(url, REMOTE_ADDR="10.0.0.1")
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        url = reverse("certificate-verify", args=["MOOC-1"])
+        with self.assertNumQueries(0):
+            response = self.client.get(url, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        response = self.client.get(url, REMOTE_ADDR="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_new_certificate_clears_negative_cache(self):
+        url = reverse("certificate-verify", args=["MOOC-2"])
+        self.client.get(url)
+        enrollment = self.certificate.enrollment
+        enrollment.pk = None
+        enrollment.save()
+        self.certificate.pk = None
+        self.certificate.enrollment = enrollment
+        self.certificate.certificate_number = "MOOC-2"
+        self.certificate.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class CourseSearchTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="teacher@abc.com")
+        cls.institution = Institution.objects.create(label="Test Institute")
+        cls.python_course = Course.objects.create(
+            course_creator=cls.user,
+            title="Python for Beginners",
+            duration="3 months",
+            description="Learn to program",
+            price=1000,
+        )
+        cls.data_course = Course.objects.create(
+            course_creator=cls.user,
+            title="Data Analysis",
+            offered_by=cls.institution,
+            duration="3 months",
+            description="Analyse data with Python",
+            price=1000,
+            tags='["pandas", "statistics"]',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("course-search")
+
+    def search(self, query):
+        response = self.client.get(self.url, {"q": query})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["data"]
+
+    def test_search_ranks_title_matches_first(self):
+        results = self.search("python")
+        self.assertEqual(
+            [result["id"] for result in results],
+            [self.python_course.id, self.data_course.id],
+        )
+        self.assertEqual(
+            results[0]["highlights"]["title"], "<mark>Python</mark> for Beginners"
+        )
+        self.assertEqual(results[1]["offered_by"], "Test Institute")
+
+    def test_search_matches_tags_and_institution(self):
+        self.assertEqual(
+            [result["id"] for result in self.search("pandas")], [self.data_course.id]
+        )
+        self.assertEqual(
+            [result["id"] for result in self.search("institute")],
+            [self.data_course.id],
+        )
+
+    def test_search_ranks_every_match(self):
+        backend = get_search_backend()
+        # Newer, weaker matches than the best one, more than a page of them.
+        backend.index(
+            (10_000 + index, "Cooking", "python " + "recipes " * 20, "", "")
+            for index in range(300)
+        )
+        results, exhaustive = backend.search("python", 5)
+        self.assertEqual(results[0]["id"], self.python_course.id)
+        self.assertEqual(len(results), 5)
+        self.assertTrue(exhaustive)
+
+    @mock.patch.object(SQLiteCourseSearch, "candidate_limit", 50)
+    def test_broad_search_ranks_title_matches_first(self):
+        backend = get_search_backend()
+        backend.index(
+            (10_000 + index, "Cooking", "python " + "recipes " * 20, "", "")
+            for index in range(100)
+        )
+        results, exhaustive = backend.search("python", 5)
+        self.assertFalse(exhaustive)
+        self.assertEqual(results[0]["id"], self.python_course.id)
+        self.assertEqual(len(results), 5)
+        # The other candidates are the newest matches.
+        self.assertTrue(all(result["id"] >= 10_050 for result in results[1:]))
+
+        response = self.client.get(self.url, {"q": "python"})
+        self.assertFalse(response.data["exhaustive"])
+        self.assertEqual(response.data["data"][0]["id"], self.python_course.id)
+
+    def test_search_escapes_highlights(self):
+        course = Course.objects.create(
+            course_creator=self.user,
+            title="<script>alert(1)</script> Python",
+            duration="3 months",
+            description="<b>python</b>",
+            price=1000,
+        )
+        result = next(
+            result for result in self.search("python") if result["id"] == course.id
+        )
+        self.assertEqual(
+            result["highlights"],
+            {
+                "title": "&lt;script&gt;alert(1)&lt;/script&gt; <mark>Python</mark>",
+                "description": "&lt;b&gt;<mark>python</mark>&lt;/b&gt;",
+            },
+        )
+
+    def test_search_results_are_cached(self):
+        first = self.search("Python")
+        # Only the course rows are read.
+        with self.assertNumQueries(1):
+            self.assertEqual(self.search("python"), first)
+
+    def test_search_index_follows_course_changes(self):
+        self.search("rust")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.python_course.title = "Rust for Beginners"
+            self.python_course.save()
+        self.assertEqual(
+            [result["id"] for result in self.search("rust")], [self.python_course.id]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.institution.label = "Renamed University"
+            self.institution.save()
+        self.assertEqual(
+            [result["id"] for result in self.search("renamed")], [self.data_course.id]
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.data_course.delete()
+        self.assertEqual(self.search("renamed"), [])
+
+    def test_search_without_query(self):
+        self.assertEqual(self.search(""), [])
+
+
+class CourseRecommendationTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.country = Country.objects.get(label="India")
+        cls.users = [
+            User.objects.create_user(username=f"student{index}@abc.com")
+            for index in range(4)
+        ]
+        cls.courses = [
+            Course.objects.create(
+                course_creator=cls.users[0],
+                title=f"Course {index}",
+                duration="3 months",
+                description="This is a test course",
+                price=1000,
+                published=True,
+                tags='["mathematics"]' if index == 3 else None,
+            )
+            for index in range(4)
+        ]
+        for user, courses in [
+            (cls.users[0], [0, 1]),
+            (cls.users[1], [0, 1, 2]),
+            (cls.users[2], [0]),
+        ]:
+            for course in courses:
+                Enrollment.objects.create(student=user, course=cls.courses[course])
+        profile = UserProfile.objects.create(
+            user=cls.users[3], country=cls.country, birth_date="1990-01-01"
+        )
+        profile.interests.add(Interest.objects.get(label="Mathematics"))
+
+    def setUp(self):
+        self.url = reverse("course-recommendations")
+
+    def get_recommendations(self, user):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [course["id"] for course in response.data["data"]]
+
+    def test_recommend_co_enrolled_courses(self):
+        build_recommendations(full=True)
+        self.assertEqual(
+            self.get_recommendations(self.users[2]),
+            [self.courses[1].id, self.courses[2].id],
+        )
+        self.assertEqual(self.get_recommendations(self.users[0]), [self.courses[2].id])
+
+    def test_recommend_courses_from_interests(self):
+        build_recommendations(full=True)
+        self.assertEqual(self.get_recommendations(self.users[3]), [self.courses[3].id])
+
+    def test_incremental_refresh_only_touches_changed_users(self):
+        build_recommendations(full=True)
+        self.assertFalse(RecommendationRefresh.objects.exists())
+
+        Enrollment.objects.create(student=self.users[2], course=self.courses[1])
+        self.assertEqual(build_recommendations(), 1)
+        self.assertEqual(self.get_recommendations(self.users[2]), [self.courses[2].id])
+        self.assertEqual(self.get_recommendations(self.users[0]), [self.courses[2].id])
+
+
+class CourseQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="teacher@abc.com")
+        seed_courses(cls.user, 200, seed_institutions(50))
+
+    def test_course_list_budget(self):
+        with self.assertQueryBudget(1):
+            response = self.client.get(reverse("course-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), 200)
+
+    def test_course_detail_budget(self):
+        course = Course.objects.first()
+        with self.assertQueryBudget(1):
+            response = self.client.get(reverse("course-detail", args=[course.id]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class FastCourseSerializerTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="teacher@abc.com")
+        seed_courses(user, 5, seed_institutions(2))
+        Course.objects.filter(pk=Course.objects.first().pk).update(
+            offered_by=None, header_img="https://example.com/header.png", price="12.5"
+        )
+
+    def test_output_matches_model_serializer(self):
+        courses = Course.objects.select_related("offered_by").order_by("pk")
+        expected = CourseSerializer(courses, many=True).data
+        fast = FastCourseSerializer(courses).data
+
+        self.assertEqual(fast, expected)
+        self.assertEqual(fast[0]["price"], "12.50")
+        self.assertIsNone(fast[0]["offered_by"])
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(expected))
+
+
+class CourseConditionalGetTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="teacher@abc.com")
+        cls.institutions = seed_institutions(2)
+        cls.courses = seed_courses(cls.user, 3, cls.institutions)
+
+    def test_course_detail_not_modified(self):
+        url = reverse("course-detail", args=[self.courses[0].id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("Last-Modified", response)
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+        with self.assertQueryBudget(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+        self.assertIn("ETag", response)
+
+    def test_course_list_etag_changes_with_courses(self):
+        etag = self.client.get(reverse("course-list"))["ETag"]
+        response = self.client.get(reverse("course-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.courses[1].title = "Renamed"
+        self.courses[1].save()
+        response = self.client.get(reverse("course-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+        etag = response["ETag"]
+        self.courses[2].delete()
+        response = self.client.get(reverse("course-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_institution_rename_changes_course_etag(self):
+        url = reverse("course-detail", args=[self.courses[0].id])
+        etag = self.client.get(url)["ETag"]
+
+        institution = self.courses[0].offered_by
+        institution.label = "Renamed Institution"
+        institution.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["offered_by"], "Renamed Institution")
+
+
+class ExportTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username="admin@abc.com")
+        student = User.objects.create_user(username="student@abc.com")
+        courses = seed_courses(cls.admin, 5, seed_institutions(2))
+        cls.enrollments = [
+            Enrollment.objects.create(student=student, course=course)
+            for course in courses
+        ]
+        cls.payments = [
+            Payment.objects.create(enrollment=enrollment, amount=Decimal("19.90"))
+            for enrollment in cls.enrollments
+        ]
+
+    def setUp(self):
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.admin)}"
+        )
+
+    def export(self, dataset, file_format, **params):
+        return self.client.get(
+            reverse("course-export", args=[dataset, file_format]), params
+        )
+
+    def test_export_requires_admin(self):
+        student = User.objects.get(username="student@abc.com")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(student)}"
+        )
+        response = self.export("payments", "jsonl")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_jsonl_export_in_chunks(self):
+        response = self.export("payments", "jsonl", chunk_size=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual([row["id"] for row in rows], [p.id for p in self.payments])
+        self.assertEqual(rows[0]["amount"], "19.90")
+        self.assertEqual(
+            rows[0]["payment_date"], self.payments[0].payment_date.isoformat()
+        )
+
+    def test_resume_after_cursor(self):
+        after = self.enrollments[2].id
+        response = self.export("enrollments", "csv", after=after)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "id,student_id,course_id,enrollment_date,completed")
+        self.assertEqual(
+            [int(line.split(",")[0]) for line in lines[1:]],
+            [enrollment.id for enrollment in self.enrollments[3:]],
+        )
+
+        response = self.export("enrollments", "csv", after="abc")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_gzip_export(self):
+        response = self.client.get(
+            reverse("course-export", args=["courses", "csv"]),
+            HTTP_ACCEPT_ENCODING="gzip, deflate",
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+        self.assertEqual(len(lines), 6)
+
+    def test_unknown_export(self):
+        response = self.export("users", "jsonl")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_export_command_resumes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "payments.jsonl.gz")
+            after = self.payments[1].id
+            call_command(
+                "export_data", "payments", path, "--gzip", "--after", str(after),
+                stdout=StringIO(),
+            )
+            call_command(
+                "export_data", "payments", path, "--gzip", "--append",
+                "--chunk-size", "1", stdout=StringIO(),
+            )
+            with gzip.open(path) as file:
+                ids = [json.loads(line)["id"] for line in file]
+        self.assertEqual(
+            ids,
+            [payment.id for payment in self.payments[2:]]
+            + [payment.id for payment in self.payments],
+        )
+
+
+class CourseDetailsTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator = User.objects.create_user(username="creator@abc.com")
+        cls.institution = Institution.objects.create(
+            label="Details University", country=Country.objects.get(label="Turkey")
+        )
+        cls.course = Course.objects.create(
+            course_creator=cls.creator,
+            title="Details",
+            offered_by=cls.institution,
+            duration="3 months",
+            description="Course page",
+            price=100,
+            tags=json.dumps(["python"]),
+        )
+        cls.teacher_role = Role.objects.create(label="teacher")
+        cls.assistant_role = Role.objects.create(label="non-editing-teacher")
+        for index in range(3):
+            teacher = User.objects.create_user(
+                username=f"teacher{index}@abc.com",
+                first_name="Teacher",
+                last_name=str(index),
+            )
+            CourseTeachers.objects.create(
+                course=cls.course,
+                teacher=teacher,
+                role=cls.teacher_role if index == 0 else cls.assistant_role,
+            )
+            Week.objects.create(course=cls.course, introduction="Intro")
+        for index in range(4):
+            student = User.objects.create_user(username=f"student{index}@abc.com")
+            Enrollment.objects.create(student=student, course=cls.course)
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("course-details", args=[self.course.pk])
+
+    def test_course_details(self):
+        with self.assertQueryBudget(3):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual(data["title"], "Details")
+        self.assertEqual(data["tags"], ["python"])
+        self.assertEqual(
+            data["offered_by"],
+            {
+                "id": self.institution.pk,
+                "label": "Details University",
+                "profile_picture": None,
+                "country": "Turkey",
+            },
+        )
+        self.assertEqual(
+            data["instructors"][0],
+            {
+                "user_id": User.objects.get(username="teacher0@abc.com").pk,
+                "username": "teacher0@abc.com",
+                "full_name": "Teacher 0",
+                "role": "teacher",
+            },
+        )
+        self.assertEqual(
+            [instructor["role"] for instructor in data["instructors"][1:]],
+            ["non-editing-teacher", "non-editing-teacher"],
+        )
+        self.assertEqual(data["week_count"], 3)
+        self.assertEqual(data["enrollment_count"], 4)
+
+    def test_cached_per_version(self):
+        self.client.get(self.url)
+        with self.assertQueryBudget(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["data"]["week_count"], 3)
+
+        Week.objects.create(course=self.course, introduction="Intro")
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["data"]["week_count"], 4)
+
+        teacher = User.objects.get(username="teacher1@abc.com")
+        teacher.first_name = "Renamed"
+        teacher.save()
+        response = self.client.get(self.url)
+        instructors = response.data["data"]["instructors"]
+        self.assertEqual(instructors[1]["full_name"], "Renamed 1")
+
+    def test_unknown_course(self):
+        response = self.client.get(reverse("course-details", args=[0]))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data["status"], "fail")
+
+
+class CourseFacetsTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.creator = User.objects.create_user(username="creator@abc.com")
+        cls.mit, cls.ucl = seed_institutions(2)
+        for title, institution, price, tags, approved in [
+            ("Free", cls.mit, 0, ["python"], True),
+            ("Cheap", cls.mit, 20, ["python", "web"], True),
+            ("Mid", cls.ucl, 75, ["web"], False),
+            ("Pricey", None, 250, ["pythonic"], False),
+        ]:
+            Course.objects.create(
+                course_creator=cls.creator,
+                title=title,
+                offered_by=institution,
+                duration="3 months",
+                description="Facets",
+                price=price,
+                tags=json.dumps(tags),
+                approved=approved,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("course-facets")
+
+    def create_course(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Course.objects.create(
+                course_creator=self.creator,
+                title="New",
+                duration="3 months",
+                description="Facets",
+                **kwargs,
+            )
+
+    def test_catalog_facets(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.data["data"]
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(
+            data["institution"],
+            [
+                {"id": self.mit.pk, "label": self.mit.label, "count": 2},
+                {"id": self.ucl.pk, "label": self.ucl.label, "count": 1},
+                {"id": None, "label": None, "count": 1},
+            ],
+        )
+        self.assertEqual(
+            data["price_band"],
+            [
+                {"value": "free", "count": 1},
+                {"value": "under-50", "count": 1},
+                {"value": "50-100", "count": 1},
+                {"value": "200-plus", "count": 1},
+            ],
+        )
+        self.assertEqual(
+            data["tag"],
+            [
+                {"value": "python", "count": 2},
+                {"value": "web", "count": 2},
+                {"value": "pythonic", "count": 1},
+            ],
+        )
+        self.assertEqual(
+            data["approved"],
+            [{"value": False, "count": 2}, {"value": True, "count": 2}],
+        )
+        self.assertEqual(data["published"], [{"value": False, "count": 4}])
+
+    def test_filtered_facets(self):
+        response = self.client.get(self.url, {"tag": "python", "approved": "true"})
+        data = response.data["data"]
+        self.assertEqual(data["total"], 2)
+        self.assertEqual(
+            data["tag"], [{"value": "python", "count": 2}, {"value": "web", "count": 1}]
+        )
+
+        response = self.client.get(
+            self.url, {"institution": self.mit.pk, "price_band": "under-50"}
+        )
+        self.assertEqual(response.data["data"]["total"], 1)
+
+    def test_invalid_filters(self):
+        for params in [
+            {"institution": "mit"},
+            {"price_band": "cheap"},
+            {"published": "yes"},
+        ]:
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cached_facets(self):
+        self.client.get(self.url)
+        self.client.get(self.url, {"approved": "true"})
+        # Only the institution labels are read.
+        with self.assertQueryBudget(1):
+            self.client.get(self.url)
+        with self.assertQueryBudget(1):
+            self.client.get(self.url, {"approved": "true"})
+
+    def test_incremental_updates(self):
+        self.client.get(self.url, {"approved": "true"})
+        facets.get_catalog_facets()
+        course = self.create_course(
+            offered_by=self.ucl, price=150, tags=json.dumps(["web"]), approved=True
+        )
+        course.published = True
+        course.price = "10.00"
+        with self.captureOnCommitCallbacks(execute=True):
+            course.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            Course.objects.filter(title__in=["Free", "Mid"]).delete()
+
+        with self.assertQueryBudget(1):
+            data = self.client.get(self.url).data["data"]
+        self.assertEqual(data, facets._render(facets.compute_facets()))
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(data["published"][0], {"value": False, "count": 2})
+        # Query facets are not served from before the changes.
+        response = self.client.get(self.url, {"approved": "true"})
+        self.assertEqual(response.data["data"]["total"], 2)
+
+    def test_updates_count_new_values(self):
+        facets.get_catalog_facets()
+        self.create_course(price=0, tags=json.dumps(["rust"]))
+        self.assertEqual(facets.get_facets()["tag"][-1], {"value": "rust", "count": 1})
+        self.assertEqual(facets.get_facets(), facets._render(facets.compute_facets()))
+
+    def test_updates_do_not_rewrite_counts(self):
+        facets.get_catalog_facets()
+        # Concurrent read-modify-writes of the counts would lose updates.
+        with mock.patch.object(cache, "set") as cache_set:
+            self.create_course(offered_by=self.mit, price=10, tags=json.dumps(["web"]))
+        cache_set.assert_not_called()
+        self.assertEqual(facets.get_catalog_facets()["institution"][self.mit.pk], 3)
+
+    def test_facets_are_computed_on_primary(self):
+        routed = []
+        compute_facets = facets.compute_facets
+
+        def route(*args, **kwargs):
+            routed.append(PrimaryReplicaRouter().db_for_read(Course))
+            return compute_facets(*args, **kwargs)
+
+        token = read_database.set("replica")
+        try:
+            with mock.patch.object(facets, "compute_facets", route), mock.patch.object(
+                facets, "_render"
+            ):
+                facets.get_facets()
+                facets.get_facets({"approved": True})
+        finally:
+            read_database.reset(token)
+        self.assertEqual(routed, ["default", "default"])
+
+    def test_periodic_recomputation(self):
+        facets.get_catalog_facets()
+        # Bulk queries send no signals.
+        Course.objects.filter(title="Free").update(published=True)
+        self.assertEqual(facets.get_facets()["published"], [{"value": False, "count": 4}])
+
+        expired = time.time() + facets.FACETS_RECOMPUTE_INTERVAL + 1
+        with mock.patch("time.time", return_value=expired):
+            self.assertIsNone(cache.get(facets.FACETS_CACHE_KEY))
+        cache.delete(facets.FACETS_CACHE_KEY)
+        self.assertEqual(
+            facets.get_facets()["published"],
+            [{"value": False, "count": 3}, {"value": True, "count": 1}],
+        )
+
+        Course.objects.filter(title="Cheap").update(published=True)
+        out = StringIO()
+        call_command("rebuild_course_facets", stdout=out)
+        self.assertIn("Counted 4 courses", out.getvalue())
+        self.assertEqual(facets.get_facets()["published"][0], {"value": False, "count": 2})
+
+
+class CourseAdminTest(TestCase):
+    changelists = ["course", "courseteachers", "enrollment", "payment", "week"]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username="admin@abc.com")
+        cls.role = Role.objects.create(label="teacher")
+        cls.institutions = seed_institutions(3)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def seed(self, count):
+        students = User.objects.bulk_create(
+            User(username=f"student-{User.objects.count()}-{index}@abc.com")
+            for index in range(count)
+        )
+        courses = seed_courses(self.admin, count, self.institutions)
+        for student, course in zip(students, courses):
+            enrollment = Enrollment.objects.create(student=student, course=course)
+            Payment.objects.create(enrollment=enrollment, amount=10)
+            CourseTeachers.objects.create(course=course, teacher=student, role=self.role)
+            Week.objects.create(course=course, introduction="Intro")
+
+    def changelist_queries(self, model_name):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse(f"admin:courses_{model_name}_changelist"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.seed(2)
+        few = {name: self.changelist_queries(name) for name in self.changelists}
+        self.seed(20)
+        many = {name: self.changelist_queries(name) for name in self.changelists}
+        self.assertEqual(many, few)
+
+
+class AsyncCourseViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="teacher@abc.com")
+        cls.courses = seed_courses(cls.user, 3, seed_institutions(2))
+        cls.course = cls.courses[0]
+        week = Week.objects.create(course=cls.course, introduction="Intro")
+        deadline = timezone.now()
+        quiz = Quiz.objects.create(title="Quiz", deadline=deadline)
+        assignment = CodingAssignment.objects.create(
+            link="https://example.com/assignment", deadline=deadline
+        )
+        cls.chapter = Chapter.objects.create(
+            week=week,
+            title="Chapter",
+            introduction="Intro",
+            quiz=quiz,
+            coding_assignment=assignment,
+        )
+        ChapterContent.objects.create(
+            topic="Topic",
+            chapter=cls.chapter,
+            note=Notes.objects.create(content="Notes"),
+            video=Video.objects.create(
+                link="https://example.com/video", duration="10:00"
+            ),
+            quiz=quiz,
+            coding_assignment=assignment,
+        )
+
+    async def test_list_and_detail_match_sync_views(self):
+        for sync_url, async_url in [
+            (reverse("course-list"), reverse("async-course-list")),
+            (
+                reverse("course-detail", args=[self.course.id]),
+                reverse("async-course-detail", args=[self.course.id]),
+            ),
+        ]:
+            sync_response = await sync_to_async(self.client.get)(sync_url)
+            response = await self.async_client.get(async_url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.json(), sync_response.json())
+
+    async def test_curriculum(self):
+        response = await self.async_client.get(
+            reverse("async-course-curriculum", args=[self.course.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        weeks = response.json()["data"]["weeks"]
+        self.assertEqual(len(weeks), 1)
+        self.assertEqual(weeks[0]["week_number"], 1)
+        chapter = weeks[0]["chapters"][0]
+        self.assertEqual(chapter["id"], self.chapter.id)
+        self.assertEqual(
+            chapter["contents"][0]["video"],
+            {"link": "https://example.com/video", "duration": "10:00"},
+        )
+
+    async def test_unknown_course(self):
+        response = await self.async_client.get(
+            reverse("async-course-detail", args=[0])
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"status": "fail", "message": ["Not found."]})
+
+    async def test_read_only(self):
+        response = await self.async_client.post(reverse("async-course-list"))
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
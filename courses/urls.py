@@ -1,9 +1,20 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import CourseViewSet
+from .views import CourseViewSet, CertificateVerificationAPIView, ExportAPIView
 
 router = DefaultRouter()
 router.register(r"", CourseViewSet, basename="course")
 
-urlpatterns = []
+urlpatterns = [
+    path(
+        "certificates/verify/<slug:certificate_number>/",
+        CertificateVerificationAPIView.as_view(),
+        name="certificate-verify",
+    ),
+    path(
+        "export/<slug:dataset>.<slug:file_format>",
+        ExportAPIView.as_view(),
+        name="course-export",
+    ),
+]
 urlpatterns = router.urls + urlpatterns
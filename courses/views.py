@@ -1,14 +1,48 @@
 from rest_framework import generics, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import APIException, NotFound, ValidationError
 from rest_framework.response import Response
 from django.contrib.auth.models import User
-from .serializers import CourseSerializer
+from django.http import Http404, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_sequence
+from mooc.conditional import ConditionalGetMixin, get_validators
+from mooc.throttling import CertificateVerificationIPThrottle
+from .serializers import CourseSerializer, FastCourseSerializer
 from .models import Course
+from .certificates import get_verification_payload
+from .details import get_course_details
+from . import exports, facets
+from .search import get_search_backend, search_courses
 
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+EXPORT_MAX_CHUNK_SIZE = 10000
 
-class CourseViewSet(viewsets.ModelViewSet):
-    queryset = Course.objects.all()
+
+class CourseViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = Course.objects.select_related("offered_by")
     serializer_class = CourseSerializer
 
+    def list(self, request, *args, **kwargs):
+        rows = list(
+            self.filter_queryset(self.get_queryset()).values_list(
+                "pk", "updated_at", *FastCourseSerializer.lookups()
+            )
+        )
+        not_modified = self.check_validators(
+            request, *get_validators(row[:2] for row in rows)
+        )
+        return not_modified or Response(
+            [FastCourseSerializer.to_representation(row[2:]) for row in rows]
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        course = self.get_object()
+        return self.not_modified(request, [course]) or Response(
+            self.get_serializer(course).data
+        )
+
     def create(self, request, *args, **kwargs):
 
         response = super().create(request, *args, **kwargs)
@@ -18,3 +52,163 @@ class CourseViewSet(viewsets.ModelViewSet):
             "data": response.data,
         }
         return response
+
+    @action(detail=True, methods=["get"])
+    def details(self, request, pk=None):
+        try:
+            details = get_course_details(int(pk))
+        except ValueError:
+            details = None
+        if details is None:
+            raise Http404
+        respObj = {
+            "status": "success",
+            "data": details,
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def facets(self, request):
+        """
+        Course counts per institution, price band, tag, approved and
+        published state, with the total, of the courses matching the
+        ``institution``, ``price_band``, ``tag``, ``approved`` and
+        ``published`` query parameters.
+        """
+        params = request.query_params
+        filters = {}
+        if "institution" in params:
+            try:
+                filters["institution"] = int(params["institution"])
+            except ValueError:
+                raise ValidationError({"institution": ["A valid integer is required."]})
+        if "price_band" in params:
+            if params["price_band"] not in dict(facets.PRICE_BANDS):
+                raise ValidationError({"price_band": ["Unknown price band."]})
+            filters["price_band"] = params["price_band"]
+        if params.get("tag"):
+            filters["tag"] = params["tag"]
+        for name in ("approved", "published"):
+            if name in params:
+                if params[name] not in ("true", "false"):
+                    raise ValidationError({name: ["Must be true or false."]})
+                filters[name] = params[name] == "true"
+
+        respObj = {
+            "status": "success",
+            "data": facets.get_facets(filters),
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        backend = get_search_backend()
+        if backend is None:
+            raise APIException("Course search is not available")
+
+        query = request.query_params.get("q", "")
+        try:
+            limit = int(request.query_params.get("limit", SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            limit = SEARCH_DEFAULT_LIMIT
+        limit = min(max(limit, 1), SEARCH_MAX_LIMIT)
+
+        matches, exhaustive = search_courses(backend, query, limit)
+        courses = {
+            row[0]: row[1:]
+            for row in Course.objects.filter(
+                pk__in=[match["id"] for match in matches]
+            ).values_list("id", *FastCourseSerializer.lookups())
+        }
+        results = []
+        for match in matches:
+            course = courses.get(match["id"])
+            if course is None:
+                continue
+            results.append(
+                {
+                    "id": match["id"],
+                    **FastCourseSerializer.to_representation(course),
+                    "rank": match["rank"],
+                    "highlights": match["highlights"],
+                }
+            )
+
+        respObj = {
+            "status": "success",
+            "data": results,
+            # False when the query matched too many courses to rank them all.
+            "exhaustive": exhaustive,
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+    @action(
+        detail=False, methods=["get"], permission_classes=[permissions.IsAuthenticated]
+    )
+    def recommendations(self, request):
+        rows = (
+            Course.objects.filter(courserecommendation__user=request.user)
+            .order_by("courserecommendation__rank")
+            .values_list("id", *FastCourseSerializer.lookups())
+        )
+        respObj = {
+            "status": "success",
+            "data": [
+                {"id": row[0], **FastCourseSerializer.to_representation(row[1:])}
+                for row in rows
+            ],
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+
+class CertificateVerificationAPIView(generics.GenericAPIView):
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    throttle_classes = [CertificateVerificationIPThrottle]
+
+    def get(self, request, certificate_number):
+        payload = get_verification_payload(certificate_number)
+        if payload is None:
+            raise NotFound("Certificate not found")
+
+        respObj = {
+            "status": "success",
+            "data": payload,
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+
+class ExportAPIView(generics.GenericAPIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, dataset, file_format):
+        if dataset not in exports.DATASETS or file_format not in exports.FORMATS:
+            raise NotFound("Unknown export")
+
+        after = request.query_params.get("after")
+        if after is not None:
+            try:
+                after = int(after)
+            except ValueError:
+                raise ValidationError({"after": ["A valid integer is required."]})
+        try:
+            chunk_size = int(
+                request.query_params.get("chunk_size", exports.DEFAULT_CHUNK_SIZE)
+            )
+        except ValueError:
+            chunk_size = exports.DEFAULT_CHUNK_SIZE
+        chunk_size = min(max(chunk_size, 1), EXPORT_MAX_CHUNK_SIZE)
+
+        content = exports.stream_export(dataset, file_format, after, chunk_size)
+        gzip = "gzip" in request.META.get("HTTP_ACCEPT_ENCODING", "")
+        response = StreamingHttpResponse(
+            compress_sequence(content) if gzip else content,
+            content_type=exports.FORMATS[file_format],
+        )
+        if gzip:
+            response["Content-Encoding"] = "gzip"
+        patch_vary_headers(response, ["Accept-Encoding"])
+        response["Content-Disposition"] = (
+            f'attachment; filename="{dataset}.{file_format}"'
+        )
+        return response
@@ -0,0 +1,10 @@
+from django.contrib import admin
+
+from mooc.paginators import EstimatedCountPaginator
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """Changelist of a table too large to count on every page view."""
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
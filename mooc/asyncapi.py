@@ -0,0 +1,61 @@
+"""
+Helpers for async views served natively under ASGI.
+
+DRF 3.14 views are synchronous, under ASGI every request to them hops to a
+worker thread. These views are plain Django coroutines instead, querying
+through the async ORM and rendering the same JSON as their DRF
+counterparts, including the ``{"status": "fail", ...}`` error envelope.
+"""
+
+from functools import wraps
+
+from django.http import Http404, HttpResponse
+from rest_framework import exceptions, status
+
+from mooc.renderers import JSONRenderer
+from mooc.utils import extract_all_error_messages
+
+_renderer = JSONRenderer()
+
+
+def render(data, status_code=status.HTTP_200_OK, headers=None):
+    return HttpResponse(
+        _renderer.render(data),
+        status=status_code,
+        content_type=_renderer.media_type,
+        headers=headers,
+    )
+
+
+def render_exception(exc):
+    detail = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+    headers = None
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers = {"WWW-Authenticate": 'Bearer realm="api"'}
+    elif isinstance(exc, exceptions.MethodNotAllowed):
+        headers = {"Allow": "GET, HEAD"}
+    return render(
+        {"status": "fail", "message": extract_all_error_messages(detail)},
+        exc.status_code,
+        headers,
+    )
+
+
+def async_api_view(view):
+    """
+    Turn a coroutine returning JSON-serializable data into a read-only view.
+    ``APIException`` and ``Http404`` become the same responses DRF returns.
+    """
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            if request.method not in ("GET", "HEAD"):
+                raise exceptions.MethodNotAllowed(request.method)
+            return render(await view(request, *args, **kwargs))
+        except Http404:
+            return render_exception(exceptions.NotFound())
+        except exceptions.APIException as exc:
+            return render_exception(exc)
+
+    return wrapper
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+
+def get_token_user_id(request):
+    """
+    Return the user id claimed by the request's bearer token, or None when
+    there is no token. Only the signature and expiry are checked, nothing is
+    read from the database. Raises ``AuthenticationFailed`` for a malformed
+    or invalid token.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is None:
+        return None
+    raw_token = authentication.get_raw_token(header)
+    if raw_token is None:
+        return None
+    token = authentication.get_validated_token(raw_token)
+    return token.get(jwt_settings.USER_ID_CLAIM)
+
+
+async def aauthenticate(request):
+    """Async counterpart of ``JWTAuthentication.authenticate``, returns a user or None."""
+    user_id = get_token_user_id(request)
+    if user_id is None:
+        return None
+    try:
+        user = await User.objects.aget(**{jwt_settings.USER_ID_FIELD: user_id})
+    except User.DoesNotExist:
+        raise AuthenticationFailed("User not found", code="user_not_found")
+    if not user.is_active:
+        raise AuthenticationFailed("User is inactive", code="user_inactive")
+    return user
@@ -0,0 +1,37 @@
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """
+    SQLite backend accepting the ``init_command`` and ``transaction_mode``
+    options Django 5.1 added to the built-in backend.
+
+    ``init_command`` holds ``;`` separated statements, usually pragmas, run on
+    every new connection. ``transaction_mode`` set to ``"IMMEDIATE"`` takes the
+    write lock when a transaction starts, so concurrent writers wait for the
+    busy timeout instead of failing with "database is locked" when a read
+    transaction is upgraded to a write.
+    """
+
+    def get_connection_params(self):
+        kwargs = super().get_connection_params()
+        # On Django 5.1+ the parent already consumed both options.
+        self._init_statements = [
+            statement.strip()
+            for statement in kwargs.pop("init_command", "").split(";")
+            if statement.strip()
+        ]
+        self._transaction_mode = kwargs.pop("transaction_mode", None)
+        return kwargs
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        for statement in self._init_statements:
+            conn.execute(statement)
+        return conn
+
+    def _start_transaction_under_autocommit(self):
+        if self._transaction_mode:
+            self.cursor().execute(f"BEGIN {self._transaction_mode}")
+        else:
+            super()._start_transaction_under_autocommit()
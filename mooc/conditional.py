@@ -0,0 +1,57 @@
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.crypto import md5
+from django.utils.http import http_date, quote_etag
+
+
+def get_validators(versions):
+    """
+    Return the ``(etag, last_modified)`` of the representation of rows given
+    as ``(pk, updated_at)`` pairs, derived from these stamps rather than the
+    rendered body. ``last_modified`` is a Unix timestamp, or None when there
+    are no rows.
+    """
+    digest = md5(usedforsecurity=False)
+    last_modified = None
+    for pk, updated_at in versions:
+        digest.update(f"{pk}:{updated_at.timestamp()};".encode())
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+    if last_modified is not None:
+        last_modified = int(last_modified.timestamp())
+    return quote_etag(digest.hexdigest()), last_modified
+
+
+class ConditionalGetMixin:
+    """
+    Viewset mixin for conditional GETs. A view passes the instances it is
+    about to serialize to ``not_modified``, or validators it already has to
+    ``check_validators``, see ``get_validators``. Both return a 304 when the client's
+    ``If-None-Match``/``If-Modified-Since`` is still current, so the
+    serializer never runs. ``ETag``, ``Last-Modified`` and ``Cache-Control``
+    are added to both 200 and 304 responses.
+    """
+
+    cache_control = {"no_cache": True}
+    etag = None
+    last_modified = None
+
+    def not_modified(self, request, instances):
+        return self.check_validators(
+            request,
+            *get_validators((instance.pk, instance.updated_at) for instance in instances),
+        )
+
+    def check_validators(self, request, etag, last_modified):
+        self.etag, self.last_modified = etag, last_modified
+        return get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.etag is not None and response.status_code in (200, 304):
+            response.headers["ETag"] = self.etag
+            if self.last_modified is not None:
+                response.headers["Last-Modified"] = http_date(self.last_modified)
+            patch_cache_control(response, **self.cache_control)
+        return response
@@ -0,0 +1,41 @@
+class ValuesSerializer:
+    """
+    Read-only counterpart of a ``ModelSerializer`` with ``many=True`` for hot
+    list endpoints. Representations are built straight from
+    ``values_list()`` rows, without model instances or per-row DRF field
+    lookups, and match the model serializer's output key for key.
+
+    ``fields`` maps each output key, in output order, to the lookup it is
+    read from. Values of the keys in ``converters`` go through that function
+    unless they are None, everything else is returned as stored.
+    """
+
+    fields = {}
+    converters = {}
+
+    def __init__(self, queryset):
+        self.queryset = queryset
+
+    @classmethod
+    def lookups(cls):
+        return tuple(cls.fields.values())
+
+    @classmethod
+    def to_representation(cls, row):
+        """Representation of a row holding the values of ``lookups()``."""
+        data = dict(zip(cls.fields, row))
+        for key, convert in cls.converters.items():
+            value = data[key]
+            if value is not None:
+                data[key] = convert(value)
+        return data
+
+    def rows(self):
+        return self.queryset.values_list(*self.lookups())
+
+    @property
+    def data(self):
+        return [self.to_representation(row) for row in self.rows()]
+
+    async def adata(self):
+        return [self.to_representation(row) async for row in self.rows()]
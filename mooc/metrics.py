@@ -0,0 +1,181 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+
+Values live in the memory of the worker process that recorded them, so with
+several workers every process exposes its own numbers.
+"""
+
+import threading
+from bisect import bisect_left
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(
+        '{}="{}"'.format(
+            key,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for key, value in labels
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(
+                    f"{self.name}{_format_labels(labels)} {_format_value(value)}"
+                )
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """
+    Cumulative bucket histogram per label set. Quantiles are estimated from
+    the buckets the same way Prometheus' ``histogram_quantile`` does.
+    """
+
+    def __init__(self, name, documentation, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets) + (float("inf"),)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            counts, total = self._values.get(key, ([0] * len(self.buckets), 0.0))
+            counts[bisect_left(self.buckets, value)] += 1
+            self._values[key] = (counts, total + value)
+
+    def quantile(self, fraction, **labels):
+        with self._lock:
+            counts, _ = self._values.get(
+                tuple(sorted(labels.items())), ([0] * len(self.buckets), 0.0)
+            )
+            counts = list(counts)
+        return self._quantile(fraction, counts)
+
+    def _quantile(self, fraction, counts):
+        observations = sum(counts)
+        if not observations:
+            return 0.0
+        rank = fraction * observations
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if cumulative + count >= rank and count:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+    def render(self):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        quantile_lines = [
+            f"# HELP {self.name}_quantile Estimated quantiles of {self.name}.",
+            f"# TYPE {self.name}_quantile gauge",
+        ]
+        with self._lock:
+            values = sorted(
+                (key, list(counts), total)
+                for key, (counts, total) in self._values.items()
+            )
+        for labels, counts, total in values:
+            cumulative = 0
+            for bucket, count in zip(self.buckets, counts):
+                cumulative += count
+                bucket_labels = labels + (("le", _format_value(float(bucket))),)
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                )
+            lines.append(
+                f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}"
+            )
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+            for fraction in QUANTILES:
+                quantile_labels = labels + (("quantile", str(fraction)),)
+                quantile_lines.append(
+                    f"{self.name}_quantile{_format_labels(quantile_labels)} "
+                    f"{_format_value(float(self._quantile(fraction, counts)))}"
+                )
+        return lines + quantile_lines
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+REGISTRY = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+request_duration = register(
+    Histogram("mooc_request_duration_seconds", "Total wall time per request.")
+)
+request_sql_duration = register(
+    Histogram("mooc_request_sql_duration_seconds", "Time spent in SQL per request.")
+)
+request_sql_queries = register(
+    Histogram(
+        "mooc_request_sql_queries", "Number of SQL queries per request.", COUNT_BUCKETS
+    )
+)
+request_serializer_duration = register(
+    Histogram(
+        "mooc_request_serializer_duration_seconds",
+        "Time spent building serializer data per request.",
+    )
+)
+throttled_requests = register(
+    Counter("mooc_throttled_requests_total", "Requests rejected by a throttle.")
+)
@@ -0,0 +1,181 @@
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+
+from mooc import metrics
+from mooc.authentication import get_token_user_id
+from mooc.fast_serializers import ValuesSerializer
+from mooc.routers import REPLICA_DB_ALIAS, read_database
+
+_current_profile = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_time += time.perf_counter() - start
+            self.sql_queries += 1
+
+
+def _timed(function):
+    def timed(*args, **kwargs):
+        profile = _current_profile.get()
+        # Nested serializers build their data inside the outer one, only the
+        # outermost call is timed so nothing is counted twice.
+        if profile is None or profile.serializer_depth:
+            return function(*args, **kwargs)
+        profile.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            profile.serializer_time += time.perf_counter() - start
+            profile.serializer_depth -= 1
+
+    timed.profiled = True
+    return timed
+
+
+def _profile_serializers():
+    for serializer_class in (
+        serializers.Serializer,
+        serializers.ListSerializer,
+        ValuesSerializer,
+    ):
+        if not getattr(serializer_class.data.fget, "profiled", False):
+            serializer_class.data = property(_timed(serializer_class.data.fget))
+    # Hot views build representations of ``values_list()`` rows one by one
+    # without going through ``data``.
+    to_representation = ValuesSerializer.__dict__["to_representation"].__func__
+    if not getattr(to_representation, "profiled", False):
+        ValuesSerializer.to_representation = classmethod(_timed(to_representation))
+
+
+class RequestProfilingMiddleware:
+    """
+    Record SQL query count, SQL time, serializer time and total wall time
+    for every request. The numbers are returned in a ``Server-Timing`` header
+    and aggregated per endpoint in ``mooc.metrics``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        _profile_serializers()
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = _current_profile.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(profile.record_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current_profile.reset(token)
+        total_time = time.perf_counter() - start
+
+        match = request.resolver_match
+        endpoint = match.view_name if match else "unmatched"
+        metrics.request_duration.observe(total_time, endpoint=endpoint)
+        metrics.request_sql_duration.observe(profile.sql_time, endpoint=endpoint)
+        metrics.request_sql_queries.observe(profile.sql_queries, endpoint=endpoint)
+        metrics.request_serializer_duration.observe(
+            profile.serializer_time, endpoint=endpoint
+        )
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'sql;dur={profile.sql_time * 1000:.2f};desc="{profile.sql_queries} queries"',
+                f"serializer;dur={profile.serializer_time * 1000:.2f}",
+                f"total;dur={total_time * 1000:.2f}",
+            ]
+        )
+        return response
+
+
+def _pin_key(request):
+    try:
+        user_id = get_token_user_id(request)
+    except AuthenticationFailed:
+        return None
+    return f"replica-pin:{user_id}" if user_id is not None else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Route the reads of safe-method requests to the replica and everything
+    else to the primary.
+
+    After an authenticated user's successful write their requests stick to
+    the primary for ``REPLICA_PIN_SECONDS`` so they read their own writes
+    while the replica catches up. Pins are kept in the default cache, which
+    has to be shared between workers for them to apply across processes.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        pin_key = _pin_key(request)
+        safe = request.method in SAFE_METHODS
+        pinned = safe and pin_key is not None and cache.get(pin_key)
+
+        token = read_database.set(self.read_alias(safe, pinned))
+        try:
+            response = self.get_response(request)
+        finally:
+            read_database.reset(token)
+
+        if self.should_pin(safe, pin_key, response):
+            cache.set(pin_key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    async def __acall__(self, request):
+        pin_key = _pin_key(request)
+        safe = request.method in SAFE_METHODS
+        pinned = safe and pin_key is not None and await cache.aget(pin_key)
+
+        token = read_database.set(self.read_alias(safe, pinned))
+        try:
+            response = await self.get_response(request)
+        finally:
+            read_database.reset(token)
+
+        if self.should_pin(safe, pin_key, response):
+            await cache.aset(pin_key, True, settings.REPLICA_PIN_SECONDS)
+        return response
+
+    @staticmethod
+    def read_alias(safe, pinned):
+        return REPLICA_DB_ALIAS if safe and not pinned else DEFAULT_DB_ALIAS
+
+    @staticmethod
+    def should_pin(safe, pin_key, response):
+        return not safe and pin_key is not None and response.status_code < 400
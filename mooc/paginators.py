@@ -0,0 +1,43 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max
+from django.utils.functional import cached_property
+
+
+def estimate_count(model, using):
+    """
+    Cheap row count estimate for ``model``'s table: the planner statistics on
+    PostgreSQL, elsewhere the highest primary key, which overestimates by
+    the number of deleted rows. Returns None when there is no estimate.
+    """
+    connection = connections[using]
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [connection.ops.quote_name(model._meta.db_table)],
+            )
+            row = cursor.fetchone()
+        # -1 until the table has been vacuumed or analyzed.
+        return row[0] if row and row[0] >= 0 else None
+    return model._base_manager.using(using).aggregate(Max("pk"))["pk__max"]
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for admin changelists of huge tables, where ``COUNT(*)`` is a
+    full scan. Unfiltered lists above ``threshold`` rows use
+    ``estimate_count``, filtered lists and small tables are counted exactly.
+    Use it with ``show_full_result_count = False``.
+    """
+
+    threshold = 10000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            estimate = estimate_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.threshold:
+                return estimate
+        return super().count
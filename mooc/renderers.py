@@ -0,0 +1,77 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+Output is byte-for-byte what DRF's ``JSONRenderer`` produces for the data
+our serializers return: values orjson has no native type for (``Decimal``,
+lazy strings, querysets, ...) and datetimes go through DRF's
+``JSONEncoder``, and U+2028/U+2029 are escaped the same way. Indented
+output, ``ensure_ascii`` and anything orjson refuses, such as integers
+wider than 64 bits, fall back to the stdlib implementation. Two
+differences remain, neither affects our payloads: floats in exponent
+notation are written as ``1e-7`` rather than ``1e-07``, and NaN/Infinity
+become ``null`` instead of raising. Without orjson both classes behave
+exactly like their DRF parents.
+"""
+
+import io
+
+from django.conf import settings
+from rest_framework import parsers, renderers
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    _default = JSONEncoder().default
+
+# orjson reads integers wider than 64 bits as floats, losing precision.
+# Bodies with a run of 19 digits go to the stdlib parser, found by mapping
+# every digit to "0" and searching for the run, much faster than a regex.
+_DIGITS = bytes(ord("0") if byte in b"0123456789" else ord(" ") for byte in range(256))
+_LONG_NUMBER = b"0" * 19
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as the parent class, see its comment.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class JSONParser(parsers.JSONParser):
+    renderer_class = JSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        body = stream.read()
+        if _LONG_NUMBER not in body.translate(_DIGITS):
+            try:
+                if encoding.lower().replace("-", "") == "utf8":
+                    return orjson.loads(body)
+                return orjson.loads(body.decode(encoding))
+            except ValueError:
+                # Let the stdlib parser decide, and word the error, as before.
+                pass
+        return super().parse(io.BytesIO(body), media_type, parser_context)
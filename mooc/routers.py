@@ -0,0 +1,37 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_DB_ALIAS = "replica"
+
+# Alias reads go to for the current request, set by ReplicaRoutingMiddleware.
+read_database = ContextVar("read_database", default=None)
+
+
+class PrimaryReplicaRouter:
+    """
+    Send reads to the alias chosen for the current request and every write
+    to the primary. Outside a request, in management commands and tests,
+    everything uses the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_database.get() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data.
+        return True
+
+
+@contextmanager
+def read_from_primary():
+    """Read from the primary in the enclosed block, whatever the request."""
+    token = read_database.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        read_database.reset(token)
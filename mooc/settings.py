@@ -12,6 +12,8 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 
 from pathlib import Path
 from pathlib import Path
+import django
+from django.core.exceptions import ImproperlyConfigured
 from decouple import config
 from datetime import timedelta
 
@@ -53,6 +55,7 @@ INSTALLED_APPS = [
     "userprofiles",
     "courses",
     "corsheaders",
+    "benchmarks",
 ]
 
 MIDDLEWARE = [
@@ -67,6 +70,12 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
 ]
 
+# Opt-in per-request SQL, serializer and wall time profiling, exposed as
+# Server-Timing headers and at /api/metrics/.
+PROFILING_ENABLED = config("PROFILING_ENABLED", default=False, cast=bool)
+if PROFILING_ENABLED:
+    MIDDLEWARE.insert(0, "mooc.middleware.RequestProfilingMiddleware")
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 
@@ -94,10 +103,100 @@ WSGI_APPLICATION = "mooc.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
+DB_ENGINE = config("DB_ENGINE", default="sqlite3")
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("DB_NAME", default="mooc"),
+            "USER": config("DB_USER", default="postgres"),
+            "PASSWORD": config("DB_PASSWORD", default=""),
+            "HOST": config("DB_HOST", default="localhost"),
+            "PORT": config("DB_PORT", default="5432"),
+            "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+            "CONN_HEALTH_CHECKS": config(
+                "DB_CONN_HEALTH_CHECKS", default=True, cast=bool
+            ),
+            # Transaction pooling in pgbouncer does not keep server-side
+            # cursors alive between statements.
+            "DISABLE_SERVER_SIDE_CURSORS": config(
+                "DB_PGBOUNCER", default=False, cast=bool
+            ),
+            "OPTIONS": {
+                "connect_timeout": config("DB_CONNECT_TIMEOUT", default=5, cast=int),
+            },
+        }
+    }
+    if config("DB_POOL", default=False, cast=bool):
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                "DB_POOL needs Django 5.1 or newer, use pgbouncer with "
+                "DB_PGBOUNCER=True instead."
+            )
+        # psycopg's pool replaces persistent connections.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", default=2, cast=int),
+            "max_size": config("DB_POOL_MAX_SIZE", default=10, cast=int),
+        }
+elif DB_ENGINE == "sqlite3":
+    DATABASES = {
+        "default": {
+            "ENGINE": "mooc.backends.sqlite3",
+            "NAME": config("DB_NAME", default=str(BASE_DIR / "db.sqlite3")),
+            "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=0, cast=int),
+            "OPTIONS": {
+                # Seconds a writer waits for the lock before "database is locked".
+                "timeout": config("DB_TIMEOUT", default=20, cast=int),
+                "transaction_mode": "IMMEDIATE",
+                "init_command": ";".join(
+                    [
+                        "PRAGMA journal_mode=WAL",
+                        "PRAGMA synchronous=NORMAL",
+                        "PRAGMA mmap_size={}".format(
+                            config("DB_MMAP_SIZE", default=268435456, cast=int)
+                        ),
+                        "PRAGMA cache_size=-20000",
+                        "PRAGMA temp_store=MEMORY",
+                    ]
+                ),
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured(
+        f"Unsupported DB_ENGINE {DB_ENGINE!r}, use 'sqlite3' or 'postgresql'."
+    )
+
+# A read replica of the primary: its host for Postgres, its file for SQLite.
+DB_REPLICA = config("DB_REPLICA", default="")
+if DB_REPLICA:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    if DB_ENGINE == "postgresql":
+        DATABASES["replica"]["HOST"] = DB_REPLICA
+    else:
+        DATABASES["replica"]["NAME"] = DB_REPLICA
+    DATABASE_ROUTERS = ["mooc.routers.PrimaryReplicaRouter"]
+    MIDDLEWARE.insert(0, "mooc.middleware.ReplicaRoutingMiddleware")
+
+# Seconds a user's requests keep reading from the primary after a write.
+REPLICA_PIN_SECONDS = config("DB_REPLICA_PIN_SECONDS", default=5, cast=int)
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "BACKEND": config(
+            "CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": config("CACHE_LOCATION", default=""),
     }
 }
 
@@ -151,4 +250,30 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
     ],
     "EXCEPTION_HANDLER": "mooc.utils.custom_exception_handler",
+    # orjson backed when installed, same output as DRF's JSON classes.
+    "DEFAULT_RENDERER_CLASSES": [
+        "mooc.renderers.JSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "mooc.renderers.JSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Token buckets of mooc.throttling, "<requests>/<period>". An empty rate
+    # turns the throttle off.
+    "DEFAULT_THROTTLE_RATES": {
+        "login_ip": config("THROTTLE_LOGIN_IP_RATE", default="30/min"),
+        "login_email": config("THROTTLE_LOGIN_EMAIL_RATE", default="10/min"),
+        "registration_ip": config("THROTTLE_REGISTRATION_IP_RATE", default="20/hour"),
+        "certificate_verification_ip": config(
+            "THROTTLE_CERTIFICATE_VERIFICATION_IP_RATE", default="60/min"
+        ),
+    },
+    # Proxies in front of the app, for client IPs from X-Forwarded-For.
+    "NUM_PROXIES": config("NUM_PROXIES", default=None, cast=lambda v: v and int(v)),
 }
+
+# Cache shared by all worker processes to count throttled requests in, e.g.
+# "default" with a Redis or Memcached backend. Empty keeps buckets per process.
+THROTTLE_CACHE = config("THROTTLE_CACHE", default="")
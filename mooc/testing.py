@@ -0,0 +1,78 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+from courses.models import Course
+from userprofiles.models import Degree, Education, Institution, WorkExperience
+
+
+class QueryBudgetMixin:
+    """
+    Test case mixin asserting that a block stays within a fixed number of
+    SQL queries. Unlike ``assertNumQueries`` the budget is an upper bound,
+    and the failure message lists every query that ran.
+    """
+
+    @contextmanager
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context.captured_queries)
+        if executed > budget:
+            queries = "\n".join(
+                f"{index}. {query['sql']}"
+                for index, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{executed} queries executed, budget is {budget}\nQueries:\n{queries}"
+            )
+
+
+def seed_work_experience(user_profile, count):
+    return WorkExperience.objects.bulk_create(
+        WorkExperience(
+            user_profile=user_profile,
+            company=f"Company {index}",
+            position="Software Engineer",
+            start_date="2020-01",
+            end_date="2021-01",
+        )
+        for index in range(count)
+    )
+
+
+def seed_education(user_profile, count):
+    institutions = list(Institution.objects.all())
+    degrees = list(Degree.objects.all())
+    return Education.objects.bulk_create(
+        Education(
+            user_profile=user_profile,
+            institution=institutions[index % len(institutions)],
+            degree=degrees[index % len(degrees)],
+            field_of_study="Computer Science",
+            start_date="2015-01",
+            end_date="2019-01",
+        )
+        for index in range(count)
+    )
+
+
+def seed_institutions(count):
+    return Institution.objects.bulk_create(
+        Institution(label=f"Seeded Institution {index}") for index in range(count)
+    )
+
+
+def seed_courses(course_creator, count, institutions):
+    return Course.objects.bulk_create(
+        Course(
+            course_creator=course_creator,
+            title=f"Course {index}",
+            offered_by=institutions[index % len(institutions)],
+            duration="3 months",
+            description="Seeded course",
+            price=100,
+        )
+        for index in range(count)
+    )
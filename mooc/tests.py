@@ -0,0 +1,292 @@
+import io
+import re
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import gettext_lazy
+from rest_framework import parsers, renderers, status
+from rest_framework.exceptions import (
+    NotAuthenticated,
+    ParseError,
+    Throttled,
+    ValidationError,
+)
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from mooc import metrics
+from mooc.paginators import EstimatedCountPaginator
+from mooc.renderers import JSONParser, JSONRenderer
+from mooc.middleware import ReplicaRoutingMiddleware
+from mooc.routers import PrimaryReplicaRouter, read_from_primary
+from mooc.testing import seed_courses, seed_institutions
+from mooc.utils import custom_exception_handler, extract_all_error_messages
+from userprofiles.models import Interest
+
+
+class HistogramTest(SimpleTestCase):
+    def test_quantiles_are_interpolated_within_buckets(self):
+        histogram = metrics.Histogram("test_seconds", "Test.", buckets=(1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3):
+            histogram.observe(value, endpoint="test")
+
+        self.assertEqual(histogram.quantile(0.5, endpoint="test"), 1.5)
+        self.assertAlmostEqual(histogram.quantile(0.99, endpoint="test"), 3.92)
+        self.assertIn(
+            'test_seconds_bucket{endpoint="test",le="2.0"} 3', histogram.render()
+        )
+
+
+@override_settings(
+    MIDDLEWARE=["mooc.middleware.RequestProfilingMiddleware"] + settings.MIDDLEWARE
+)
+class RequestProfilingMiddlewareTest(APITestCase):
+    def setUp(self):
+        for metric in metrics.REGISTRY:
+            metric.clear()
+
+    def test_server_timing_header(self):
+        response = self.client.get(reverse("course-list"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertRegex(
+            response["Server-Timing"],
+            r'^sql;dur=[\d.]+;desc="1 queries", serializer;dur=[\d.]+, total;dur=[\d.]+$',
+        )
+
+    def test_server_timing_covers_row_serializers(self):
+        creator = User.objects.create_user(username="teacher@abc.com")
+        seed_courses(creator, 50, seed_institutions(2))
+        # The list view builds each course from its row without ``data``.
+        response = self.client.get(reverse("course-list"))
+        self.assertEqual(len(response.data), 50)
+        serializer_time = re.search(
+            r"serializer;dur=([\d.]+)", response["Server-Timing"]
+        ).group(1)
+        self.assertGreater(float(serializer_time), 0)
+
+    def test_metrics_require_admin(self):
+        user = User.objects.create_user(username="user@abc.com")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_per_endpoint(self):
+        self.client.get(reverse("course-list"))
+        admin = User.objects.create_superuser(username="admin@abc.com")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(admin)}"
+        )
+        response = self.client.get(reverse("metrics"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = response.content.decode()
+        self.assertIn('mooc_request_sql_queries_count{endpoint="course-list"} 1', body)
+        self.assertIn(
+            'mooc_request_duration_seconds_quantile{endpoint="course-list",quantile="0.95"}',
+            body,
+        )
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite backend only.")
+class SQLiteBackendTest(TransactionTestCase):
+    def test_pragmas_are_applied_on_connect(self):
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute("PRAGMA temp_store")
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_transactions_take_the_write_lock_immediately(self):
+        with CaptureQueriesContext(connection) as context:
+            with transaction.atomic():
+                User.objects.exists()
+        self.assertEqual(context.captured_queries[0]["sql"], "BEGIN IMMEDIATE")
+
+
+class ReplicaRoutingMiddlewareTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.user = User.objects.create_user(username="user@abc.com")
+        self.headers = {
+            "HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(self.user)}"
+        }
+
+    def route(self, method, status_code=200, **extra):
+        routed = []
+
+        def get_response(request):
+            routed.append(PrimaryReplicaRouter().db_for_read(User))
+            return HttpResponse(status=status_code)
+
+        request = self.factory.generic(method, "/", **extra)
+        ReplicaRoutingMiddleware(get_response)(request)
+        return routed[0]
+
+    def test_safe_methods_read_from_replica(self):
+        self.assertEqual(self.route("GET"), "replica")
+        self.assertEqual(self.route("GET", **self.headers), "replica")
+        self.assertEqual(self.route("POST", **self.headers), "default")
+
+    def test_reads_stick_to_primary_after_own_write(self):
+        self.route("PUT", **self.headers)
+        self.assertEqual(self.route("GET", **self.headers), "default")
+
+        other = User.objects.create_user(username="other@abc.com")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(other)}"}
+        self.assertEqual(self.route("GET", **headers), "replica")
+
+    def test_failed_write_does_not_stick(self):
+        self.route("PUT", status_code=400, **self.headers)
+        self.assertEqual(self.route("GET", **self.headers), "replica")
+
+    def test_invalid_token_is_anonymous(self):
+        self.assertEqual(
+            self.route("GET", HTTP_AUTHORIZATION="Bearer invalid"), "replica"
+        )
+
+    def test_outside_requests_reads_use_primary(self):
+        self.assertEqual(PrimaryReplicaRouter().db_for_read(User), "default")
+
+    def test_read_from_primary(self):
+        def get_response(request):
+            with read_from_primary():
+                routed.append(PrimaryReplicaRouter().db_for_read(User))
+            routed.append(PrimaryReplicaRouter().db_for_read(User))
+            return HttpResponse()
+
+        routed = []
+        ReplicaRoutingMiddleware(get_response)(self.factory.get("/"))
+        self.assertEqual(routed, ["default", "replica"])
+
+
+class JSONRendererTest(SimpleTestCase):
+    payload = {
+        "status": "success",
+        "data": [
+            OrderedDict(
+                title="Caf\u00e9 \u2028 course",
+                price=Decimal("1234.50"),
+                created=datetime(2024, 5, 5, 10, 20, 30, 123456, tzinfo=timezone.utc),
+                starts=date(2024, 6, 1),
+                label=gettext_lazy("Not found."),
+                rank=0.25,
+                tags=("python", "django"),
+            )
+        ],
+        1: None,
+    }
+
+    def test_output_matches_drf(self):
+        self.assertEqual(
+            JSONRenderer().render(self.payload),
+            renderers.JSONRenderer().render(self.payload),
+        )
+
+    def test_indented_output_matches_drf(self):
+        context = {"indent": 4}
+        self.assertEqual(
+            JSONRenderer().render(self.payload, renderer_context=context),
+            renderers.JSONRenderer().render(self.payload, renderer_context=context),
+        )
+
+    def test_wide_integers(self):
+        data = {"id": 2**70}
+        self.assertEqual(JSONRenderer().render(data), b'{"id":1180591620717411303424}')
+        body = io.BytesIO(b'{"id": 1180591620717411303424}')
+        self.assertEqual(JSONParser().parse(body), data)
+
+    def test_parse_errors_match_drf(self):
+        for body in (b"{", b'{"a": NaN}', b"\xff"):
+            with self.assertRaises(ParseError) as expected:
+                parsers.JSONParser().parse(io.BytesIO(body))
+            with self.assertRaisesMessage(ParseError, str(expected.exception)):
+                JSONParser().parse(io.BytesIO(body))
+
+
+class EstimatedCountPaginatorTest(TestCase):
+    class Paginator(EstimatedCountPaginator):
+        threshold = 1
+
+    def test_unfiltered_count_is_estimated(self):
+        interests = Interest.objects.order_by("pk")
+        interests.filter(pk=interests.first().pk).delete()
+        estimate = interests.last().pk
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.Paginator(interests, 10).count, estimate)
+        self.assertEqual(EstimatedCountPaginator(interests, 10).count, interests.count())
+
+    def test_filtered_count_is_exact(self):
+        interests = Interest.objects.filter(label__startswith="A").order_by("pk")
+        self.assertEqual(self.Paginator(interests, 10).count, interests.count())
+
+
+class ExceptionHandlerTest(SimpleTestCase):
+    def test_nested_messages_in_order(self):
+        errors = {
+            "user": {"password": ["This field is required."]},
+            "userprofile": {
+                "username": ["Username already exists"],
+                "country": {"label": ["This field may not be blank."]},
+            },
+            "non_field_errors": "Invalid data",
+        }
+        self.assertEqual(
+            extract_all_error_messages(errors),
+            [
+                "password field is required.",
+                "Username already exists",
+                "label field may not be blank.",
+                "Invalid data",
+            ],
+        )
+
+    def test_many_serializer_errors(self):
+        errors = {"update": [{"id": ["This field is required."]}, {}, {"x": "Bad"}]}
+        self.assertEqual(
+            extract_all_error_messages(errors), ["id field is required.", "Bad"]
+        )
+
+    def test_deep_nesting(self):
+        errors = {"email": ["This field is required."]}
+        for _ in range(5000):
+            errors = {"nested": errors}
+        self.assertEqual(extract_all_error_messages(errors), ["email field is required."])
+
+    def test_handler_formats_validation_errors(self):
+        exc = ValidationError({"email": ["This field is required."]})
+        response = custom_exception_handler(exc, {})
+        self.assertEqual(
+            response.data, {"status": "fail", "message": ["email field is required."]}
+        )
+
+    def test_handler_detail_fast_path(self):
+        response = custom_exception_handler(NotAuthenticated(), {})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            response.data,
+            {"status": "fail", "message": [NotAuthenticated.default_detail]},
+        )
+
+        response = custom_exception_handler(Throttled(wait=5), {})
+        self.assertEqual(response["Retry-After"], "5")
+        self.assertEqual(len(response.data["message"]), 1)
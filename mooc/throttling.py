@@ -0,0 +1,147 @@
+"""
+Token bucket throttles for the unauthenticated endpoints that are expensive
+to abuse, login and registration, where every request hashes a password.
+
+A bucket holds up to ``capacity`` tokens and refills continuously at
+``capacity`` per period of the scope's rate in ``DEFAULT_THROTTLE_RATES``,
+e.g. ``"10/min"``. Each request takes a token, so clients get a burst of
+``capacity`` requests and then a steady rate instead of a fixed window that
+resets all at once.
+
+Buckets are first kept in process memory, which rejects a client that
+exhausted its tokens without any cache round trip. With ``THROTTLE_CACHE``
+naming a shared cache, requests the local bucket lets through are also
+counted in a bucket in that cache, so the limit holds across worker
+processes. The shared bucket is read and written without a lock, concurrent
+requests can occasionally both take the last token.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from mooc import metrics
+
+LOCAL_BUCKETS_SIZE = 10000
+PERIODS = {"s": 1, "m": 60, "h": 60 * 60, "d": 24 * 60 * 60}
+
+_local = OrderedDict()
+_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """Turn ``"<requests>/<s|sec|m|min|h|hour|d|day>"`` into (requests, seconds)."""
+    requests, period = rate.split("/")
+    return int(requests), PERIODS[period[0]]
+
+
+def _refill(bucket, capacity, refill_rate, now):
+    if bucket is None:
+        return float(capacity)
+    tokens, updated = bucket
+    return min(capacity, tokens + (now - updated) * refill_rate)
+
+
+def _take(tokens, refill_rate):
+    """Remaining tokens and the wait in seconds, zero when a token was taken."""
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / refill_rate
+
+
+def consume(key, capacity, period):
+    """
+    Take a token from the bucket ``key``. Returns 0 when the request is
+    allowed, otherwise the seconds until a token is available.
+    """
+    refill_rate = capacity / period
+    now = time.time()
+    with _lock:
+        tokens, wait = _take(
+            _refill(_local.get(key), capacity, refill_rate, now), refill_rate
+        )
+        _local[key] = (tokens, now)
+        _local.move_to_end(key)
+        while len(_local) > LOCAL_BUCKETS_SIZE:
+            _local.popitem(last=False)
+    if wait or not settings.THROTTLE_CACHE:
+        return wait
+
+    cache = caches[settings.THROTTLE_CACHE]
+    tokens, wait = _take(
+        _refill(cache.get(key), capacity, refill_rate, now), refill_rate
+    )
+    # Expire once the bucket would be full again, it is then the same as none.
+    cache.set(key, (tokens, now), int(period) + 1)
+    if wait:
+        with _lock:
+            _local[key] = (tokens, now)
+    return wait
+
+
+def clear():
+    with _lock:
+        _local.clear()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle the requests sharing ``get_ident(request)`` with the rate of
+    ``scope``. A scope without a rate is not throttled.
+    """
+
+    scope = None
+
+    def allow_request(self, request, view):
+        self._wait = 0.0
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+        if not rate:
+            return True
+        ident = self.get_ident(request)
+        if ident is None:
+            return True
+        capacity, period = parse_rate(rate)
+        self._wait = consume(f"throttle:{self.scope}:{ident}", capacity, period)
+        if self._wait:
+            metrics.throttled_requests.inc(scope=self.scope)
+            return False
+        return True
+
+    def wait(self):
+        return self._wait
+
+
+class EmailThrottle(TokenBucketThrottle):
+    """
+    Throttle by the ``email`` in the request body, so attempts on one account
+    are limited however many addresses they come from.
+    """
+
+    def get_ident(self, request):
+        data = request.data
+        email = data.get("email") if hasattr(data, "get") else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        return hashlib.md5(email.strip().lower().encode()).hexdigest()
+
+
+class LoginIPThrottle(TokenBucketThrottle):
+    scope = "login_ip"
+
+
+class LoginEmailThrottle(EmailThrottle):
+    scope = "login_email"
+
+
+class RegistrationIPThrottle(TokenBucketThrottle):
+    scope = "registration_ip"
+
+
+class CertificateVerificationIPThrottle(TokenBucketThrottle):
+    scope = "certificate_verification_ip"
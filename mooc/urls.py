@@ -18,9 +18,13 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path
 from django.urls.conf import include
+from mooc.views import MetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/user/", include("userprofiles.urls")),
     path("api/course/", include("courses.urls")),
+    path("api/metrics/", MetricsView.as_view(), name="metrics"),
+    path("api/async/user/", include("userprofiles.async_urls")),
+    path("api/async/course/", include("courses.async_urls")),
 ]
@@ -30,24 +30,39 @@ def extract_all_error_messages(error_messages):
 
     """
     error_list = []
-
-    def helper(error_messages):
-        for key, value in error_messages.items():
+    # Walk the nested dicts with an explicit stack of item iterators rather
+    # than recursion, keeping the depth-first order without a frame per
+    # level or a recursion limit on deeply nested payloads.
+    stack = [iter(error_messages.items())]
+    while stack:
+        for key, value in stack[-1]:
             if isinstance(value, dict):
-                helper(value)
+                stack.append(iter(value.items()))
+                break
+
+            elif isinstance(value, list) and any(
+                isinstance(message, dict) for message in value
+            ):
+                # Errors of a many=True serializer, one dict per item.
+                stack.append(
+                    (key, [message] if isinstance(message, str) else message)
+                    for message in value
+                )
+                break
 
             elif isinstance(value, list):
                 for message in value:
                     if isinstance(message, str):
                         if message.startswith("This field"):
-                            message = message.replace("This", key)
+                            message = message.replace("This", str(key))
 
                         error_list.append(message)
 
             elif isinstance(value, str):
                 error_list.append(value)
+        else:
+            stack.pop()
 
-    helper(error_messages)
     return error_list
 
 
@@ -55,10 +70,17 @@ def custom_exception_handler(exc, context):
     response = exception_handler(exc, context)
 
     if response is not None:
-        formatted_errors = {
-            "status": "fail",
-            "message": extract_all_error_messages(response.data),
-        }
-        response.data = formatted_errors
+        data = response.data
+        # Authentication failures, permission errors, throttling and 404s
+        # carry a single message, there is nothing to walk or rename.
+        if (
+            isinstance(data, dict)
+            and len(data) == 1
+            and isinstance(data.get("detail"), str)
+        ):
+            messages = [data["detail"]]
+        else:
+            messages = extract_all_error_messages(data)
+        response.data = {"status": "fail", "message": messages}
 
     return response
\ No newline at end of file
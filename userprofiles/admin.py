@@ -1,4 +1,5 @@
 from django.contrib import admin
+from mooc.admin import LargeTableAdmin
 from .models import (
     Country,
     Interest,
@@ -12,25 +13,36 @@ from .models import (
 
 class CountryAdmin(admin.ModelAdmin):
     list_display = ("label",)
+    search_fields = ("label",)
 
 
 class InterestAdmin(admin.ModelAdmin):
     list_display = ("label",)
+    search_fields = ("label",)
 
 
-class UserProfileAdmin(admin.ModelAdmin):
+class UserProfileAdmin(LargeTableAdmin):
     list_display = ("user", "country", "birth_date", "user_type")
+    list_select_related = ("user", "country")
+    list_filter = ("user_type",)
+    search_fields = ("user__username",)
+    raw_id_fields = ("user",)
+    autocomplete_fields = ("country", "interests")
 
 
 class DegreeAdmin(admin.ModelAdmin):
     list_display = ("label",)
+    search_fields = ("label",)
 
 
 class InstitutionAdmin(admin.ModelAdmin):
     list_display = ("label", "country")
+    list_select_related = ("country",)
+    search_fields = ("label",)
+    autocomplete_fields = ("country",)
 
 
-class EducationAdmin(admin.ModelAdmin):
+class EducationAdmin(LargeTableAdmin):
     list_display = (
         "user_profile",
         "institution",
@@ -39,10 +51,15 @@ class EducationAdmin(admin.ModelAdmin):
         "start_date",
         "end_date",
     )
+    list_select_related = ("user_profile__user", "institution", "degree")
+    raw_id_fields = ("user_profile",)
+    autocomplete_fields = ("institution", "degree")
 
 
-class WorkExperienceAdmin(admin.ModelAdmin):
+class WorkExperienceAdmin(LargeTableAdmin):
     list_display = ("user_profile", "company", "position", "start_date", "end_date")
+    list_select_related = ("user_profile__user",)
+    raw_id_fields = ("user_profile",)
 
 
 admin.site.register(Country, CountryAdmin)
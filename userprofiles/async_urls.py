@@ -0,0 +1,6 @@
+from django.urls import path
+from .async_views import user_profile_detail
+
+urlpatterns = [
+    path("info/", user_profile_detail, name="async-user-info"),
+]
@@ -0,0 +1,43 @@
+from rest_framework.exceptions import NotAuthenticated, NotFound
+
+from mooc.asyncapi import async_api_view
+from mooc.authentication import aauthenticate
+from userprofiles.models import Education, UserProfile, WorkExperience
+from userprofiles.serializers import (
+    FastEducationSerializer,
+    FastWorkExperienceSerializer,
+    profile_representation,
+)
+
+
+@async_api_view
+async def user_profile_detail(request):
+    """Async ``UserProfileViewSet.retrieve``: own profile or ``?username=``."""
+    username = request.GET.get("username")
+    profiles = UserProfile.objects.select_related("user", "country")
+    if username is None:
+        user = await aauthenticate(request)
+        if user is None:
+            raise NotAuthenticated()
+        lookup = {"user": user}
+    else:
+        lookup = {"user__username": username}
+
+    try:
+        profile = await profiles.aget(**lookup)
+    except UserProfile.DoesNotExist:
+        raise NotFound()
+
+    interests = [
+        label async for label in profile.interests.values_list("label", flat=True)
+    ]
+    work = await FastWorkExperienceSerializer(
+        WorkExperience.objects.filter(user_profile=profile).timeline()
+    ).adata()
+    education = await FastEducationSerializer(
+        Education.objects.filter(user_profile=profile).timeline()
+    ).adata()
+    return {
+        "status": "success",
+        "data": profile_representation(profile, interests, work, education),
+    }
@@ -0,0 +1,129 @@
+import threading
+import time
+from bisect import bisect_left
+
+from django.core.cache import cache
+
+from mooc.routers import read_from_primary
+from .models import Country, Degree, Institution, Interest
+
+VOCABULARIES = {
+    "institutions": Institution,
+    "countries": Country,
+    "interests": Interest,
+    "degrees": Degree,
+}
+# Indexes live in each worker process. A version in the shared cache tells
+# the other workers about a change, the age limit covers caches that are
+# not shared between processes.
+INDEX_MAX_AGE = 10 * 60
+
+
+class LabelIndex:
+    """
+    Sorted, case-folded label keys searched with bisect.
+
+    Every label is indexed once by its full text and once per following word,
+    so "tech" matches "Massachusetts Institute of Technology" as well.
+    Matches on the start of the label are returned before word matches.
+    """
+
+    def __init__(self, labels):
+        labels = sorted(set(labels), key=str.casefold)
+        self._label_keys = [label.casefold() for label in labels]
+        self._labels = labels
+
+        words = sorted(
+            (" ".join(words[position:]), label)
+            for label in labels
+            for words in [label.casefold().split()]
+            for position in range(1, len(words))
+        )
+        self._word_keys = [key for key, _ in words]
+        self._word_labels = [label for _, label in words]
+
+    def __len__(self):
+        return len(self._labels)
+
+    @staticmethod
+    def _prefixed(keys, values, prefix):
+        position = bisect_left(keys, prefix)
+        while position < len(keys) and keys[position].startswith(prefix):
+            yield values[position]
+            position += 1
+
+    def search(self, prefix, limit):
+        prefix = " ".join(prefix.casefold().split())
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        for source in (
+            self._prefixed(self._label_keys, self._labels, prefix),
+            self._prefixed(self._word_keys, self._word_labels, prefix),
+        ):
+            for label in source:
+                if label not in seen:
+                    seen.add(label)
+                    results.append(label)
+                    if len(results) == limit:
+                        return results
+        return results
+
+
+_indexes = {}
+_lock = threading.Lock()
+
+
+def _version_key(vocabulary):
+    return f"autocomplete-version:{vocabulary}"
+
+
+def _version(vocabulary):
+    key = _version_key(vocabulary)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        cache.set(key, version, None)
+    return version
+
+
+def _is_current(entry, version):
+    return (
+        entry is not None
+        and entry[0] == version
+        and time.monotonic() - entry[1] < INDEX_MAX_AGE
+    )
+
+
+def get_index(vocabulary):
+    """
+    Return the label index for a vocabulary, building it from the database
+    the first time it is needed after a change in any process.
+    """
+    version = _version(vocabulary)
+    entry = _indexes.get(vocabulary)
+    if not _is_current(entry, version):
+        with _lock:
+            entry = _indexes.get(vocabulary)
+            if not _is_current(entry, version):
+                model = VOCABULARIES[vocabulary]
+                # Built under the current version, a lagging replica could
+                # miss the change that reset it.
+                with read_from_primary():
+                    index = LabelIndex(model.objects.values_list("label", flat=True))
+                entry = (version, time.monotonic(), index)
+                _indexes[vocabulary] = entry
+    return entry[2]
+
+
+def invalidate(model):
+    for vocabulary, vocabulary_model in VOCABULARIES.items():
+        if vocabulary_model is model:
+            cache.delete(_version_key(vocabulary))
+            _indexes.pop(vocabulary, None)
+
+
+def clear():
+    _indexes.clear()
@@ -0,0 +1,80 @@
+from django.db.models import Exists, OuterRef
+
+from mooc.fast_serializers import ValuesSerializer
+from .models import Education, UserProfile, WorkExperience
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class DirectoryProfileSerializer(ValuesSerializer):
+    """The few columns a directory entry shows, read in the search query."""
+
+    fields = {
+        "user_id": "user_id",
+        "username": "user__username",
+        "first_name": "user__first_name",
+        "last_name": "user__last_name",
+        "country": "country__label",
+        "profile_picture": "profile_picture",
+    }
+
+
+def search(
+    countries=(),
+    interests=(),
+    institutions=(),
+    companies=(),
+    after=None,
+    limit=DEFAULT_LIMIT,
+):
+    """
+    Return up to ``limit`` directory entries in profile id order, after the
+    profile id ``after``, and the cursor of the next page or None.
+
+    Each filter is a list of accepted values, profiles must match one value
+    of every given filter: a country, an interest, an institution they
+    studied at and a company they worked at. Interests, education and work
+    experience are matched with EXISTS subqueries, so a profile is a single
+    row however many related rows match, and everything runs as one query.
+    """
+    profiles = UserProfile.objects.all()
+    if countries:
+        profiles = profiles.filter(country__in=countries)
+    if interests:
+        profiles = profiles.filter(
+            Exists(
+                UserProfile.interests.through.objects.filter(
+                    userprofile=OuterRef("pk"), interest__in=interests
+                )
+            )
+        )
+    if institutions:
+        profiles = profiles.filter(
+            Exists(
+                Education.objects.filter(
+                    user_profile=OuterRef("pk"), institution__in=institutions
+                )
+            )
+        )
+    if companies:
+        profiles = profiles.filter(
+            Exists(
+                WorkExperience.objects.filter(
+                    user_profile=OuterRef("pk"), company__in=companies
+                )
+            )
+        )
+    if after is not None:
+        profiles = profiles.filter(pk__gt=after)
+
+    rows = profiles.order_by("pk").values_list(
+        "pk", *DirectoryProfileSerializer.lookups()
+    )
+    # One row more than a page tells whether there is a next page.
+    rows = list(rows[: limit + 1])
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    results = [
+        DirectoryProfileSerializer.to_representation(row[1:]) for row in rows[:limit]
+    ]
+    return results, next_cursor
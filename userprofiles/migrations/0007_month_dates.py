@@ -0,0 +1,221 @@
+import datetime
+import re
+
+from django.db import migrations, models
+
+import userprofiles.models
+
+BACKFILL_CHUNK_SIZE = 2000
+MONTH_RE = re.compile(r"^\s*(\d{4})(?:-(\d{1,2}))?(?:-\d{1,2})?\s*$")
+TIMELINE_MODELS = ("Education", "WorkExperience")
+
+
+def parse_month(value):
+    match = MONTH_RE.match(value or "")
+    if match is None:
+        return None
+    try:
+        return datetime.date(int(match[1]), int(match[2] or 1), 1)
+    except ValueError:
+        return None
+
+
+def format_month(value):
+    return value.strftime("%Y-%m") if value is not None else ""
+
+
+def legacy_value(value, month):
+    # Kept where formatting the month would not give the string back,
+    # including every value that could not be parsed.
+    return value if value != format_month(month) else None
+
+
+def original_value(month, legacy):
+    # Rows edited since keep their new month.
+    if legacy is not None and parse_month(legacy) == month:
+        return legacy
+    return format_month(month)
+
+
+def parse_row(start_date, end_date):
+    start_month, end_month = parse_month(start_date), parse_month(end_date)
+    return (
+        start_month,
+        end_month,
+        legacy_value(start_date, start_month),
+        legacy_value(end_date, end_month),
+    )
+
+
+def format_row(start_month, end_month, legacy_start_date, legacy_end_date):
+    return (
+        original_value(start_month, legacy_start_date),
+        original_value(end_month, legacy_end_date),
+    )
+
+
+def convert(apps, schema_editor, source, target, function):
+    """
+    Set ``target`` fields to ``function`` of the ``source`` field values of
+    each row in primary key ordered chunks, one UPDATE per chunk.
+    """
+    for model_name in TIMELINE_MODELS:
+        model = apps.get_model("userprofiles", model_name)
+        manager = model.objects.using(schema_editor.connection.alias)
+        last_pk = 0
+        while True:
+            rows = list(
+                manager.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", *source)[:BACKFILL_CHUNK_SIZE]
+            )
+            if not rows:
+                break
+            manager.bulk_update(
+                [
+                    model(pk=row[0], **dict(zip(target, function(*row[1:]))))
+                    for row in rows
+                ],
+                target,
+            )
+            last_pk = rows[-1][0]
+
+
+def parse_dates(apps, schema_editor):
+    convert(
+        apps,
+        schema_editor,
+        ("start_date", "end_date"),
+        ("start_month", "end_month", "legacy_start_date", "legacy_end_date"),
+        parse_row,
+    )
+
+
+def format_dates(apps, schema_editor):
+    convert(
+        apps,
+        schema_editor,
+        ("start_month", "end_month", "legacy_start_date", "legacy_end_date"),
+        ("start_date", "end_date"),
+        format_row,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userprofiles", "0006_userprofile_updated_at"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="education",
+            name="start_month",
+            field=userprofiles.models.MonthField(null=True),
+        ),
+        migrations.AddField(
+            model_name="education",
+            name="end_month",
+            field=userprofiles.models.MonthField(null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name="workexperience",
+            name="start_month",
+            field=userprofiles.models.MonthField(null=True),
+        ),
+        migrations.AddField(
+            model_name="workexperience",
+            name="end_month",
+            field=userprofiles.models.MonthField(null=True, blank=True),
+        ),
+        migrations.AddField(
+            model_name="education",
+            name="legacy_start_date",
+            field=models.CharField(editable=False, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name="education",
+            name="legacy_end_date",
+            field=models.CharField(editable=False, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name="workexperience",
+            name="legacy_start_date",
+            field=models.CharField(editable=False, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name="workexperience",
+            name="legacy_end_date",
+            field=models.CharField(editable=False, max_length=7, null=True),
+        ),
+        # Nullable while unapplying, until the strings are formatted again.
+        migrations.AlterField(
+            model_name="education",
+            name="start_date",
+            field=models.CharField(max_length=7, null=True),
+        ),
+        migrations.AlterField(
+            model_name="education",
+            name="end_date",
+            field=models.CharField(max_length=7, null=True),
+        ),
+        migrations.AlterField(
+            model_name="workexperience",
+            name="start_date",
+            field=models.CharField(max_length=7, null=True),
+        ),
+        migrations.AlterField(
+            model_name="workexperience",
+            name="end_date",
+            field=models.CharField(max_length=7, null=True),
+        ),
+        migrations.RunPython(parse_dates, format_dates),
+        migrations.RemoveField(
+            model_name="education",
+            name="start_date",
+        ),
+        migrations.RemoveField(
+            model_name="education",
+            name="end_date",
+        ),
+        migrations.RemoveField(
+            model_name="workexperience",
+            name="start_date",
+        ),
+        migrations.RemoveField(
+            model_name="workexperience",
+            name="end_date",
+        ),
+        migrations.RenameField(
+            model_name="education",
+            old_name="start_month",
+            new_name="start_date",
+        ),
+        migrations.RenameField(
+            model_name="education",
+            old_name="end_month",
+            new_name="end_date",
+        ),
+        migrations.RenameField(
+            model_name="workexperience",
+            old_name="start_month",
+            new_name="start_date",
+        ),
+        migrations.RenameField(
+            model_name="workexperience",
+            old_name="end_month",
+            new_name="end_date",
+        ),
+        migrations.AddIndex(
+            model_name="education",
+            index=models.Index(
+                fields=["user_profile", "start_date"], name="education_profile_start_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="workexperience",
+            index=models.Index(
+                fields=["user_profile", "start_date"], name="work_profile_start_idx"
+            ),
+        ),
+    ]
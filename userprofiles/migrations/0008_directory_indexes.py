@@ -0,0 +1,29 @@
+# Generated by Django 4.2.10 on 2026-10-19 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("userprofiles", "0007_month_dates"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="education",
+            index=models.Index(
+                fields=["institution", "user_profile"], name="education_institution_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=models.Index(fields=["country", "id"], name="profile_country_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="workexperience",
+            index=models.Index(
+                fields=["company", "user_profile"], name="work_company_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,59 @@
+import datetime
+import re
+
 from django.db import models
+from django.db.models import Q
 from django.contrib.auth.models import User
 
+MONTH_FORMAT = "%Y-%m"
+_MONTH_RE = re.compile(r"^\s*(\d{4})(?:-(\d{1,2}))?(?:-\d{1,2})?\s*$")
+
+
+def parse_month(value):
+    """
+    Parse ``"YYYY-MM"``, ``"YYYY-MM-DD"`` or ``"YYYY"`` into the first day
+    of that month, or None when ``value`` is none of those.
+    """
+    match = _MONTH_RE.match(value)
+    if match is None:
+        return None
+    try:
+        return datetime.date(int(match[1]), int(match[2] or 1), 1)
+    except ValueError:
+        return None
+
+
+class MonthField(models.DateField):
+    """
+    ``DateField`` with month precision, storing the first day of the month.
+    Also accepts the ``"YYYY-MM"`` strings the API uses.
+    """
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            month = parse_month(value)
+            if month is not None:
+                return month
+        value = super().to_python(value)
+        return value.replace(day=1) if value is not None else None
+
+
+class TimelineQuerySet(models.QuerySet):
+    def timeline(self):
+        """Most recent first, served by the (user_profile, start_date) index."""
+        return self.order_by("-start_date", "-pk")
+
+    def during(self, start, end):
+        """
+        Entries overlapping ``start`` to ``end``, both dates or ``"YYYY-MM"``
+        months, inclusive. Entries without an end date are ongoing.
+        """
+        start = MonthField().to_python(start)
+        end = MonthField().to_python(end)
+        return self.filter(
+            Q(end_date__gte=start) | Q(end_date__isnull=True), start_date__lte=end
+        )
+
 
 class Country(models.Model):
     label = models.CharField(max_length=100, unique=True)
@@ -42,6 +95,13 @@ class UserProfile(models.Model):
         max_length=100, choices=user_type_choices, editable=False, default="student"
     )
     interests = models.ManyToManyField(Interest, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Directory pages filtered by country, in profile id order.
+            models.Index(fields=["country", "id"], name="profile_country_idx"),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
@@ -70,8 +130,28 @@ class Education(models.Model):
     institution = models.ForeignKey(Institution, on_delete=models.PROTECT)
     degree = models.ForeignKey(Degree, on_delete=models.PROTECT)
     field_of_study = models.CharField(max_length=100)
-    start_date = models.CharField(max_length=7)
-    end_date = models.CharField(max_length=7)
+    # Null where a legacy free text value could not be parsed, end dates
+    # also for ongoing entries.
+    start_date = MonthField(null=True)
+    end_date = MonthField(null=True, blank=True)
+    # The free text values the dates were converted from, where they could
+    # not be converted exactly. Restored when the conversion is unapplied.
+    legacy_start_date = models.CharField(max_length=7, null=True, editable=False)
+    legacy_end_date = models.CharField(max_length=7, null=True, editable=False)
+
+    objects = TimelineQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user_profile", "start_date"],
+                name="education_profile_start_idx",
+            ),
+            models.Index(
+                fields=["institution", "user_profile"],
+                name="education_institution_idx",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user_profile.user.username}'s Education"
@@ -81,9 +161,23 @@ class WorkExperience(models.Model):
     user_profile = models.ForeignKey(UserProfile, on_delete=models.CASCADE)
     company = models.CharField(max_length=100)
     position = models.CharField(max_length=100)
-    start_date = models.CharField(max_length=7)
-    end_date = models.CharField(max_length=7)
+    start_date = MonthField(null=True)
+    end_date = MonthField(null=True, blank=True)
+    # See ``Education``.
+    legacy_start_date = models.CharField(max_length=7, null=True, editable=False)
+    legacy_end_date = models.CharField(max_length=7, null=True, editable=False)
     profile_picture = models.CharField(max_length=100, blank=True, null=True)
 
+    objects = TimelineQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["user_profile", "start_date"],
+                name="work_profile_start_idx",
+            ),
+            models.Index(fields=["company", "user_profile"], name="work_company_idx"),
+        ]
+
     def __str__(self):
         return f"{self.user_profile.user.username}'s Work Experience"
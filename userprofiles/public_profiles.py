@@ -0,0 +1,115 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+from django.db import transaction
+
+from mooc.conditional import get_validators
+from mooc.routers import read_from_primary
+from .models import UserProfile
+from .serializers import UserProfileSerializer
+
+PUBLIC_PROFILE_CACHE_TIMEOUT = 60 * 60
+PUBLIC_PROFILE_MISS_CACHE_TIMEOUT = 5 * 60
+# The most requested profiles, typically instructors, are also kept in
+# process memory, skipping the cache round trip and unpickling. Other
+# processes only learn about a change through the shared cache, so entries
+# are kept for a short time.
+LOCAL_CACHE_SIZE = 256
+LOCAL_CACHE_TIMEOUT = 30
+_MISSING = "missing"
+
+_local = OrderedDict()
+_lock = threading.Lock()
+
+
+def _cache_key(username):
+    return f"public-profile:{username}"
+
+
+def _local_get(key):
+    with _lock:
+        item = _local.get(key)
+        if item is None:
+            return None
+        expires, entry = item
+        if expires < time.monotonic():
+            del _local[key]
+            return None
+        _local.move_to_end(key)
+        return entry
+
+
+def _local_set(key, entry):
+    with _lock:
+        _local[key] = (time.monotonic() + LOCAL_CACHE_TIMEOUT, entry)
+        _local.move_to_end(key)
+        while len(_local) > LOCAL_CACHE_SIZE:
+            _local.popitem(last=False)
+
+
+def get_public_profile(username):
+    """
+    Return the cached public profile of ``username``, or None when there is
+    no such profile.
+
+    The entry is a dict holding the serialized profile as ``data`` together
+    with its ``etag`` and ``last_modified`` validators, so conditional
+    requests are answered from the cache as well. Misses are cached too.
+    """
+    key = _cache_key(username)
+    entry = _local_get(key)
+    if entry is None:
+        entry = cache.get(key)
+        if entry is None:
+            # A lagging replica would put the profile from before the last
+            # invalidation back into the shared cache.
+            with read_from_primary():
+                entry = _load(username)
+            cache.set(
+                key,
+                entry,
+                PUBLIC_PROFILE_MISS_CACHE_TIMEOUT
+                if entry == _MISSING
+                else PUBLIC_PROFILE_CACHE_TIMEOUT,
+            )
+        _local_set(key, entry)
+    return None if entry == _MISSING else entry
+
+
+def _load(username):
+    profile = (
+        UserProfile.objects.select_related("user", "country")
+        .filter(user__username=username)
+        .first()
+    )
+    if profile is None:
+        return _MISSING
+    etag, last_modified = get_validators([(profile.pk, profile.updated_at)])
+    return {
+        "data": dict(UserProfileSerializer(profile).data),
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+
+def invalidate(usernames):
+    keys = [_cache_key(username) for username in usernames]
+    if not keys:
+        return
+
+    def delete():
+        cache.delete_many(keys)
+        with _lock:
+            for key in keys:
+                _local.pop(key, None)
+
+    delete()
+    # A profile read before the transaction commits would cache the old data.
+    transaction.on_commit(delete)
+
+
+def clear():
+    with _lock:
+        _local.clear()
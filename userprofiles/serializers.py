@@ -1,6 +1,10 @@
-from rest_framework import serializers
+from rest_framework import ISO_8601, serializers
+from rest_framework.validators import UniqueValidator
 from django.contrib.auth.models import User
+from django.contrib.auth.validators import UnicodeUsernameValidator
+from django.contrib.auth.hashers import make_password
 from rest_framework_simplejwt.tokens import AccessToken
+from mooc.fast_serializers import ValuesSerializer
 from .models import (
     UserProfile,
     Country,
@@ -8,7 +12,10 @@ from .models import (
     WorkExperience,
     Education,
     Institution,
+    Degree,
+    MONTH_FORMAT,
 )
+from . import models
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -18,25 +25,30 @@ class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["firstname", "lastname", "email", "password", "username"]
-        extra_kwargs = {"password": {"write_only": True}}
+        extra_kwargs = {
+            "password": {"write_only": True},
+            # The model field's uniqueness check, with the API's message.
+            "username": {
+                "validators": [
+                    UnicodeUsernameValidator(),
+                    UniqueValidator(
+                        queryset=User.objects.all(), message="Username already exists"
+                    ),
+                ]
+            },
+        }
 
-    def validate(self, attrs):
-        # raise an error if the email already exists
-        email = attrs.get("email")
-        username = attrs.get("username")
+    def validate_email(self, email):
+        # raise an error if the email already exists, checked like the
+        # username so both are reported, email first
         if User.objects.filter(email=email).exists():
-            raise serializers.ValidationError({"email": "Email already exists"})
-        if User.objects.filter(username=username).exists():
-            raise serializers.ValidationError({"username": "Username already exists"})
+            raise serializers.ValidationError("Email already exists")
 
-        return attrs
+        return email
 
     def create(self, validated_data):
-        password = validated_data.pop("password")
-        user = super().create(validated_data)
-        user.set_password(password)
-        user.save()
-        return user
+        validated_data["password"] = make_password(validated_data["password"])
+        return super().create(validated_data)
 
     def to_representation(self, instance):
         return {
@@ -106,39 +118,221 @@ class UserProfileSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
     
     def to_representation(self, instance):
-        work = WorkExperience.objects.filter(user_profile=instance)
-        education = Education.objects.filter(user_profile=instance)
-
-        work_data = WorkExperienceSerializer(work, many=True).data
-        education_data = EducationSerializer(education, many=True).data
-
-        representation = {
-            "user_id": instance.user.id,
-            "username": instance.user.username,
-            "first_name": instance.user.first_name,
-            "last_name": instance.user.last_name,
-            "email": instance.user.email,
-            "country": instance.country.label,
-            "description": instance.description,
-            "profile_picture": instance.profile_picture if instance.profile_picture else "",
-            "interests": [interest.label for interest in instance.interests.all()],
-            "work_experience": work_data,
-            "education": education_data,
-        }
-        return representation
+        work = FastWorkExperienceSerializer(
+            WorkExperience.objects.filter(user_profile=instance).timeline()
+        ).data
+        education = FastEducationSerializer(
+            Education.objects.filter(user_profile=instance).timeline()
+        ).data
+        interests = [interest.label for interest in instance.interests.all()]
+        return profile_representation(instance, interests, work, education)
+
+
+def profile_representation(instance, interests, work, education):
+    """
+    Build the profile payload from already loaded and serialized related
+    rows, so async views can fetch them with the async ORM first.
+    """
+    return {
+        "user_id": instance.user.id,
+        "username": instance.user.username,
+        "first_name": instance.user.first_name,
+        "last_name": instance.user.last_name,
+        "email": instance.user.email,
+        "country": instance.country.label,
+        "description": instance.description,
+        "profile_picture": instance.profile_picture if instance.profile_picture else "",
+        "interests": interests,
+        "work_experience": work,
+        "education": education,
+    }
+
+
+class MonthField(serializers.DateField):
+    """``"YYYY-MM"`` months, ISO 8601 dates are accepted and truncated."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("format", MONTH_FORMAT)
+        kwargs.setdefault("input_formats", [MONTH_FORMAT, ISO_8601])
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, value):
+        return super().to_internal_value(value).replace(day=1)
+
+
+def format_month(value):
+    return value.strftime(MONTH_FORMAT)
+
+
+class TimelineSerializer(serializers.ModelSerializer):
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.MonthField: MonthField,
+    }
 
 
-class WorkExperienceSerializer(serializers.ModelSerializer):
+# The columns are nullable for legacy values only, the API requires dates.
+TIMELINE_EXTRA_KWARGS = {
+    "start_date": {"required": True, "allow_null": False},
+    "end_date": {"required": True, "allow_null": False},
+}
+# Only kept to unapply the month conversion, not part of the API.
+TIMELINE_LEGACY_FIELDS = ["legacy_start_date", "legacy_end_date"]
+
+
+class WorkExperienceSerializer(TimelineSerializer):
     class Meta:
         model = WorkExperience
-        fields = "__all__"
-        
+        exclude = TIMELINE_LEGACY_FIELDS
+        extra_kwargs = TIMELINE_EXTRA_KWARGS
 
 
-class EducationSerializer(serializers.ModelSerializer):
+class EducationSerializer(TimelineSerializer):
     class Meta:
         model = Education
-        fields = "__all__"
+        exclude = TIMELINE_LEGACY_FIELDS
+        extra_kwargs = TIMELINE_EXTRA_KWARGS
+
+
+class FastWorkExperienceSerializer(ValuesSerializer):
+    """Read-only ``WorkExperienceSerializer`` for lists."""
+
+    fields = {
+        "id": "id",
+        "company": "company",
+        "position": "position",
+        "start_date": "start_date",
+        "end_date": "end_date",
+        "profile_picture": "profile_picture",
+        "user_profile": "user_profile",
+    }
+    converters = {"start_date": format_month, "end_date": format_month}
+
+
+class FastEducationSerializer(ValuesSerializer):
+    """Read-only ``EducationSerializer`` for lists."""
+
+    fields = {
+        "id": "id",
+        "field_of_study": "field_of_study",
+        "start_date": "start_date",
+        "end_date": "end_date",
+        "user_profile": "user_profile",
+        "institution": "institution",
+        "degree": "degree",
+    }
+    converters = {"start_date": format_month, "end_date": format_month}
+
+
+BATCH_MAX_SIZE = 100
+
+
+class WorkExperienceItemSerializer(TimelineSerializer):
+    class Meta:
+        model = WorkExperience
+        exclude = ["user_profile", *TIMELINE_LEGACY_FIELDS]
+        extra_kwargs = TIMELINE_EXTRA_KWARGS
+
+
+class WorkExperienceUpdateItemSerializer(WorkExperienceItemSerializer):
+    id = serializers.IntegerField()
+
+    class Meta(WorkExperienceItemSerializer.Meta):
+        extra_kwargs = {
+            field: {"required": False, "allow_null": False}
+            for field in ("company", "position", "start_date", "end_date")
+        }
+
+
+class EducationItemSerializer(TimelineSerializer):
+    # Resolved for the whole batch at once instead of a query per item.
+    institution = serializers.IntegerField()
+    degree = serializers.IntegerField()
+
+    class Meta:
+        model = Education
+        exclude = ["user_profile", *TIMELINE_LEGACY_FIELDS]
+        extra_kwargs = TIMELINE_EXTRA_KWARGS
+
+
+class EducationUpdateItemSerializer(EducationItemSerializer):
+    id = serializers.IntegerField()
+    institution = serializers.IntegerField(required=False)
+    degree = serializers.IntegerField(required=False)
+
+    class Meta(EducationItemSerializer.Meta):
+        extra_kwargs = {
+            field: {"required": False, "allow_null": False}
+            for field in ("field_of_study", "start_date", "end_date")
+        }
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Validate ``create``, ``update`` and ``delete`` operations on the rows of
+    ``context["queryset"]`` together.
+
+    Updated and deleted rows are fetched in one query, and the ids of each
+    foreign key in ``related`` are resolved in one query per model and
+    replaced with the instances. ``validated_data`` holds the operations
+    plus the fetched rows as ``instances``.
+    """
+
+    delete = serializers.ListField(
+        child=serializers.IntegerField(), max_length=BATCH_MAX_SIZE, default=list
+    )
+    related = {}
+
+    def validate(self, attrs):
+        attrs.setdefault("create", [])
+        attrs.setdefault("update", [])
+        ids = [item["id"] for item in attrs["update"]] + attrs["delete"]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError(
+                {"id": ["Each row can only be updated or deleted once."]}
+            )
+
+        instances = self.context["queryset"].in_bulk(ids)
+        missing = [pk for pk in ids if pk not in instances]
+        if missing:
+            raise serializers.ValidationError(
+                {"id": [f"Not found: {', '.join(map(str, missing))}."]}
+            )
+
+        items = attrs["create"] + attrs["update"]
+        for field, model in self.related.items():
+            related_ids = {item[field] for item in items if field in item}
+            related = model.objects.in_bulk(related_ids)
+            missing = sorted(related_ids - related.keys())
+            if missing:
+                raise serializers.ValidationError(
+                    {field: [f"Invalid {field}: {', '.join(map(str, missing))}."]}
+                )
+            for item in items:
+                if field in item:
+                    item[field] = related[item[field]]
+
+        attrs["instances"] = instances
+        return attrs
+
+
+class WorkExperienceBatchSerializer(BatchSerializer):
+    create = WorkExperienceItemSerializer(
+        many=True, required=False, max_length=BATCH_MAX_SIZE
+    )
+    update = WorkExperienceUpdateItemSerializer(
+        many=True, required=False, max_length=BATCH_MAX_SIZE
+    )
+
+
+class EducationBatchSerializer(BatchSerializer):
+    create = EducationItemSerializer(
+        many=True, required=False, max_length=BATCH_MAX_SIZE
+    )
+    update = EducationUpdateItemSerializer(
+        many=True, required=False, max_length=BATCH_MAX_SIZE
+    )
+    related = {"institution": Institution, "degree": Degree}
 
 
 class UserLoginSerializer(serializers.Serializer):
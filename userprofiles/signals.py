@@ -0,0 +1,109 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import autocomplete, public_profiles
+from .models import (
+    Country,
+    Degree,
+    Education,
+    Institution,
+    Interest,
+    UserProfile,
+    WorkExperience,
+)
+
+_owner_touches_deferred = ContextVar("owner_touches_deferred", default=False)
+
+
+def touch_profiles(**lookups):
+    """
+    Bump ``updated_at`` of the profiles whose representation changed and
+    drop them from the public profile cache.
+    """
+    profiles = UserProfile.objects.filter(**lookups)
+    public_profiles.invalidate(profiles.values_list("user__username", flat=True))
+    profiles.update(updated_at=timezone.now())
+
+
+@contextmanager
+def defer_owner_touches():
+    """
+    Skip touching the owner profile per saved or deleted work experience
+    and education row, for callers touching it once afterwards.
+    """
+    token = _owner_touches_deferred.set(True)
+    try:
+        yield
+    finally:
+        _owner_touches_deferred.reset(token)
+
+
+@receiver([post_save, post_delete], sender=Institution)
+@receiver([post_save, post_delete], sender=Country)
+@receiver([post_save, post_delete], sender=Interest)
+@receiver([post_save, post_delete], sender=Degree)
+def invalidate_autocomplete(sender, **kwargs):
+    autocomplete.invalidate(sender)
+    # An index rebuilt before the transaction commits would miss the change.
+    transaction.on_commit(lambda: autocomplete.invalidate(sender))
+
+
+@receiver([post_save, post_delete], sender=UserProfile)
+def invalidate_public_profile(sender, instance, raw=False, **kwargs):
+    if not raw:
+        public_profiles.invalidate([instance.user.username])
+
+
+@receiver(pre_save, sender=User)
+def invalidate_renamed_public_profile(sender, instance, raw=False, **kwargs):
+    update_fields = kwargs.get("update_fields")
+    if instance.pk is None or raw:
+        return
+    if update_fields is None or "username" in update_fields:
+        # The profile is no longer found under the old username.
+        public_profiles.invalidate(
+            User.objects.filter(pk=instance.pk)
+            .exclude(username=instance.username)
+            .values_list("username", flat=True)
+        )
+
+
+@receiver(post_save, sender=User)
+def touch_user_profile(sender, instance, created=False, raw=False, **kwargs):
+    # Admin logins only update last_login, which profiles don't show.
+    if not created and not raw and kwargs.get("update_fields") != {"last_login"}:
+        touch_profiles(user=instance)
+
+
+@receiver([post_save, post_delete], sender=WorkExperience)
+@receiver([post_save, post_delete], sender=Education)
+def touch_owner_profile(sender, instance, raw=False, **kwargs):
+    if not raw and not _owner_touches_deferred.get():
+        touch_profiles(pk=instance.user_profile_id)
+
+
+@receiver(m2m_changed, sender=UserProfile.interests.through)
+def touch_interest_profiles(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        touch_profiles(pk=instance.pk)
+    elif pk_set:
+        touch_profiles(pk__in=pk_set)
+
+
+@receiver(post_save, sender=Country)
+@receiver(post_save, sender=Interest)
+def touch_label_profiles(sender, instance, created=False, raw=False, **kwargs):
+    if created or raw:
+        return
+    if sender is Country:
+        touch_profiles(country=instance)
+    else:
+        touch_profiles(interests=instance)
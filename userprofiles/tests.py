@@ -1,6 +1,15 @@
+import datetime
+import time
 from contextlib import AbstractContextManager
+from unittest import mock
 from typing import Any
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from django.contrib.auth.models import User
@@ -11,8 +20,23 @@ from .models import (
     Education,
     Institution,
     Degree,
+    Interest,
+    parse_month,
 )
 from rest_framework_simplejwt.tokens import AccessToken
+from userprofiles import autocomplete, public_profiles
+from userprofiles.signals import touch_profiles
+from userprofiles.serializers import (
+    EducationSerializer,
+    FastEducationSerializer,
+    FastWorkExperienceSerializer,
+    WorkExperienceBatchSerializer,
+    WorkExperienceSerializer,
+)
+from mooc import metrics, throttling
+from mooc.renderers import JSONRenderer
+from mooc.routers import PrimaryReplicaRouter, read_database
+from mooc.testing import QueryBudgetMixin, seed_education, seed_work_experience
 
 
 class UserRegisterViewTest(APITestCase):
@@ -22,6 +46,7 @@ class UserRegisterViewTest(APITestCase):
         cls.url = reverse("user-registration")
 
     def setUp(self):
+        throttling.clear()
         self.data = {
             "username": "testuser",
             "firstname": "first",
@@ -61,6 +86,19 @@ class UserRegisterViewTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertEqual(response.data["message"], ["Email already exists"])
 
+    def test_username_uniqueness(self):
+        self.create_user("existing@example.com")
+        self.data["username"] = "existing@example.com"
+        response = self.post_request(self.data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], ["Username already exists"])
+
+        self.data["email"] = "existing@example.com"
+        response = self.post_request(self.data)
+        self.assertEqual(
+            response.data["message"], ["Email already exists", "Username already exists"]
+        )
+
     def test_email_and_password_not_provided(self):
         del self.data["email"]
         del self.data["password"]
@@ -466,6 +504,401 @@ class EducationViewSetTest(APITestCase):
         self.assertEqual(response.data["message"], "Education deleted successfully")
 
 
+class BatchEditTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="batch@abc.com")
+        cls.user_profile = UserProfile.objects.create(
+            user=cls.user,
+            country=Country.objects.get(label="Turkey"),
+            birth_date="2000-10-12",
+        )
+        other = User.objects.create_user(username="other@abc.com")
+        cls.other_profile = UserProfile.objects.create(
+            user=other,
+            country=Country.objects.get(label="Turkey"),
+            birth_date="2000-10-12",
+        )
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_education_batch(self):
+        kept, updated, deleted = seed_education(self.user_profile, 3)
+        institution, degree = Institution.objects.last(), Degree.objects.last()
+        data = {
+            "create": [
+                {
+                    "institution": institution.pk,
+                    "degree": degree.pk,
+                    "field_of_study": f"Field {index}",
+                    "start_date": "2020-01",
+                    "end_date": "2021-01",
+                }
+                for index in range(10)
+            ],
+            "update": [{"id": updated.pk, "institution": institution.pk}],
+            "delete": [deleted.pk],
+        }
+        with self.assertQueryBudget(13):
+            response = self.client.post(reverse("education-batch"), data, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "success")
+        self.assertEqual(len(response.data["data"]["created"]), 10)
+        self.assertEqual(response.data["data"]["deleted"], [deleted.pk])
+        educations = Education.objects.filter(user_profile=self.user_profile)
+        self.assertEqual(educations.count(), 12)
+        self.assertEqual(educations.filter(institution=institution).count(), 11)
+        self.assertFalse(educations.filter(pk=deleted.pk).exists())
+        kept.refresh_from_db()
+        self.assertEqual(kept.field_of_study, "Computer Science")
+
+    def test_work_experience_batch(self):
+        (work,) = seed_work_experience(self.user_profile, 1)
+        data = {
+            "create": [
+                {
+                    "company": "Acme",
+                    "position": "Engineer",
+                    "start_date": "2020-01",
+                    "end_date": "2021-01",
+                }
+            ],
+            "update": [{"id": work.pk, "position": "Lead"}],
+        }
+        response = self.client.post(
+            reverse("work-experience-batch"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        work.refresh_from_db()
+        self.assertEqual(work.position, "Lead")
+        self.assertTrue(
+            WorkExperience.objects.filter(
+                user_profile=self.user_profile, company="Acme"
+            ).exists()
+        )
+
+    def test_batch_touches_profile(self):
+        (work,) = seed_work_experience(self.user_profile, 1)
+        UserProfile.objects.filter(pk=self.user_profile.pk).update(
+            updated_at=timezone.now() - timezone.timedelta(days=1)
+        )
+        response = self.client.post(
+            reverse("work-experience-batch"), {"delete": [work.pk]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user_profile.refresh_from_db()
+        self.assertGreater(
+            self.user_profile.updated_at, timezone.now() - timezone.timedelta(hours=1)
+        )
+
+    def test_batch_keeps_concurrent_edits(self):
+        first, second = seed_work_experience(self.user_profile, 2)
+        data = {
+            "update": [
+                {"id": first.pk, "position": "Lead"},
+                {"id": second.pk, "company": "Acme"},
+            ],
+        }
+        validate = WorkExperienceBatchSerializer.validate
+
+        def edit_after_validation(serializer, attrs):
+            attrs = validate(serializer, attrs)
+            # Another request edits both rows after they were read.
+            WorkExperience.objects.filter(pk__in=[first.pk, second.pk]).update(
+                company="Concurrent", position="Concurrent"
+            )
+            return attrs
+
+        with mock.patch.object(
+            WorkExperienceBatchSerializer, "validate", edit_after_validation
+        ):
+            response = self.client.post(
+                reverse("work-experience-batch"), data, format="json"
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.company, first.position), ("Concurrent", "Lead"))
+        self.assertEqual((second.company, second.position), ("Acme", "Concurrent"))
+
+    def test_batch_delete_touches_profile_once(self):
+        works = seed_work_experience(self.user_profile, 20)
+        deleted = []
+
+        def receiver(sender, instance, **kwargs):
+            deleted.append(instance.pk)
+
+        post_delete.connect(receiver, sender=WorkExperience)
+        try:
+            # Independent of the number of rows deleted.
+            with self.assertQueryBudget(8), mock.patch(
+                "userprofiles.views.touch_profiles", wraps=touch_profiles
+            ) as touch:
+                response = self.client.post(
+                    reverse("work-experience-batch"),
+                    {"delete": [work.pk for work in works]},
+                    format="json",
+                )
+        finally:
+            post_delete.disconnect(receiver, sender=WorkExperience)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(deleted, [work.pk for work in works])
+        touch.assert_called_once_with(user=self.user)
+        self.assertFalse(
+            WorkExperience.objects.filter(user_profile=self.user_profile).exists()
+        )
+
+    def test_deleted_row_touches_profile(self):
+        (work,) = seed_work_experience(self.user_profile, 1)
+        with mock.patch("userprofiles.signals.touch_profiles") as touch:
+            work.delete()
+        touch.assert_called_once_with(pk=self.user_profile.pk)
+
+    def test_batch_is_validated_together(self):
+        (work,) = seed_work_experience(self.user_profile, 1)
+        (foreign,) = seed_work_experience(self.other_profile, 1)
+        data = {
+            "create": [
+                {
+                    "company": "Acme",
+                    "position": "Engineer",
+                    "start_date": "2020-01",
+                    "end_date": "2021-01",
+                }
+            ],
+            "update": [{"id": work.pk, "position": "Lead"}],
+            "delete": [foreign.pk],
+        }
+        response = self.client.post(
+            reverse("work-experience-batch"), data, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], [f"Not found: {foreign.pk}."])
+        self.assertEqual(WorkExperience.objects.count(), 2)
+        work.refresh_from_db()
+        self.assertNotEqual(work.position, "Lead")
+
+    def test_batch_item_errors(self):
+        data = {
+            "create": [{"institution": 999999, "degree": 1}],
+            "update": [{"position": "Lead"}],
+        }
+        response = self.client.post(reverse("education-batch"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("field_of_study field is required.", response.data["message"])
+        self.assertIn("id field is required.", response.data["message"])
+
+        data["create"][0].update(
+            field_of_study="cs", start_date="2020-01", end_date="2021-01"
+        )
+        del data["update"]
+        response = self.client.post(reverse("education-batch"), data, format="json")
+        self.assertEqual(response.data["message"], ["Invalid institution: 999999."])
+
+
+class TimelineTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="timeline@abc.com")
+        cls.user_profile = UserProfile.objects.create(
+            user=cls.user,
+            country=Country.objects.get(label="Turkey"),
+            birth_date="2000-10-12",
+        )
+        cls.token = str(AccessToken.for_user(cls.user))
+        for company, start_date, end_date in (
+            ("Acme", "2018-03", "2019-12"),
+            ("Acme", "2021-02", None),
+            ("Initech", "2019-06", "2020-05"),
+            ("Globex", "2020-09", "2021-01"),
+        ):
+            WorkExperience.objects.create(
+                user_profile=cls.user_profile,
+                company=company,
+                position="Engineer",
+                start_date=start_date,
+                end_date=end_date,
+            )
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_parse_month(self):
+        self.assertEqual(parse_month("2020-10"), datetime.date(2020, 10, 1))
+        self.assertEqual(parse_month("2020-10-17"), datetime.date(2020, 10, 1))
+        self.assertEqual(parse_month("2020"), datetime.date(2020, 1, 1))
+        self.assertIsNone(parse_month("2020-13"))
+        self.assertIsNone(parse_month("present"))
+
+    def test_months_are_stored_as_dates(self):
+        response = self.client.post(
+            reverse("work-experience"),
+            {
+                "company": "Hooli",
+                "position": "Engineer",
+                "start_date": "2022-04-15",
+                "end_date": "2023-01",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        work = WorkExperience.objects.get(company="Hooli")
+        self.assertEqual(work.start_date, datetime.date(2022, 4, 1))
+        self.assertEqual(work.end_date, datetime.date(2023, 1, 1))
+
+    def test_invalid_month(self):
+        response = self.client.post(
+            reverse("work-experience"),
+            {
+                "company": "Hooli",
+                "position": "Engineer",
+                "start_date": "sometime",
+                "end_date": "2023-01",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_timeline_is_sorted_by_the_database(self):
+        response = self.client.get(reverse("work-experience"))
+        self.assertEqual(
+            [(row["company"], row["start_date"]) for row in response.data],
+            [
+                ("Acme", "2021-02"),
+                ("Globex", "2020-09"),
+                ("Initech", "2019-06"),
+                ("Acme", "2018-03"),
+            ],
+        )
+        self.assertIsNone(response.data[0]["end_date"])
+
+    def test_during(self):
+        during_2020 = WorkExperience.objects.during("2020-01", "2020-12")
+        self.assertEqual(
+            sorted(during_2020.values_list("company", flat=True)),
+            ["Globex", "Initech"],
+        )
+        self.assertEqual(
+            list(
+                WorkExperience.objects.filter(company="Acme")
+                .during(datetime.date(2022, 1, 1), "2022-06")
+                .values_list("start_date", flat=True)
+            ),
+            [datetime.date(2021, 2, 1)],
+        )
+
+
+class DirectoryTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.turkey = Country.objects.get(label="Turkey")
+        cls.other_country = Country.objects.exclude(pk=cls.turkey.pk).first()
+        cls.interests = list(Interest.objects.all()[:2])
+        cls.institution = Institution.objects.first()
+        cls.profiles = []
+        for index in range(6):
+            user = User.objects.create_user(
+                username=f"member{index}@abc.com", first_name=f"Member {index}"
+            )
+            profile = UserProfile.objects.create(
+                user=user,
+                country=cls.turkey if index % 2 == 0 else cls.other_country,
+                birth_date="2000-10-12",
+            )
+            cls.profiles.append(profile)
+        # Several matching rows per profile must not repeat the profile.
+        for profile in cls.profiles[:3]:
+            profile.interests.set(cls.interests)
+            for _ in range(3):
+                WorkExperience.objects.create(
+                    user_profile=profile,
+                    company="Acme",
+                    position="Engineer",
+                    start_date="2020-01",
+                    end_date="2021-01",
+                )
+        for profile in cls.profiles[1:4]:
+            seed_education(profile, 2)
+            Education.objects.filter(user_profile=profile).update(
+                institution=cls.institution
+            )
+        cls.token = str(AccessToken.for_user(cls.profiles[0].user))
+
+    def setUp(self):
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def search(self, **params):
+        response = self.client.get(reverse("directory"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def usernames(self, response):
+        return [row["username"] for row in response.data["data"]]
+
+    def test_filters_combine(self):
+        response = self.search(company="Acme")
+        self.assertEqual(
+            self.usernames(response),
+            ["member0@abc.com", "member1@abc.com", "member2@abc.com"],
+        )
+        response = self.search(company="Acme", institution=self.institution.pk)
+        self.assertEqual(
+            self.usernames(response), ["member1@abc.com", "member2@abc.com"]
+        )
+        response = self.search(
+            company="Acme",
+            institution=self.institution.pk,
+            country=self.turkey.pk,
+            interest=[interest.pk for interest in self.interests],
+        )
+        self.assertEqual(self.usernames(response), ["member2@abc.com"])
+        self.assertEqual(
+            response.data["data"][0],
+            {
+                "user_id": self.profiles[2].user_id,
+                "username": "member2@abc.com",
+                "first_name": "Member 2",
+                "last_name": "",
+                "country": "Turkey",
+                "profile_picture": None,
+            },
+        )
+
+    def test_keyset_pagination(self):
+        usernames = []
+        params = {"limit": 4}
+        while True:
+            with self.assertQueryBudget(2):
+                response = self.search(**params)
+            usernames += self.usernames(response)
+            if response.data["next"] is None:
+                break
+            params["after"] = response.data["next"]
+        self.assertEqual(usernames, [f"member{index}@abc.com" for index in range(6)])
+
+    def test_single_query(self):
+        with self.assertQueryBudget(2):
+            self.search(
+                company="Acme",
+                institution=self.institution.pk,
+                country=self.turkey.pk,
+                interest=self.interests[0].pk,
+            )
+
+    def test_invalid_filter(self):
+        response = self.client.get(reverse("directory"), {"country": "Turkey"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["message"], ["A valid integer is required."])
+
+    def test_requires_authentication(self):
+        self.client.credentials()
+        response = self.client.get(reverse("directory"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
 class UserLoginViewTest(APITestCase):
     @classmethod
     def setUpTestData(cls):
@@ -477,6 +910,9 @@ class UserLoginViewTest(APITestCase):
             username=cls.username, email=cls.email, password=cls.password
         )
 
+    def setUp(self):
+        throttling.clear()
+
     def post_request(self, data):
         return self.client.post(self.url, data, format="json")
 
@@ -548,6 +984,105 @@ class UserLoginViewTest(APITestCase):
         self.assertEqual(response.data, expected_data)
 
 
+THROTTLE_RATES = {
+    "login_ip": "3/min",
+    "login_email": "2/min",
+    "registration_ip": "1/hour",
+}
+
+
+@override_settings(
+    REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        "DEFAULT_THROTTLE_RATES": THROTTLE_RATES,
+    }
+)
+class ThrottleTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.url = reverse("user-login")
+        User.objects.create_user(
+            username="test@example.com", email="test@example.com", password="pw"
+        )
+
+    def setUp(self):
+        throttling.clear()
+        cache.clear()
+        metrics.throttled_requests.clear()
+
+    def login(self, email, ip="10.0.0.1"):
+        return self.client.post(
+            self.url,
+            {"email": email, "password": "wrong"},
+            format="json",
+            REMOTE_ADDR=ip,
+        )
+
+    def test_login_throttled_per_ip(self):
+        for index in range(3):
+            self.assertEqual(
+                self.login(f"user{index}@example.com").status_code,
+                status.HTTP_403_FORBIDDEN,
+            )
+        with self.assertNumQueries(0):
+            response = self.login("user9@example.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response.data["status"], "fail")
+        self.assertEqual(int(response["Retry-After"]), 20)
+
+        response = self.login("user9@example.com", ip="10.0.0.2")
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_login_throttled_per_email(self):
+        for ip in ("10.0.0.1", "10.0.0.2"):
+            self.assertEqual(
+                self.login("Test@example.com", ip).status_code,
+                status.HTTP_403_FORBIDDEN,
+            )
+        response = self.login("test@example.com ", "10.0.0.3")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(
+            metrics.throttled_requests.render()[-1],
+            'mooc_throttled_requests_total{scope="login_email"} 1',
+        )
+
+    def test_tokens_refill(self):
+        now = time.time()
+        with mock.patch("mooc.throttling.time.time", return_value=now):
+            for index in range(3):
+                self.login(f"user{index}@example.com")
+            self.assertEqual(self.login("a@example.com").status_code, 429)
+        with mock.patch("mooc.throttling.time.time", return_value=now + 20):
+            self.assertEqual(self.login("b@example.com").status_code, 403)
+            self.assertEqual(self.login("c@example.com").status_code, 429)
+
+    @override_settings(THROTTLE_CACHE="default")
+    def test_shared_buckets_across_processes(self):
+        for index in range(3):
+            self.login(f"user{index}@example.com")
+        # Another worker process starts with empty local buckets.
+        throttling.clear()
+        response = self.login("user9@example.com")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_registration_throttled_per_ip(self):
+        url = reverse("user-registration")
+        data = {
+            "username": "newuser",
+            "firstname": "first",
+            "lastname": "last",
+            "email": "new@example.com",
+            "password": "password",
+        }
+        self.assertEqual(
+            self.client.post(url, data, REMOTE_ADDR="10.0.0.1").status_code,
+            status.HTTP_201_CREATED,
+        )
+        with self.assertNumQueries(0):
+            response = self.client.post(url, data, REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+
 class GetUserProfileTest(APITestCase):
 
     @classmethod
@@ -651,3 +1186,385 @@ class GetUserProfileTest(APITestCase):
         self.assertEqual(response.data["status"], "success")
 
 
+class AutocompleteViewTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        autocomplete.clear()
+
+    def get(self, vocabulary, query, **params):
+        url = reverse("autocomplete", args=[vocabulary])
+        return self.client.get(url, {"q": query, **params})
+
+    def test_autocomplete_label_prefix(self):
+        response = self.get("institutions", "univ", limit=2)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["data"], ["University of Cambridge", "University of Colombo"]
+        )
+
+    def test_autocomplete_word_prefix(self):
+        response = self.get("institutions", "techn")
+        self.assertEqual(
+            response.data["data"], ["Massachusetts Institute of Technology (MIT)"]
+        )
+
+    def test_autocomplete_does_not_query_database(self):
+        self.get("countries", "sri")
+        with self.assertNumQueries(0):
+            response = self.get("countries", "sri")
+        self.assertEqual(response.data["data"], ["Sri Lanka"])
+
+    def test_autocomplete_rebuilt_on_change(self):
+        self.assertEqual(self.get("degrees", "zzz").data["data"], [])
+        Degree.objects.create(label="Zzz Studies")
+        self.assertEqual(self.get("degrees", "zzz").data["data"], ["Zzz Studies"])
+
+    def test_autocomplete_rebuilt_on_change_in_another_process(self):
+        self.assertEqual(self.get("degrees", "zzz").data["data"], [])
+        # Another worker's change only reaches this one through the cache.
+        Degree.objects.bulk_create([Degree(label="Zzz Studies")])
+        cache.delete(autocomplete._version_key("degrees"))
+        self.assertEqual(self.get("degrees", "zzz").data["data"], ["Zzz Studies"])
+
+    def test_autocomplete_built_from_primary(self):
+        routed = []
+        label_index = autocomplete.LabelIndex
+
+        def route(labels):
+            routed.append(PrimaryReplicaRouter().db_for_read(Degree))
+            return label_index(labels)
+
+        token = read_database.set("replica")
+        try:
+            with mock.patch.object(autocomplete, "LabelIndex", route):
+                autocomplete.get_index("degrees")
+        finally:
+            read_database.reset(token)
+        self.assertEqual(routed, ["default"])
+
+    def test_autocomplete_unknown_vocabulary(self):
+        response = self.get("unknown", "a")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class UserProfileQueryBudgetTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="testuser@abc.com",
+            email="testuser@abc.com",
+            first_name="test",
+            last_name="user",
+            password="testpassword",
+        )
+        cls.user_profile = UserProfile.objects.create(
+            user=cls.user,
+            country=Country.objects.get(label="Turkey"),
+            user_type="teacher",
+            birth_date="2000-10-12",
+        )
+        cls.user_profile.interests.set(Interest.objects.all()[:10])
+        seed_work_experience(cls.user_profile, 300)
+        seed_education(cls.user_profile, 300)
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    def setUp(self):
+        throttling.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def test_user_info_budget(self):
+        with self.assertQueryBudget(6):
+            response = self.client.get(reverse("user-info"))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["data"]["work_experience"]), 300)
+
+    def test_user_info_by_username_budget(self):
+        with self.assertQueryBudget(5):
+            response = self.client.get(
+                reverse("user-info"), {"username": self.user.username}
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_work_experience_list_budget(self):
+        with self.assertQueryBudget(2):
+            response = self.client.get(reverse("work-experience"))
+        self.assertEqual(len(response.data), 300)
+
+    def test_education_list_budget(self):
+        with self.assertQueryBudget(2):
+            response = self.client.get(reverse("education"))
+        self.assertEqual(len(response.data), 300)
+
+    def test_login_budget(self):
+        self.client.credentials()
+        data = {"email": "testuser@abc.com", "password": "testpassword"}
+        with self.assertQueryBudget(2):
+            response = self.client.post(reverse("user-login"), data, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_register_budget(self):
+        self.client.credentials()
+        data = {
+            "username": "newuser",
+            "firstname": "first",
+            "lastname": "last",
+            "email": "newuser@abc.com",
+            "password": "password",
+        }
+        with self.assertQueryBudget(3):
+            response = self.client.post(reverse("user-registration"), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+
+class FastSerializerTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create_user(username="testuser@abc.com")
+        cls.user_profile = UserProfile.objects.create(
+            user=user, country=Country.objects.get(label="Turkey"), birth_date="2000-10-12"
+        )
+        seed_work_experience(cls.user_profile, 5)
+        seed_education(cls.user_profile, 5)
+        WorkExperience.objects.filter(pk=WorkExperience.objects.first().pk).update(
+            profile_picture="url"
+        )
+
+    def assertSameOutput(self, fast_serializer_class, serializer_class, queryset):
+        expected = serializer_class(queryset, many=True).data
+        fast = fast_serializer_class(queryset).data
+        self.assertEqual(fast, expected)
+        self.assertEqual(JSONRenderer().render(fast), JSONRenderer().render(expected))
+
+    def test_output_matches_model_serializers(self):
+        self.assertSameOutput(
+            FastWorkExperienceSerializer,
+            WorkExperienceSerializer,
+            WorkExperience.objects.order_by("pk"),
+        )
+        self.assertSameOutput(
+            FastEducationSerializer, EducationSerializer, Education.objects.order_by("pk")
+        )
+
+
+class UserProfileAdminTest(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser(username="admin@abc.com")
+        country = Country.objects.get(label="Turkey")
+        for index in range(20):
+            user = User.objects.create_user(username=f"user-{index}@abc.com")
+            user_profile = UserProfile.objects.create(
+                user=user, country=country, birth_date="2000-10-12"
+            )
+            seed_work_experience(user_profile, 1)
+            seed_education(user_profile, 1)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_changelists_do_not_query_per_row(self):
+        for model_name in ("userprofile", "education", "workexperience"):
+            with self.assertQueryBudget(6):
+                response = self.client.get(
+                    reverse(f"admin:userprofiles_{model_name}_changelist")
+                )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertContains(response, "user-19@abc.com")
+
+
+class UserProfileConditionalGetTest(QueryBudgetMixin, APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="testuser@abc.com")
+        cls.user_profile = UserProfile.objects.create(
+            user=cls.user,
+            country=Country.objects.get(label="Turkey"),
+            birth_date="2000-10-12",
+        )
+        cls.token = str(AccessToken.for_user(cls.user))
+
+    def setUp(self):
+        cache.clear()
+        public_profiles.clear()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.token}")
+
+    def get(self, etag=None):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        return self.client.get(
+            reverse("user-info"), {"username": self.user.username}, **headers
+        )
+
+    def test_user_info_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
+
+        with self.assertQueryBudget(2):
+            response = self.get(response["ETag"])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_related_changes_change_etag(self):
+        interest = Interest.objects.first()
+        changes = [
+            lambda: WorkExperience.objects.create(
+                user_profile=self.user_profile,
+                company="Google",
+                position="Engineer",
+                start_date="2020-01",
+                end_date="2021-01",
+            ),
+            lambda: self.user_profile.interests.add(interest),
+            lambda: interest.save(),
+            lambda: User.objects.get(pk=self.user.pk).save(),
+        ]
+        etag = self.get()["ETag"]
+        for change in changes:
+            change()
+            response = self.get(etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            etag = response["ETag"]
+
+    def test_last_login_does_not_change_etag(self):
+        etag = self.get()["ETag"]
+        user = User.objects.get(pk=self.user.pk)
+        user.last_login = timezone.now()
+        user.save(update_fields=["last_login"])
+        self.assertEqual(self.get(etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+class PublicProfileCacheTest(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username="teacher@abc.com", first_name="test", last_name="teacher"
+        )
+        cls.user_profile = UserProfile.objects.create(
+            user=cls.user,
+            country=Country.objects.get(label="Turkey"),
+            user_type="teacher",
+            birth_date="2000-10-12",
+        )
+
+    def setUp(self):
+        cache.clear()
+        public_profiles.clear()
+
+    def get(self, username):
+        return self.client.get(reverse("user-info"), {"username": username})
+
+    def test_profile_is_served_from_cache(self):
+        self.assertEqual(self.get(self.user.username).status_code, status.HTTP_200_OK)
+        with self.assertNumQueries(0):
+            response = self.get(self.user.username)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["data"]["first_name"], "test")
+
+        # Another process only shares the cache, not the local copies.
+        public_profiles.clear()
+        with self.assertNumQueries(0):
+            etag = self.get(self.user.username)["ETag"]
+            response = self.client.get(
+                reverse("user-info"),
+                {"username": self.user.username},
+                HTTP_IF_NONE_MATCH=etag,
+            )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_cache_is_filled_from_primary(self):
+        routed = []
+        serializer = public_profiles.UserProfileSerializer
+
+        def route(*args, **kwargs):
+            routed.append(PrimaryReplicaRouter().db_for_read(UserProfile))
+            return serializer(*args, **kwargs)
+
+        token = read_database.set("replica")
+        try:
+            with mock.patch.object(public_profiles, "UserProfileSerializer", route):
+                public_profiles.get_public_profile(self.user.username)
+        finally:
+            read_database.reset(token)
+        self.assertEqual(routed, ["default"])
+
+    def test_unknown_username_is_cached(self):
+        self.assertEqual(self.get("unknown").status_code, status.HTTP_404_NOT_FOUND)
+        with self.assertNumQueries(0):
+            response = self.get("unknown")
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_writes_invalidate_cached_profile(self):
+        self.get(self.user.username)
+        work = WorkExperience.objects.create(
+            user_profile=self.user_profile,
+            company="Google",
+            position="Engineer",
+            start_date="2020-01",
+            end_date="2021-01",
+        )
+        data = self.get(self.user.username).data["data"]
+        self.assertEqual(len(data["work_experience"]), 1)
+
+        work.delete()
+        data = self.get(self.user.username).data["data"]
+        self.assertEqual(data["work_experience"], [])
+
+        self.user_profile.description = "Updated"
+        self.user_profile.save()
+        data = self.get(self.user.username).data["data"]
+        self.assertEqual(data["description"], "Updated")
+
+    def test_rename_invalidates_old_username(self):
+        self.get(self.user.username)
+        user = User.objects.get(pk=self.user.pk)
+        user.username = "renamed@abc.com"
+        user.save()
+
+        response = self.get(self.user.username)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.get("renamed@abc.com")
+        self.assertEqual(response.data["data"]["username"], "renamed@abc.com")
+
+
+class AsyncUserProfileViewTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="testuser@abc.com")
+        cls.user_profile = UserProfile.objects.create(
+            user=cls.user,
+            country=Country.objects.get(label="Turkey"),
+            birth_date="2000-10-12",
+        )
+        cls.user_profile.interests.set(Interest.objects.all()[:2])
+        seed_work_experience(cls.user_profile, 2)
+        seed_education(cls.user_profile, 2)
+        cls.headers = {"Authorization": f"Bearer {AccessToken.for_user(cls.user)}"}
+
+    async def test_matches_sync_profile(self):
+        sync_response = await sync_to_async(self.client.get)(
+            reverse("user-info"), headers=self.headers
+        )
+        response = await self.async_client.get(
+            reverse("async-user-info"), headers=self.headers
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(len(response.json()["data"]["interests"]), 2)
+
+    async def test_profile_by_username(self):
+        response = await self.async_client.get(
+            reverse("async-user-info"), {"username": self.user.username}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["data"]["user_id"], self.user.id)
+
+    async def test_own_profile_requires_authentication(self):
+        response = await self.async_client.get(reverse("async-user-info"))
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(response.json()["status"], "fail")
+
+    async def test_unknown_username(self):
+        response = await self.async_client.get(
+            reverse("async-user-info"), {"username": "unknown"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.json(), {"status": "fail", "message": ["Not found."]})
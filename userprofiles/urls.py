@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import UserRegistrationAPIView, UserProfileViewSet, WorkExperienceViewset, EducationViewset,UserLoginApiView
+from .views import UserRegistrationAPIView, UserProfileViewSet, WorkExperienceViewset, EducationViewset,UserLoginApiView, AutocompleteAPIView, DirectoryAPIView
 
 urlpatterns = [
     path("register/", UserRegistrationAPIView.as_view(), name="user-registration"),
@@ -19,14 +19,30 @@ urlpatterns = [
         WorkExperienceViewset.as_view({"put": "update", "delete": "destroy"}),
         name="work-experience",
     ),
+    path(
+        "work/batch/",
+        WorkExperienceViewset.as_view({"post": "batch"}),
+        name="work-experience-batch",
+    ),
     path(
         "education/",
         EducationViewset.as_view({"post": "create","get": "list"}),
         name="education",
     ),
+    path(
+        "education/batch/",
+        EducationViewset.as_view({"post": "batch"}),
+        name="education-batch",
+    ),
     path(
         "education/<int:pk>/",
         EducationViewset.as_view({"put": "update", "delete": "destroy"}),
         name="education",
     ),
+    path("directory/", DirectoryAPIView.as_view(), name="directory"),
+    path(
+        "autocomplete/<str:vocabulary>/",
+        AutocompleteAPIView.as_view(),
+        name="autocomplete",
+    ),
 ]
@@ -1,22 +1,39 @@
 from rest_framework import generics, permissions, status, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
 from userprofiles.serializers import (
     UserSerializer,
     UserProfileSerializer,
     WorkExperienceSerializer,
     EducationSerializer,
+    FastEducationSerializer,
+    FastWorkExperienceSerializer,
     UserLoginSerializer,
+    WorkExperienceBatchSerializer,
+    EducationBatchSerializer,
 )
 from userprofiles.models import UserProfile, WorkExperience, Education
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
 from rest_framework_simplejwt.tokens import AccessToken
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
+from userprofiles import autocomplete, directory, public_profiles
+from userprofiles.signals import defer_owner_touches, touch_profiles
+from mooc.conditional import ConditionalGetMixin
+from mooc.throttling import LoginEmailThrottle, LoginIPThrottle, RegistrationIPThrottle
+
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
 
 
 class UserRegistrationAPIView(generics.CreateAPIView):
     serializer_class = UserSerializer
+    # No authentication, so throttled requests are rejected before any query.
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegistrationIPThrottle]
 
     def create(self, request, *args, **kwargs):
         resp = super().create(request, *args, **kwargs)
@@ -30,7 +47,9 @@ class UserRegistrationAPIView(generics.CreateAPIView):
 
 class UserLoginApiView(generics.GenericAPIView):
     serializer_class = UserLoginSerializer
+    authentication_classes = []
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginIPThrottle, LoginEmailThrottle]
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
@@ -61,16 +80,20 @@ class UserLoginApiView(generics.GenericAPIView):
         return Response(respObj, status=status.HTTP_403_FORBIDDEN)
 
 
-class UserProfileViewSet(viewsets.ModelViewSet):
+class UserProfileViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
+    cache_control = {"private": True, "no_cache": True}
 
     def get_object(self):
         username = self.request.query_params.get("username")
         if username is None:
             return self.request.user.userprofile
         
-        return get_object_or_404(UserProfile, user__username=username)
+        return get_object_or_404(
+            UserProfile.objects.select_related("user", "country"),
+            user__username=username,
+        )
 
     def create(self, request):
         request.data["action"] = self.action
@@ -96,22 +119,112 @@ class UserProfileViewSet(viewsets.ModelViewSet):
         return Response(respObj, status=status.HTTP_200_OK, headers=response.headers)
     
     def retrieve(self, request, *args, **kwargs):
-        response =  super().retrieve(request, *args, **kwargs)
+        username = request.query_params.get("username")
+        if username is None:
+            instance = self.get_object()
+            not_modified = self.not_modified(request, [instance])
+            if not_modified is not None:
+                return not_modified
+            data = self.get_serializer(instance).data
+        else:
+            profile = public_profiles.get_public_profile(username)
+            if profile is None:
+                raise Http404
+            not_modified = self.check_validators(
+                request, profile["etag"], profile["last_modified"]
+            )
+            if not_modified is not None:
+                return not_modified
+            data = profile["data"]
+
         respObj = {
             "status": "success",
-            "data": response.data,
+            "data": data,
         }
-        return Response(respObj, status=status.HTTP_200_OK, headers=response.headers)
+        return Response(respObj, status=status.HTTP_200_OK)
 
 
 
-class WorkExperienceViewset(viewsets.ModelViewSet):
+class BatchMixin:
+    """
+    ``batch`` action applying create, update and delete operations on the
+    user's rows in one request: validated together, then written with one
+    bulk query per operation in a single transaction.
+    """
+
+    batch_serializer_class = None
+
+    def batch(self, request):
+        queryset = self.get_queryset()
+        serializer = self.batch_serializer_class(
+            data=request.data, context={"request": request, "queryset": queryset}
+        )
+        serializer.is_valid(raise_exception=True)
+        operations = serializer.validated_data
+        model = queryset.model
+
+        user_profile_id = None
+        if operations["create"]:
+            user_profile_id = (
+                UserProfile.objects.filter(user=request.user)
+                .values_list("pk", flat=True)
+                .first()
+            )
+            if user_profile_id is None:
+                raise ValidationError({"user_profile": ["User profile does not exist."]})
+
+        updated = []
+        # The rows were read during validation. Each row only gets the fields
+        # its item sets written, so concurrent edits to other fields are kept.
+        updated_by_fields = {}
+        for item in operations["update"]:
+            instance = operations["instances"][item.pop("id")]
+            for field, value in item.items():
+                setattr(instance, field, value)
+            updated.append(instance)
+            if item:
+                updated_by_fields.setdefault(frozenset(item), []).append(instance)
+
+        with transaction.atomic():
+            created = model.objects.bulk_create(
+                model(user_profile_id=user_profile_id, **item)
+                for item in operations["create"]
+            )
+            for fields, instances in updated_by_fields.items():
+                model.objects.bulk_update(instances, fields)
+            if operations["delete"]:
+                # Ownership was checked during validation. Each deleted row
+                # would touch the profile with two queries, it is touched
+                # once below instead.
+                with defer_owner_touches():
+                    model.objects.filter(pk__in=operations["delete"]).delete()
+            # Bulk queries send no signals, the profile is touched once.
+            if created or updated or operations["delete"]:
+                touch_profiles(user=request.user)
+
+        respObj = {
+            "status": "success",
+            "message": f"{model.__name__} batch applied successfully",
+            "data": {
+                "created": [instance.pk for instance in created],
+                "updated": [instance.pk for instance in updated],
+                "deleted": operations["delete"],
+            },
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+
+class WorkExperienceViewset(BatchMixin, viewsets.ModelViewSet):
     queryset = WorkExperience.objects.all()
     serializer_class = WorkExperienceSerializer
+    batch_serializer_class = WorkExperienceBatchSerializer
 
     def get_queryset(self):
-        return (
-            super().get_queryset().filter(user_profile=self.request.user.userprofile.id)
+        return super().get_queryset().filter(user_profile__user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        return Response(
+            FastWorkExperienceSerializer(self.get_queryset().timeline()).data
         )
 
     def create(self, request):
@@ -149,13 +262,17 @@ class WorkExperienceViewset(viewsets.ModelViewSet):
         )
 
 
-class EducationViewset(viewsets.ModelViewSet):
+class EducationViewset(BatchMixin, viewsets.ModelViewSet):
     queryset = Education.objects.all()
     serializer_class = EducationSerializer
+    batch_serializer_class = EducationBatchSerializer
 
     def get_queryset(self):
-        return (
-            super().get_queryset().filter(user_profile=self.request.user.userprofile.id)
+        return super().get_queryset().filter(user_profile__user=self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        return Response(
+            FastEducationSerializer(self.get_queryset().timeline()).data
         )
 
     def create(self, request):
@@ -191,3 +308,70 @@ class EducationViewset(viewsets.ModelViewSet):
         return Response(
             respObj, status=status.HTTP_204_NO_CONTENT, headers=response.headers
         )
+
+
+class AutocompleteAPIView(generics.GenericAPIView):
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, vocabulary):
+        if vocabulary not in autocomplete.VOCABULARIES:
+            raise NotFound("Unknown vocabulary")
+
+        try:
+            limit = int(request.query_params.get("limit", AUTOCOMPLETE_DEFAULT_LIMIT))
+        except ValueError:
+            limit = AUTOCOMPLETE_DEFAULT_LIMIT
+        limit = min(max(limit, 1), AUTOCOMPLETE_MAX_LIMIT)
+
+        index = autocomplete.get_index(vocabulary)
+        respObj = {
+            "status": "success",
+            "data": index.search(request.query_params.get("q", ""), limit),
+        }
+        return Response(respObj, status=status.HTTP_200_OK)
+
+
+class DirectoryAPIView(generics.GenericAPIView):
+    """
+    Profiles filtered by ``country``, ``interest`` and ``institution`` ids and
+    ``company`` names, each repeatable to accept any of several values.
+    Pages are in profile id order, ``after`` takes the ``next`` cursor of
+    the previous page.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_ids(self, name):
+        try:
+            return [int(value) for value in self.request.query_params.getlist(name)]
+        except ValueError:
+            raise ValidationError({name: ["A valid integer is required."]})
+
+    def get(self, request):
+        after = self.get_ids("after")
+        after = after[-1] if after else None
+        try:
+            limit = int(request.query_params.get("limit", directory.DEFAULT_LIMIT))
+        except ValueError:
+            limit = directory.DEFAULT_LIMIT
+        limit = min(max(limit, 1), directory.MAX_LIMIT)
+
+        results, next_cursor = directory.search(
+            countries=self.get_ids("country"),
+            interests=self.get_ids("interest"),
+            institutions=self.get_ids("institution"),
+            companies=[
+                company.strip()
+                for company in request.query_params.getlist("company")
+                if company.strip()
+            ],
+            after=after,
+            limit=limit,
+        )
+        respObj = {
+            "status": "success",
+            "data": results,
+            "next": next_cursor,
+        }
+        return Response(respObj, status=status.HTTP_200_OK)